@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Benchmark des scripts de migration NotificationService (v1, v2, final) sur un
+corpus Dart synthétique (voir codemod/corpus.py).
+
+Chaque implémentation est mesurée dans un processus séparé, en simulation
+(aucun fichier écrit) : fichiers/s, Mo/s, pic de mémoire résidente et nombre
+de sites réécrits par règle. Les seuils de scripts/benchmark_thresholds.json
+servent de garde-fou contre les régressions : le script sort en erreur si
+l'un d'eux est franchi.
+
+Usage: python3 scripts/benchmark_codemods.py [--files N] [--impl v1|v2|final] [--jobs N] [--corpus DIR]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from codemod import engine, runner
+from codemod.corpus import corpus_stats, generate_corpus
+from codemod.engine import RunOptions
+from codemod.golden import IMPLEMENTATIONS
+from codemod.stream import peak_rss_mb
+
+THRESHOLDS_FILE = Path(__file__).parent / 'benchmark_thresholds.json'
+
+
+def measure(implementation, corpus, jobs=1):
+    """Exécute une implémentation en simulation sur le corpus ; retourne ses mesures."""
+    rules = engine.load_rules([IMPLEMENTATIONS[implementation]])
+    dart_files = sorted((corpus / 'lib' / 'features').rglob('*.dart'))
+    summary = runner.Summary(corpus, dry_run=True, stream=open(os.devnull, 'w'))
+    start = time.perf_counter()
+    for result in runner.run(rules, dart_files, corpus, jobs=jobs,
+                             options=RunOptions(write=False)):
+        summary.add(result)
+    elapsed = time.perf_counter() - start
+    summary.stream.close()
+    return {
+        'implementation': implementation,
+        'files': len(dart_files),
+        'seconds': elapsed,
+        'files_per_sec': len(dart_files) / elapsed if elapsed else 0.0,
+        'mb_per_sec': summary.bytes_scanned / (1 << 20) / elapsed if elapsed else 0.0,
+        'bytes_scanned': summary.bytes_scanned,
+        'bytes_decoded': summary.bytes_decoded,
+        'peak_rss_mb': peak_rss_mb(),
+        'files_migrated': summary.migrated_count,
+        'files_remaining': summary.total_with_snackbar - summary.migrated_count,
+        'errors': len(summary.errors) + summary.failed_count,
+        'rule_counts': summary.rule_counts,
+    }
+
+
+def measure_in_subprocess(implementation, corpus, jobs):
+    """Lance measure() dans un interpréteur neuf, pour un pic mémoire propre à l'implémentation."""
+    output = subprocess.run(
+        [sys.executable, __file__, '--measure', implementation, '--corpus', str(corpus),
+         '--jobs', str(jobs)],
+        check=True, stdout=subprocess.PIPE, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def check_thresholds(results, thresholds):
+    """Messages de dépassement des seuils (clé 'default' ou propre à l'implémentation)."""
+    violations = []
+    for result in results:
+        limits = dict(thresholds.get('default', {}))
+        limits.update(thresholds.get(result['implementation'], {}))
+        name = result['implementation']
+        if result['files_per_sec'] < limits.get('min_files_per_sec', 0):
+            violations.append(f"{name}: {result['files_per_sec']:.0f} fichiers/s "
+                              f"< {limits['min_files_per_sec']}")
+        if result['mb_per_sec'] < limits.get('min_mb_per_sec', 0):
+            violations.append(f"{name}: {result['mb_per_sec']:.2f} Mo/s < {limits['min_mb_per_sec']}")
+        max_rss = limits.get('max_peak_rss_mb')
+        if max_rss is not None and result['peak_rss_mb'] is not None and result['peak_rss_mb'] > max_rss:
+            violations.append(f"{name}: pic mémoire {result['peak_rss_mb']:.0f} Mo > {max_rss}")
+        if result['errors'] > limits.get('max_errors', result['errors']):
+            violations.append(f"{name}: {result['errors']} erreur(s) > {limits['max_errors']}")
+    return violations
+
+
+def print_report(stats, results):
+    print(f"Corpus: {stats['files']} fichiers, {stats['bytes'] / (1 << 20):.1f} Mo, "
+          f"{stats['files_with_snackbar']} avec showSnackBar")
+    if stats['shapes']:
+        print('  Formes: ' + ', '.join(f'{shape}={n}' for shape, n in sorted(stats['shapes'].items())))
+    print(f"\n{'Impl.':<8}{'Temps (s)':>11}{'Fichiers/s':>12}{'Mo/s':>9}{'RSS (Mo)':>10}"
+          f"{'Migrés':>8}{'Restants':>10}")
+    for result in results:
+        rss = f"{result['peak_rss_mb']:.0f}" if result['peak_rss_mb'] is not None else '-'
+        print(f"{result['implementation']:<8}{result['seconds']:>11.2f}{result['files_per_sec']:>12.0f}"
+              f"{result['mb_per_sec']:>9.2f}{rss:>10}{result['files_migrated']:>8}"
+              f"{result['files_remaining']:>10}")
+    for result in results:
+        print(f"\nSites réécrits ({result['implementation']}):")
+        for label, n in sorted(result['rule_counts'].items()):
+            print(f"  {label}: {n}")
+
+
+def main():
+    """Fonction principale."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--files', type=int, default=1000,
+                        help='nombre de fichiers du corpus (défaut : 1000)')
+    parser.add_argument('--seed', type=int, default=0, help='graine du corpus (défaut : 0)')
+    parser.add_argument('--impl', action='append', choices=sorted(IMPLEMENTATIONS),
+                        dest='implementations', help='implémentation à mesurer (répétable ; défaut : toutes)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='nombre de processus de migration (défaut : 1)')
+    parser.add_argument('--corpus', metavar='DIR',
+                        help='répertoire du corpus (conservé ; réutilisé sans régénération s\'il existe)')
+    parser.add_argument('--thresholds', metavar='FICHIER', default=str(THRESHOLDS_FILE),
+                        help='seuils de régression JSON (défaut : scripts/benchmark_thresholds.json)')
+    parser.add_argument('--no-thresholds', action='store_true', help='ne pas vérifier les seuils')
+    parser.add_argument('--json', metavar='FICHIER', help='écrire aussi les mesures en JSON')
+    parser.add_argument('--measure', choices=sorted(IMPLEMENTATIONS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        json.dump(measure(args.measure, Path(args.corpus), args.jobs), sys.stdout)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='codemod-bench-') as tmp:
+        corpus = Path(args.corpus) if args.corpus else Path(tmp)
+        features = corpus / 'lib' / 'features'
+        if features.is_dir() and args.corpus:
+            stats = corpus_stats(corpus)
+        else:
+            stats = generate_corpus(corpus, args.files, seed=args.seed)
+        results = [measure_in_subprocess(name, corpus, args.jobs)
+                   for name in args.implementations or IMPLEMENTATIONS]
+
+    print_report(stats, results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'corpus': stats, 'results': results}, f, indent=2)
+
+    if args.no_thresholds:
+        return
+    try:
+        with open(args.thresholds, 'r', encoding='utf-8') as f:
+            thresholds = json.load(f)
+    except FileNotFoundError:
+        return
+    violations = check_thresholds(results, thresholds)
+    if violations:
+        print('\n✗ Seuils franchis:')
+        for violation in violations:
+            print(f'  {violation}')
+        sys.exit(1)
+    print('\n✓ Seuils respectés')
+
+
+if __name__ == '__main__':
+    main()
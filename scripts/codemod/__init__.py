@@ -0,0 +1,3 @@
+"""
+Outils partagés par les scripts de migration (codemods) Dart de scripts/.
+"""
@@ -0,0 +1,120 @@
+"""
+Cache incrémental des exécutions de migration (.codemod_cache.json).
+
+Pour chaque fichier, le cache garde mtime, taille, empreinte SHA-256 du
+contenu, version du jeu de règles et statut obtenu. Un fichier dont mtime et
+taille n'ont pas changé depuis la dernière exécution du même jeu de règles
+n'est pas relu ; si seul le mtime a changé, l'empreinte évite de relancer les
+règles sur un contenu identique.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import sys
+
+CACHE_FILE = '.codemod_cache.json'
+CACHE_FORMAT = 2
+
+
+def content_hash(content):
+    """Empreinte du contenu tel qu'il est écrit sur disque (UTF-8)."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def ruleset_name(rules):
+    """Nom du jeu de règles, stable quel que soit l'ordre des règles."""
+    return '+'.join(sorted(rule.name for rule in rules))
+
+
+def ruleset_version(rules):
+    """Empreinte du code qui définit les règles.
+
+    Couvre les modules des règles et, de proche en proche, les modules
+    codemod.* qu'ils utilisent : toute modification des patterns, du moteur
+    ou de l'ajout d'imports invalide les entrées de ce jeu de règles.
+    """
+    return source_version(sys.modules[rule.module] for rule in rules)
+
+
+def source_version(roots):
+    """Empreinte des sources des modules roots et des modules codemod.* qu'ils utilisent."""
+    modules = set()
+    pending = list(roots)
+    while pending:
+        module = pending.pop()
+        if module in modules:
+            continue
+        modules.add(module)
+        for value in vars(module).values():
+            name = value.__name__ if inspect.ismodule(value) else getattr(value, '__module__', None)
+            if isinstance(name, str) and name.startswith('codemod.') and name in sys.modules:
+                pending.append(sys.modules[name])
+    digest = hashlib.sha256()
+    for source_file in sorted(inspect.getsourcefile(m) for m in modules):
+        with open(source_file, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def file_state(path):
+    st = os.stat(path)
+    return {'mtime_ns': st.st_mtime_ns, 'size': st.st_size}
+
+
+class RunCache:
+    """Entrées du cache pour un jeu de règles donné.
+
+    Le fichier de cache est partagé par les scripts : les entrées sont rangées
+    par nom de jeu de règles, chacune portant la version qui l'a produite.
+    """
+
+    def __init__(self, path, ruleset, version):
+        self.path = path
+        self.ruleset = ruleset
+        self.version = version
+        self._data = {'format': CACHE_FORMAT, 'rulesets': {}}
+        self.entries = {}
+        self.hits = 0
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get('format') != CACHE_FORMAT:
+            return self
+        self._data = data
+        entries = data.get('rulesets', {}).get(self.ruleset, {})
+        self.entries = {
+            path: entry for path, entry in entries.items()
+            if entry.get('ruleset') == self.version
+        }
+        return self
+
+    def lookup(self, key, state):
+        """Entrée valide si le fichier n'a pas changé (mtime et taille), sinon None."""
+        entry = self.entries.get(key)
+        if entry and entry['mtime_ns'] == state['mtime_ns'] and entry['size'] == state['size']:
+            self.hits += 1
+            return entry
+        return None
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def update(self, key, entry):
+        entry['ruleset'] = self.version
+        self.entries[key] = entry
+
+    def discard(self, key):
+        self.entries.pop(key, None)
+
+    def save(self):
+        self._data.setdefault('rulesets', {})[self.ruleset] = self.entries
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,210 @@
+"""
+Corpus Dart synthétique pour les benchmarks des codemods.
+
+generate_corpus() écrit sous <root>/lib/features une arborescence de
+fichiers Dart ressemblant à ceux de l'application : la plupart sans
+ScaffoldMessenger, les autres avec un ou plusieurs appels showSnackBar pris
+dans SHAPES (SnackBar const, backgroundColor conditionnel, Text sur
+plusieurs lignes, appels imbriqués, SnackBar avec action, appel non fermé en
+fin de fichier...). Le corpus est déterministe pour une graine donnée ;
+corpus_stats() recalcule ses statistiques à partir des fichiers écrits.
+"""
+
+import random
+from pathlib import Path
+
+MODULES = ('boutique', 'eau_minerale', 'gaz', 'immobilier', 'orange_money', 'administration')
+LAYERS = ('presentation/screens', 'presentation/widgets', 'application/controllers')
+
+HEADER = """import 'package:flutter/material.dart';
+import 'package:flutter_riverpod/flutter_riverpod.dart';
+
+"""
+
+# Chaque forme est un appel showSnackBar, indenté pour le corps d'une méthode.
+SHAPES = {
+    'success': """      ScaffoldMessenger.of(context).showSnackBar(
+        const SnackBar(
+          content: Text('Vente enregistrée'),
+          backgroundColor: Colors.green,
+        ),
+      );
+""",
+    'error_concat': """      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(
+          content: Text('Erreur: ' + e.toString()),
+          backgroundColor: Colors.red,
+        ),
+      );
+""",
+    'error_replace_all': """      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(
+          content: Text(e.toString().replaceAll('Exception: ', '')),
+          backgroundColor: Colors.red,
+        ),
+      );
+""",
+    'const_error': """      ScaffoldMessenger.of(context).showSnackBar(
+        const SnackBar(content: Text('Stock insuffisant'), backgroundColor: Colors.red),
+      );
+""",
+    'theme_error': """      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(
+          content: Text('Erreur: $e'),
+          backgroundColor: Theme.of(context).colorScheme.error,
+        ),
+      );
+""",
+    'info': """      ScaffoldMessenger.of(context).showSnackBar(
+        const SnackBar(content: Text('Synchronisation en cours')),
+      );
+""",
+    'conditional': """      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(
+          content: Text(message),
+          backgroundColor: success ? Colors.green : Colors.red,
+        ),
+      );
+""",
+    'multiline_text': """      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(
+          content: Text(
+            'Le paiement de ${amount.toStringAsFixed(0)} FCFA '
+            'a été enregistré (réf. ${payment.id})',
+          ),
+          backgroundColor: Colors.green,
+          duration: const Duration(seconds: 3),
+        ),
+      );
+""",
+    'nested_calls': """      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(
+          content: Text(formatMessage(context, items.where((i) => i.isValid()).length)),
+        ),
+      );
+""",
+    'with_action': """      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(
+          content: const Text('Élément supprimé'),
+          action: SnackBarAction(label: 'Annuler', onPressed: () => undo()),
+        ),
+      );
+""",
+}
+
+# Appel non fermé : coupe le fichier en plein milieu des arguments.
+PATHOLOGICAL = """      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(
+          content: Text('Fichier tronqué (${items.length}'),
+          backgroundColor: Colors.red,
+"""
+
+FILLER_METHOD = """  Widget _build{name}(BuildContext context) {{
+    final total = items.fold<int>(0, (sum, item) => sum + item.quantity);
+    // Ligne {index} : ScaffoldMessenger n'est mentionné qu'en commentaire ici.
+    return Padding(
+      padding: const EdgeInsets.symmetric(horizontal: 16, vertical: 8),
+      child: Row(
+        children: [
+          Text('{name}', style: Theme.of(context).textTheme.titleMedium),
+          const Spacer(),
+          Text('$total'),
+        ],
+      ),
+    );
+  }}
+
+"""
+
+
+def _handler(index, shape):
+    return (f"  Future<void> _onAction{index}(BuildContext context) async {{\n"
+            f"    try {{\n"
+            f"      await controller.run{index}();\n"
+            f"      if (!context.mounted) return;\n"
+            f"{SHAPES[shape]}"
+            f"    }} catch (e) {{\n"
+            f"      debugPrint('$e');\n"
+            f"    }}\n"
+            f"  }}\n\n")
+
+
+def render_file(rng, class_name, hit_ratio, pathological_ratio):
+    """Source d'un fichier ; retourne (source, formes des appels émis)."""
+    parts = [HEADER, f"class {class_name} extends ConsumerWidget {{\n",
+             f"  const {class_name}({{super.key}});\n\n"]
+    shapes = []
+    with_snackbar = rng.random() < hit_ratio
+    for index in range(rng.randint(2, 8)):
+        if with_snackbar and (index == 0 or rng.random() < 0.3):
+            shape = rng.choice(list(SHAPES))
+            shapes.append(shape)
+            parts.append(_handler(index, shape))
+        else:
+            parts.append(FILLER_METHOD.format(name=f'Section{index}', index=index))
+    if with_snackbar and rng.random() < pathological_ratio:
+        shapes.append('pathological')
+        parts.append("  void _broken(BuildContext context) {\n" + PATHOLOGICAL)
+        return ''.join(parts), shapes
+    parts.append("}\n")
+    return ''.join(parts), shapes
+
+
+def generate_corpus(root, files, seed=0, hit_ratio=0.1, pathological_ratio=0.02):
+    """Écrit files fichiers Dart sous root/lib/features ; retourne les statistiques.
+
+    hit_ratio est la proportion de fichiers contenant au moins un appel
+    showSnackBar, pathological_ratio la proportion de ceux-ci qui se
+    terminent par un appel non fermé.
+    """
+    rng = random.Random(seed)
+    features = Path(root) / 'lib' / 'features'
+    stats = _empty_stats()
+    directories = set()
+    for index in range(files):
+        module = MODULES[index % len(MODULES)]
+        directory = features / module / LAYERS[(index // len(MODULES)) % len(LAYERS)] / f'group_{index // 500}'
+        if directory not in directories:
+            directory.mkdir(parents=True, exist_ok=True)
+            directories.add(directory)
+        source, shapes = render_file(rng, f'Generated{index}Screen', hit_ratio, pathological_ratio)
+        data = source.encode('utf-8')
+        (directory / f'generated_{index}_screen.dart').write_bytes(data)
+        _count_file(stats, data, shapes, bool(shapes))
+    return stats
+
+
+def corpus_stats(root):
+    """Statistiques de generate_corpus(), recalculées sur les fichiers de root/lib/features.
+
+    Sert à décrire un corpus réutilisé : les formes sont reconnues à leur
+    texte exact, un fichier avec showSnackBar compte même sans forme connue.
+    """
+    stats = _empty_stats()
+    for path in sorted((Path(root) / 'lib' / 'features').rglob('*.dart')):
+        data = path.read_bytes()
+        _count_file(stats, data, shapes_of(data.decode('utf-8', errors='replace')),
+                    b'showSnackBar' in data)
+    return stats
+
+
+def shapes_of(source):
+    """Formes de SHAPES (et 'pathological') présentes dans source, une par occurrence."""
+    shapes = []
+    for shape, block in SHAPES.items():
+        shapes.extend([shape] * source.count(block))
+    shapes.extend(['pathological'] * source.count(PATHOLOGICAL))
+    return shapes
+
+
+def _empty_stats():
+    return {'files': 0, 'bytes': 0, 'files_with_snackbar': 0, 'shapes': {}}
+
+
+def _count_file(stats, data, shapes, with_snackbar):
+    stats['files'] += 1
+    stats['bytes'] += len(data)
+    if with_snackbar:
+        stats['files_with_snackbar'] += 1
+    for shape in shapes:
+        stats['shapes'][shape] = stats['shapes'].get(shape, 0) + 1
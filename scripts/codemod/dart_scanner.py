@@ -0,0 +1,414 @@
+"""
+Scanner Dart minimal, en temps linéaire.
+
+Le scanner parcourt une seule fois le source et repère les chaînes (simples,
+triples, raw, avec interpolation ${...}), les commentaires (// et /* */
+imbriqués) et les paires de parenthèses, crochets et accolades du code. Les
+appels ScaffoldMessenger...showSnackBar(...) sont ensuite découpés en spans
+exacts, sans expression régulière à quantificateurs imbriqués.
+"""
+
+import re
+from dataclasses import dataclass
+
+SNACKBAR_ANCHOR = 'ScaffoldMessenger.of(context).showSnackBar'
+
+_OPENERS = {'(': ')', '[': ']', '{': '}'}
+_CLOSERS = {')': '(', ']': '[', '}': '{'}
+
+# Prochain caractère significatif dans du code.
+_CODE_SPECIAL = re.compile(r'[\'"/()\[\]{}]')
+# Prochain caractère significatif dans une chaîne, selon le délimiteur.
+_STRING_SPECIAL = {
+    "'": re.compile(r"[\\'$\n]"),
+    '"': re.compile(r'[\\"$\n]'),
+    "'''": re.compile(r"[\\'$]"),
+    '"""': re.compile(r'[\\"$]'),
+}
+_RAW_STRING_SPECIAL = {
+    "'": re.compile(r"['\n]"),
+    '"': re.compile(r'["\n]'),
+    "'''": re.compile(r"'"),
+    '"""': re.compile(r'"'),
+}
+_BLOCK_COMMENT = re.compile(r'/\*|\*/')
+_IDENT_CHAR = re.compile(r'[A-Za-z0-9_$]')
+_NAMED_ARG = re.compile(r'([A-Za-z_$][A-Za-z0-9_$]*)\s*:(?!:)')
+_CALLEE = re.compile(r'(?:const\s+|new\s+)?([A-Za-z_$][A-Za-z0-9_$.]*)\s*\(')
+
+
+class DartScanner:
+    """Index des chaînes, commentaires et paires de délimiteurs d'un source Dart."""
+
+    def __init__(self, source):
+        self.source = source
+        # Indice d'ouverture -> indice de fermeture, pour ( [ { du code.
+        self.pairs = {}
+        # Début -> fin (exclusive) des chaînes et commentaires de premier niveau.
+        self.skips = {}
+        # Fin -> début des commentaires, construit à la demande (starts_statement).
+        self._comment_starts = None
+        self._scan()
+
+    def _scan(self):
+        src = self.source
+        n = len(src)
+        brackets = []
+        # Pile de contextes : ('string', quote, raw, start) ou ('interp', hauteur).
+        contexts = []
+        i = 0
+        while i < n:
+            ctx = contexts[-1] if contexts else None
+            if ctx is not None and ctx[0] == 'string':
+                _, quote, raw, start = ctx
+                table = _RAW_STRING_SPECIAL if raw else _STRING_SPECIAL
+                m = table[quote].search(src, i)
+                if m is None:
+                    # Chaîne non terminée : elle court jusqu'à la fin du fichier.
+                    contexts.pop()
+                    if not contexts:
+                        self.skips[start] = n
+                    i = n
+                    continue
+                i = m.start()
+                c = src[i]
+                if c == '\\':
+                    i += 2
+                elif c == '\n':
+                    # Chaîne simple non terminée en fin de ligne : on récupère.
+                    contexts.pop()
+                    if not contexts:
+                        self.skips[start] = i
+                    i += 1
+                elif c == '$':
+                    if src.startswith('${', i):
+                        contexts.append(('interp', len(brackets)))
+                        i += 2
+                    else:
+                        i += 1
+                elif src.startswith(quote, i):
+                    contexts.pop()
+                    i += len(quote)
+                    if not contexts:
+                        self.skips[start] = i
+                else:
+                    i += 1
+                continue
+
+            m = _CODE_SPECIAL.search(src, i)
+            if m is None:
+                break
+            i = m.start()
+            c = src[i]
+            if c == '/':
+                if src.startswith('//', i):
+                    end = src.find('\n', i)
+                    end = n if end < 0 else end
+                    if not contexts:
+                        self.skips[i] = end
+                    i = end
+                elif src.startswith('/*', i):
+                    end = self._block_comment_end(i)
+                    if not contexts:
+                        self.skips[i] = end
+                    i = end
+                else:
+                    i += 1
+            elif c in '\'"':
+                quote = src[i:i + 3] if src.startswith(c * 3, i) else c
+                raw = i > 0 and src[i - 1] in 'rR' and (i < 2 or not _IDENT_CHAR.match(src[i - 2]))
+                start = i - 1 if raw else i
+                contexts.append(('string', quote, raw, start))
+                i += len(quote)
+            elif c in _OPENERS:
+                brackets.append(i)
+                i += 1
+            else:
+                if (c == '}' and ctx is not None and ctx[0] == 'interp'
+                        and len(brackets) == ctx[1]):
+                    contexts.pop()
+                    i += 1
+                    continue
+                if brackets and src[brackets[-1]] == _CLOSERS[c]:
+                    self.pairs[brackets.pop()] = i
+                i += 1
+
+    def _block_comment_end(self, start):
+        """Fin (exclusive) d'un commentaire /* */, les commentaires s'imbriquant en Dart."""
+        depth = 0
+        pos = start
+        for m in _BLOCK_COMMENT.finditer(self.source, start):
+            depth += 1 if m.group(0) == '/*' else -1
+            pos = m.end()
+            if depth == 0:
+                return pos
+        return len(self.source)
+
+    def closing(self, open_index):
+        """Indice du délimiteur fermant correspondant, ou -1."""
+        return self.pairs.get(open_index, -1)
+
+    def split_arguments(self, start, end):
+        """Découpe source[start:end] en arguments de premier niveau.
+
+        Retourne une liste de spans (début, fin) sans les espaces de bord ;
+        une virgule finale ne produit pas d'argument vide.
+        """
+        src = self.source
+        spans = []
+        arg_start = start
+        i = start
+        while i < end:
+            if i in self.skips:
+                i = self.skips[i]
+                continue
+            c = src[i]
+            if c in _OPENERS and i in self.pairs:
+                i = self.pairs[i] + 1
+                continue
+            if c == ',':
+                spans.append(_strip_span(src, arg_start, i))
+                arg_start = i + 1
+            i += 1
+        last = _strip_span(src, arg_start, end)
+        if last[0] < last[1]:
+            spans.append(last)
+        return spans
+
+    def compact(self, start, end):
+        """Texte de source[start:end] sur une ligne.
+
+        Les commentaires sont retirés et chaque suite d'espaces hors chaîne
+        est réduite à un seul espace ; le contenu des chaînes est conservé.
+        """
+        src = self.source
+        parts = []
+        pending_space = False
+        i = start
+        while i < end:
+            skip_end = self.skips.get(i)
+            if skip_end is not None:
+                if src[i] == '/':
+                    pending_space = True
+                else:
+                    if pending_space and parts:
+                        parts.append(' ')
+                    parts.append(src[i:skip_end])
+                    pending_space = False
+                i = skip_end
+                continue
+            c = src[i]
+            if c.isspace():
+                pending_space = True
+            else:
+                if pending_space and parts:
+                    parts.append(' ')
+                parts.append(c)
+                pending_space = False
+            i += 1
+        return ''.join(parts)
+
+
+    def split_conditional(self, start, end):
+        """Découpe source[start:end] de la forme c ? a : b de premier niveau.
+
+        Retourne les spans (condition, alors, sinon) sans les espaces de bord,
+        ou None si l'expression n'est pas une conditionnelle. Les opérateurs
+        ??, ??=, ?. et ?[ ne sont pas des conditionnelles ; une conditionnelle
+        imbriquée dans une branche reste dans cette branche.
+        """
+        src = self.source
+        question = None
+        depth = 0
+        i = start
+        while i < end:
+            if i in self.skips:
+                i = self.skips[i]
+                continue
+            c = src[i]
+            if c in _OPENERS and i in self.pairs:
+                i = self.pairs[i] + 1
+                continue
+            if c == '?':
+                if src.startswith('??', i):
+                    i += 2
+                    continue
+                if i + 1 < end and src[i + 1] in '.[':
+                    i += 1
+                    continue
+                if question is None:
+                    question = i
+                else:
+                    depth += 1
+            elif c == ':' and question is not None:
+                if depth == 0:
+                    return (_strip_span(src, start, question),
+                            _strip_span(src, question + 1, i),
+                            _strip_span(src, i + 1, end))
+                depth -= 1
+            i += 1
+        return None
+
+    def starts_statement(self, index):
+        """Vrai si une instruction peut commencer en index.
+
+        Le code qui précède, espaces et commentaires ignorés, doit être vide ou
+        se terminer par ; { ou } : après =>, ( ou =, index est dans une
+        expression.
+        """
+        src = self.source
+        if self._comment_starts is None:
+            self._comment_starts = {end: start for start, end in self.skips.items()
+                                    if src[start] == '/'}
+        i = index
+        while True:
+            while i > 0 and src[i - 1].isspace():
+                i -= 1
+            if i not in self._comment_starts:
+                break
+            i = self._comment_starts[i]
+        return i == 0 or src[i - 1] in ';{}'
+
+
+def _strip_span(src, start, end):
+    while start < end and src[start].isspace():
+        start += 1
+    while end > start and src[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+@dataclass
+class Call:
+    """Un appel name(...) : spans du nom, des arguments et de l'appel complet."""
+
+    name: str
+    start: int
+    args_start: int
+    args_end: int
+    end: int
+    const: bool = False
+
+
+@dataclass
+class SnackBarCall:
+    """Un appel ScaffoldMessenger.of(context).showSnackBar(...) analysé.
+
+    start/end couvrent l'appel complet, point-virgule inclus s'il est présent.
+    Les champs snackbar, arguments, text et background valent None quand
+    l'appel ne suit pas la forme attendue ; condition vaut (condition, alors,
+    sinon), compactés, quand backgroundColor est une conditionnelle. statement
+    indique que l'appel est une instruction complète, point-virgule compris,
+    et non une expression (après =>).
+    """
+
+    start: int
+    end: int
+    block: str
+    snackbar: Call = None
+    arguments: dict = None
+    text: str = None
+    background: str = None
+    condition: tuple = None
+    statement: bool = False
+
+
+def parse_call(scanner, start, end):
+    """Analyse source[start:end] comme un appel unique name(...), sinon None."""
+    src = scanner.source
+    m = _CALLEE.match(src, start, end)
+    if not m:
+        return None
+    open_index = m.end() - 1
+    close_index = scanner.closing(open_index)
+    if close_index < 0 or close_index + 1 != end:
+        return None
+    return Call(
+        name=m.group(1),
+        start=start,
+        args_start=open_index + 1,
+        args_end=close_index,
+        end=end,
+        const=m.group(0).startswith('const'),
+    )
+
+
+def named_arguments(scanner, call):
+    """Arguments d'un appel : {nom: (début, fin)} ; les positionnels sont indexés 0, 1, …"""
+    src = scanner.source
+    result = {}
+    position = 0
+    for arg_start, arg_end in scanner.split_arguments(call.args_start, call.args_end):
+        m = _NAMED_ARG.match(src, arg_start, arg_end)
+        if m:
+            value_start, value_end = _strip_span(src, m.end(), arg_end)
+            result[m.group(1)] = (value_start, value_end)
+        else:
+            result[position] = (arg_start, arg_end)
+            position += 1
+    return result
+
+
+def find_snackbar_calls(source, scanner=None, anchor=SNACKBAR_ANCHOR):
+    """Itère sur les appels showSnackBar(...) du code, dans l'ordre du fichier."""
+    if scanner is None:
+        scanner = DartScanner(source)
+    pos = source.find(anchor)
+    while pos >= 0:
+        open_index = pos + len(anchor)
+        while open_index < len(source) and source[open_index].isspace():
+            open_index += 1
+        call = snackbar_call_at(scanner, pos, open_index)
+        if call is None:
+            # Ancre dans une chaîne, un commentaire, ou appel non fermé.
+            pos = source.find(anchor, pos + 1)
+            continue
+        yield call
+        pos = source.find(anchor, call.end)
+
+
+def snackbar_call_at(scanner, start, open_index):
+    """Appel showSnackBar(...) commençant en start, de parenthèse ouvrante open_index.
+
+    Retourne None si open_index n'est pas une parenthèse du code refermée
+    (ancre dans une chaîne, un commentaire, ou appel non fermé).
+    """
+    source = scanner.source
+    close_index = scanner.closing(open_index)
+    if close_index < 0 or source[open_index] != '(':
+        return None
+    end = close_index + 1
+    after = end
+    while after < len(source) and source[after] in ' \t':
+        after += 1
+    if after < len(source) and source[after] == ';':
+        end = after + 1
+    return _parse_snackbar_call(scanner, start, end, open_index, close_index)
+
+
+def _parse_snackbar_call(scanner, start, end, open_index, close_index):
+    src = scanner.source
+    block = src[start:end]
+    call = SnackBarCall(start=start, end=end, block=block,
+                        statement=block.endswith(';') and scanner.starts_statement(start))
+    outer = scanner.split_arguments(open_index + 1, close_index)
+    if len(outer) != 1:
+        return call
+    snackbar = parse_call(scanner, *outer[0])
+    if snackbar is None or snackbar.name != 'SnackBar':
+        return call
+    call.snackbar = snackbar
+    arguments = named_arguments(scanner, snackbar)
+    call.arguments = {name: src[s:e] for name, (s, e) in arguments.items()}
+    if 'backgroundColor' in arguments:
+        call.background = scanner.compact(*arguments['backgroundColor'])
+        branches = scanner.split_conditional(*arguments['backgroundColor'])
+        if branches is not None:
+            call.condition = tuple(scanner.compact(*span) for span in branches)
+    if 'content' in arguments:
+        text_call = parse_call(scanner, *arguments['content'])
+        if text_call is not None and text_call.name == 'Text':
+            text_arguments = named_arguments(scanner, text_call)
+            if 0 in text_arguments:
+                call.text = scanner.compact(*text_arguments[0])
+    return call
@@ -0,0 +1,261 @@
+"""
+Découverte des fichiers Dart à migrer.
+
+Discovery parcourt une ou plusieurs racines du projet (par défaut
+lib/features, lib/shared, lib/core et lib/app) et produit les fichiers au fil
+du parcours, dans l'ordre de sorted() sur les chemins de chaque racine :
+l'étape de réécriture commence dès le premier fichier trouvé.
+
+Un fichier est retenu s'il correspond à l'un des globs d'inclusion et à
+aucun glob d'exclusion ; les globs portent sur le chemin relatif à la racine
+du projet, * et ? ne traversent pas les /, ** couvre zéro ou plusieurs
+répertoires. Les répertoires build/, .dart_tool/, generated/ et cachés sont
+élagués, ainsi que tout ce qu'ignorent les .gitignore du projet et des
+répertoires parcourus. Avec un ref git, seuls les fichiers modifiés depuis
+ce ref (arbre de travail compris) ou non suivis sont candidats.
+
+lib/shared/utils/notification_service.dart est toujours exclu : c'est
+l'implémentation de NotificationService, qui appelle elle-même showSnackBar.
+"""
+
+import os
+import posixpath
+import re
+import subprocess
+from pathlib import Path
+
+DEFAULT_ROOTS = ('lib/features', 'lib/shared', 'lib/core', 'lib/app')
+DEFAULT_INCLUDES = ('**/*.dart',)
+PROTECTED = ('lib/shared/utils/notification_service.dart',)
+PRUNED_DIRECTORIES = frozenset({'build', '.dart_tool', 'generated'})
+GITIGNORE = '.gitignore'
+
+
+class DiscoveryError(Exception):
+    """Sélection de fichiers impossible (ref git inconnu, dépôt absent...)."""
+
+
+def translate_glob(pattern):
+    """Expression régulière (non ancrée) équivalente au glob pattern."""
+    parts = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if pattern.startswith('**/', index):
+            parts.append('(?:.*/)?')
+            index += 3
+            continue
+        if pattern.startswith('**', index):
+            parts.append('.*')
+            index += 2
+            continue
+        if char == '*':
+            parts.append('[^/]*')
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            close = pattern.find(']', index + 2)
+            if close < 0:
+                parts.append(re.escape(char))
+            else:
+                content = pattern[index + 1:close]
+                if content.startswith('!'):
+                    content = '^' + content[1:]
+                parts.append('[' + content.replace('\\', '\\\\') + ']')
+                index = close
+        else:
+            parts.append(re.escape(char))
+        index += 1
+    return ''.join(parts)
+
+
+def compile_glob(pattern):
+    """Glob sur un chemin relatif complet (séparateur /)."""
+    return re.compile(translate_glob(pattern.lstrip('/')) + r'\Z')
+
+
+class IgnoreRules:
+    """Motifs d'un fichier .gitignore, relatifs à son répertoire base."""
+
+    def __init__(self, base, lines):
+        self.base = base
+        # (regex, négation, répertoires seulement), dans l'ordre du fichier.
+        self.rules = []
+        for line in lines:
+            line = line.rstrip('\n').rstrip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            if line.startswith('\\'):
+                line = line[1:]
+            directory_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+            regex = translate_glob(line.lstrip('/'))
+            if '/' not in line:
+                # Sans / interne, le motif vaut à toute profondeur.
+                regex = '(?:.*/)?' + regex
+            self.rules.append((re.compile(regex + r'\Z'), negated, directory_only))
+
+    @classmethod
+    def load(cls, directory, base):
+        """Règles du .gitignore de directory, ou None s'il n'y en a pas."""
+        try:
+            with open(os.path.join(directory, GITIGNORE), 'r', encoding='utf-8') as f:
+                rules = cls(base, f)
+        except (OSError, UnicodeDecodeError):
+            return None
+        return rules if rules.rules else None
+
+    def match(self, relative, is_dir):
+        """True (ignoré), False (réinclus par !motif) ou None (aucun motif ne s'applique)."""
+        if self.base:
+            relative = relative[len(self.base) + 1:]
+        verdict = None
+        for regex, negated, directory_only in self.rules:
+            if directory_only and not is_dir:
+                continue
+            if regex.match(relative):
+                verdict = not negated
+        return verdict
+
+
+def _ignored(chain, relative, is_dir):
+    ignored = False
+    for rules in chain:
+        verdict = rules.match(relative, is_dir)
+        if verdict is not None:
+            ignored = verdict
+    return ignored
+
+
+def changed_files(project_root, ref):
+    """Chemins relatifs (séparateur /) modifiés depuis ref ou non suivis, triés."""
+    def git(*args):
+        try:
+            completed = subprocess.run(['git', '-C', str(project_root), *args],
+                                       capture_output=True, check=True)
+        except FileNotFoundError as e:
+            raise DiscoveryError("git introuvable") from e
+        except subprocess.CalledProcessError as e:
+            message = e.stderr.decode('utf-8', 'replace').strip()
+            raise DiscoveryError(f"git {args[0]} a échoué : {message}") from e
+        return [os.fsdecode(path) for path in completed.stdout.split(b'\0') if path]
+
+    paths = set(git('diff', '--name-only', '--relative', '-z', '--diff-filter=d', ref, '--'))
+    paths.update(git('ls-files', '-z', '--others', '--exclude-standard'))
+    return sorted(paths)
+
+
+class Discovery:
+    """Sélection des fichiers d'une exécution ; itérer dessus produit les chemins."""
+
+    def __init__(self, project_root, roots=DEFAULT_ROOTS, includes=DEFAULT_INCLUDES,
+                 excludes=(), gitignore=True, changed_since=None):
+        self.project_root = Path(project_root)
+        self.roots = _outermost([_normalize(root) for root in roots])
+        self.includes = [compile_glob(pattern) for pattern in includes]
+        self.excludes = [compile_glob(pattern) for pattern in (*excludes, *PROTECTED)]
+        self.gitignore = gitignore
+        self.changed_since = changed_since
+        self._ignore_rules = {}
+
+    def root_paths(self):
+        """Racines existantes, en chemins du système."""
+        return [self.project_root / root for root in self.roots if (self.project_root / root).is_dir()]
+
+    def __iter__(self):
+        if self.changed_since is not None:
+            for relative in changed_files(self.project_root, self.changed_since):
+                path = self.project_root / relative
+                if self.accepts(path) and path.is_file():
+                    yield path
+            return
+        for root in self.roots:
+            yield from self._walk(root, self._chain(root))
+
+    def accepts(self, path):
+        """Vrai si le fichier path est dans le périmètre (racines, globs, élagage, .gitignore)."""
+        relative = os.path.relpath(os.path.abspath(path), os.path.abspath(self.project_root))
+        relative = relative.replace(os.sep, '/')
+        if relative.startswith('../') or not any(_under(relative, root) for root in self.roots):
+            return False
+        parts = relative.split('/')
+        if any(_pruned(part) for part in parts[:-1]) or not self._selected(relative):
+            return False
+        if not self.gitignore:
+            return True
+        chain = self._chain('')
+        for depth in range(1, len(parts)):
+            directory = '/'.join(parts[:depth])
+            if _ignored(chain, directory, True):
+                return False
+            chain = self._extend(chain, directory)
+        return not _ignored(chain, relative, False)
+
+    def _selected(self, relative):
+        return (any(glob.match(relative) for glob in self.includes)
+                and not any(glob.match(relative) for glob in self.excludes))
+
+    def _rules(self, directory):
+        if directory not in self._ignore_rules:
+            self._ignore_rules[directory] = IgnoreRules.load(self.project_root / directory, directory)
+        return self._ignore_rules[directory]
+
+    def _extend(self, chain, directory):
+        rules = self._rules(directory) if self.gitignore else None
+        return chain if rules is None else chain + (rules,)
+
+    def _chain(self, directory):
+        """Règles .gitignore qui s'appliquent aux entrées de directory."""
+        chain = self._extend((), '')
+        if directory:
+            parts = directory.split('/')
+            for depth in range(1, len(parts) + 1):
+                chain = self._extend(chain, '/'.join(parts[:depth]))
+        return chain
+
+    def _walk(self, directory, chain):
+        try:
+            with os.scandir(self.project_root / directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            return
+        for entry in entries:
+            relative = f'{directory}/{entry.name}' if directory else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                if _pruned(entry.name) or _ignored(chain, relative, True):
+                    continue
+                yield from self._walk(relative, self._extend(chain, relative))
+            elif self._selected(relative) and not _ignored(chain, relative, False):
+                yield self.project_root / relative
+
+
+def _pruned(name):
+    return name in PRUNED_DIRECTORIES or name.startswith('.')
+
+
+def _normalize(root):
+    root = posixpath.normpath(root.replace(os.sep, '/'))
+    return '' if root == '.' else root
+
+
+def _under(relative, root):
+    return not root or relative.startswith(root + '/')
+
+
+def _outermost(roots):
+    """roots sans doublons ni racines contenues dans une autre, dans l'ordre donné."""
+    kept = []
+    for root in roots:
+        if root in kept or any(other != root and _under(root, other) for other in roots):
+            continue
+        kept.append(root)
+    return kept
@@ -0,0 +1,498 @@
+"""
+Moteur de règles des codemods.
+
+Une règle (Rule) déclare un littéral de préfiltre, un matcher, un rewriter et
+les imports dont le code réécrit a besoin. Le moteur lit chaque fichier une
+seule fois, ne lance que les règles dont le préfiltre apparaît dans le
+contenu, fusionne leurs modifications dans un seul tampon de sortie puis
+ajoute les imports manquants. Les fichiers plus gros que
+RunOptions.stream_threshold sont réécrits en flux, région par région (voir
+codemod.stream).
+
+Les scripts de migration enregistrent leurs règles avec register() ;
+load_rules() importe un script par son nom de module pour récupérer les
+siennes.
+"""
+
+import bisect
+import importlib
+import os
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import Callable, NamedTuple
+
+from codemod import profile as profiling
+from codemod import stream
+from codemod.cache import content_hash, file_state
+from codemod.imports import add_imports, directives_end, missing_imports, part_of, relative_import
+from codemod.prefilter import Prefilter, buffer_hash, decode, open_buffer
+from codemod.report import change_records, unified_diff, written_spans
+from codemod.writer import BatchWriter, stage, stage_chunks
+from codemod.results import ERROR, FAILED, MIGRATED, SKIPPED, UNTOUCHED, FileResult, notification_counts
+
+# Règles enregistrées, par nom.
+REGISTRY = {}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Un codemod.
+
+    matcher(content) itère sur des triplets (début, fin, données) ; pour chacun,
+    rewriter(données) rend le texte de remplacement de content[début:fin]
+    (un remplacement identique à l'original est ignoré). imports liste les
+    fichiers de lib/ à importer dans tout fichier modifié par la règle.
+    labeler(données), facultatif, nomme la variante de la règle qui a produit
+    un site (par exemple le pattern), pour les statistiques. patterns,
+    facultatif, est le nom de l'attribut du module qui liste les couples
+    (pattern compilé, remplacement) de la règle ; --profile les instrumente.
+    probes, facultatif, nomme les autres patterns compilés dont se servent le
+    matcher ou le rewriter, à instrumenter aussi : attribut du module de la
+    règle, ou « module:ATTRIBUT » pour un autre module.
+    """
+
+    name: str
+    prefilter: str
+    matcher: Callable
+    rewriter: Callable
+    imports: tuple = ()
+    labeler: Callable = None
+    patterns: str = None
+    probes: tuple = ()
+    module: str = field(default=None, compare=False)
+
+    def applies_to(self, content):
+        return self.prefilter in content
+
+    def label(self, data):
+        """Nom qualifié de la variante qui a produit data, ex. notification_service_v2:pattern8."""
+        if self.labeler is None:
+            return self.name
+        return f'{self.name}:{self.labeler(data)}'
+
+
+class Edit(NamedTuple):
+    """Une modification retenue : content[start:end] devient replacement."""
+
+    start: int
+    end: int
+    replacement: str
+    rule: Rule
+    label: str
+
+
+def register(rule):
+    """Enregistre une règle et la retourne."""
+    if rule.module is None:
+        rule = replace(rule, module=rule.matcher.__module__)
+    REGISTRY[rule.name] = rule
+    return rule
+
+
+def load_rules(module_names):
+    """Importe chaque module et retourne les règles qu'il a enregistrées."""
+    rules = []
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        found = [rule for rule in REGISTRY.values() if rule.module == module.__name__]
+        if not found:
+            raise ValueError(f"Aucune règle enregistrée par le module {module_name}")
+        rules.extend(found)
+    return rules
+
+
+def collect_edits(content, rules, profile=None):
+    """Modifications (Edit) des règles applicables, triées par position.
+
+    Les modifications qui se chevauchent sont résolues en faveur de la plus à
+    gauche, puis de la règle déclarée en premier. Avec un FileProfile, le
+    matcher et le rewriter de chaque règle sont chronométrés.
+    """
+    edits = []
+    for order, rule in enumerate(rules):
+        if not rule.applies_to(content):
+            continue
+        sites = rule.matcher(content)
+        rewriter = rule.rewriter
+        if profile is not None:
+            sites = profile.timed_sites(rule, content, sites)
+            rewriter = profile.timed_rewriter(rule)
+        for start, end, data in sites:
+            replacement = rewriter(data)
+            if replacement is None or replacement == content[start:end]:
+                continue
+            edits.append((start, order, end, replacement, rule, data))
+    edits.sort(key=lambda edit: edit[:2])
+
+    kept = []
+    last_end = 0
+    for start, _, end, replacement, rule, data in edits:
+        if start < last_end:
+            continue
+        kept.append(Edit(start, end, replacement, rule, rule.label(data)))
+        last_end = end
+        if profile is not None:
+            profile.count_edit(rule)
+    return kept
+
+
+def apply_rules(content, rules, profile=None):
+    """Applique les règles en un seul passage ; retourne (contenu, modifications)."""
+    edits = collect_edits(content, rules, profile)
+    return splice(content, edits), edits
+
+
+def splice(content, edits):
+    """content avec les modifications triées appliquées."""
+    if not edits:
+        return content
+    parts = []
+    last = 0
+    for start, end, replacement, _, _ in edits:
+        parts.append(content[last:start])
+        parts.append(replacement)
+        last = end
+    parts.append(content[last:])
+    return ''.join(parts)
+
+
+def calculate_import_path(file_path, project_root, target='shared.dart'):
+    """Calcule le chemin d'import relatif vers lib/<target>."""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    return relative_import(directory, os.path.join(os.path.abspath(project_root), 'lib'), target)
+
+
+def migrate_content(content, file_path, project_root, rules, profile=None):
+    """Contenu migré (imports compris) ; retourne (contenu, modifications)."""
+    with profiling.phase(profile, 'matching', len(content)):
+        new_content, edits = apply_rules(content, rules, profile)
+    if edits:
+        with profiling.phase(profile, 'imports', len(new_content)):
+            new_content = add_imports(new_content, file_path, project_root, import_targets(edits))
+    return new_content, edits
+
+
+def import_targets(edits):
+    """Fichiers de lib/ à importer pour les modifications edits, sans doublon."""
+    targets = []
+    for edit in edits:
+        targets.extend(t for t in edit.rule.imports if t not in targets)
+    return targets
+
+
+def settled_status(content, rules):
+    """Statut qu'aurait le fichier à la prochaine exécution des mêmes règles."""
+    return UNTOUCHED if any(rule.applies_to(content) for rule in rules) else SKIPPED
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    """Options d'exécution transmises aux workers.
+
+    Avec write=False rien n'est écrit : diff et changes demandent alors le
+    diff unifié et le journal des modifications de chaque fichier migrable.
+    profile joint à chaque FileResult les mesures de codemod.profile.
+    Les fichiers d'au moins stream_threshold octets (None : jamais) sont
+    réécrits en flux ; memory_limit borne la mémoire de leur traitement.
+    verify joint à chaque fichier migré les lignes de ses modifications
+    (FileResult.spans), pour codemod.verify. run_id est le jeton de
+    l'exécution porté par les fichiers temporaires (voir codemod.writer).
+    cache demande les entrées de cache (FileResult.cache_entry), donc
+    l'empreinte SHA-256 de chaque fichier : runner.run() et le pipeline le
+    désactivent quand aucun cache n'est actif (--no-cache).
+    """
+
+    write: bool = True
+    diff: bool = False
+    changes: bool = False
+    profile: bool = False
+    stream_threshold: int = stream.DEFAULT_STREAM_THRESHOLD
+    memory_limit: int = stream.DEFAULT_MEMORY_LIMIT
+    verify: bool = False
+    run_id: str = ''
+    cache: bool = True
+
+
+DEFAULT_OPTIONS = RunOptions()
+
+
+def process_file(rules, project_root, task, options=DEFAULT_OPTIONS):
+    """Traite un fichier ; appelé dans le processus parent ou dans un worker.
+
+    task est un couple (chemin, entrée de cache connue ou None). Le fichier
+    est chargé une fois en octets : si son empreinte est celle de l'entrée
+    connue, les règles ne sont pas relancées ; si aucun préfiltre n'y
+    apparaît, il n'est pas décodé. Le tampon chargé est transmis tel quel à
+    l'étape de réécriture, ou réécrit en flux s'il est assez gros.
+    """
+    return _profiled(_process_file, rules, project_root, task, options)
+
+
+def transform_file(rules, project_root, task, options=DEFAULT_OPTIONS):
+    """Étape de calcul seule, pour un fichier déjà lu ; n'écrit rien.
+
+    task est un quadruplet (chemin, entrée de cache connue ou None, état du
+    fichier, octets lus). Retourne (FileResult, contenu à écrire ou None) ;
+    le contenu s'écrit ensuite avec stage_result(). Sans octets lus (None,
+    fichier à réécrire en flux), le fichier est traité comme par
+    process_file(), préparation du fichier temporaire comprise.
+    """
+    return _profiled(_transform_file, rules, project_root, task, options)
+
+
+def _profiled(func, rules, project_root, task, options):
+    if not options.profile:
+        return func(rules, project_root, task, options, None)
+    profile = profiling.FileProfile()
+    with profiling.instrument(rules), profile.activate():
+        output = func(rules, project_root, task, options, profile)
+    result = output[0] if isinstance(output, tuple) else output
+    result.profile = profile.to_dict()
+    return output
+
+
+def _process_file(rules, project_root, task, options, profile):
+    dart_file, known = task
+    path = str(dart_file)
+    try:
+        with profiling.phase(profile, 'io'):
+            state = file_state(dart_file)
+            with open_buffer(dart_file) as buffer:
+                if profile is not None:
+                    profile.add_bytes('io', len(buffer))
+                if stream.streamable(buffer, options.stream_threshold):
+                    # Toute la réécriture en flux est comptée dans la phase io.
+                    result, screened = _screen(rules, path, state, buffer, known, options.cache)
+                    if result is not None:
+                        return result
+                    return _stream_file(rules, project_root, dart_file, buffer, screened,
+                                        options, profile)
+                result, loaded = _examine(rules, path, state, buffer, known, options.cache)
+    except Exception as e:
+        return FileResult(path, ERROR, message=str(e))
+    if result is not None:
+        return result
+    result, new_content = _rewrite(rules, project_root, path, loaded, options, profile)
+    if new_content is None:
+        return result
+    with profiling.phase(profile, 'write', len(new_content)):
+        return stage_result(result, dart_file, new_content, rules, options.run_id, options.cache)
+
+
+def _transform_file(rules, project_root, task, options, profile):
+    dart_file, known, state, data = task
+    path = str(dart_file)
+    if data is None:
+        return _process_file(rules, project_root, (dart_file, known), options, profile), None
+    try:
+        result, loaded = _examine(rules, path, state, data, known, options.cache)
+    except Exception as e:
+        return FileResult(path, ERROR, message=str(e)), None
+    if result is not None:
+        return result, None
+    return _rewrite(rules, project_root, path, loaded, options, profile)
+
+
+def _examine(rules, path, state, buffer, known, cache=True):
+    """Empreinte, cache et préfiltre du tampon.
+
+    Retourne (FileResult, None) si le fichier est réglé sans décodage, sinon
+    (None, (état, empreinte, taille, règles applicables, contenu décodé)).
+    """
+    result, screened = _screen(rules, path, state, buffer, known, cache)
+    if result is not None:
+        return result, None
+    return None, screened + (decode(buffer),)
+
+
+def _screen(rules, path, state, buffer, known, cache=True):
+    """Comme _examine(), sans décoder : (None, (état, empreinte, taille, règles applicables)).
+
+    Sans cache, l'empreinte n'est pas calculée (None) et aucune entrée de
+    cache n'est produite.
+    """
+    scanned = len(buffer)
+    digest = buffer_hash(buffer) if cache else None
+    if known is not None and known['sha256'] == digest:
+        entry = _cache_entry(state, digest, known['status'])
+        return FileResult(path, known['status'], cache_entry=entry, cached=True,
+                          bytes_scanned=scanned), None
+    applicable = Prefilter(rules).applicable(buffer)
+    if not applicable:
+        entry = _cache_entry(state, digest, SKIPPED)
+        return FileResult(path, SKIPPED, cache_entry=entry, bytes_scanned=scanned), None
+    return None, (state, digest, scanned, applicable)
+
+
+def _cache_entry(state, digest, status):
+    """Entrée de cache d'un fichier, ou None si son empreinte n'a pas été calculée."""
+    if digest is None:
+        return None
+    return dict(state, sha256=digest, status=status)
+
+
+def _rewrite(rules, project_root, path, loaded, options, profile):
+    """Applique les règles au contenu décodé ; retourne (FileResult, contenu à écrire ou None)."""
+    state, digest, scanned, applicable, content = loaded
+    try:
+        new_content, edits = migrate_content(content, path, project_root, applicable, profile)
+        if new_content == content:
+            entry = _cache_entry(state, digest, UNTOUCHED)
+            return FileResult(path, UNTOUCHED, cache_entry=entry,
+                              bytes_scanned=scanned, bytes_decoded=scanned), None
+        rule_counts = {}
+        for edit in edits:
+            rule_counts[edit.label] = rule_counts.get(edit.label, 0) + 1
+        result = FileResult(path, MIGRATED, notification_counts(content, new_content),
+                            bytes_scanned=scanned, bytes_decoded=scanned, rule_counts=rule_counts)
+        owner = part_of(content)
+        if owner is not None and import_targets(edits):
+            result.part_of = (owner, import_targets(edits))
+        if options.write:
+            if options.verify:
+                result.spans = written_spans(content, edits, new_content)
+            return result, new_content
+        relative = os.path.relpath(path, project_root)
+        with profiling.phase(profile, 'report', len(new_content)):
+            if options.diff:
+                result.diff = unified_diff(relative, content, new_content)
+            if options.changes:
+                result.changes = change_records(relative, content, edits)
+        return result, None
+    except Exception as e:
+        return FileResult(path, FAILED, message=f"Erreur lors de la migration de {path}: {e}"), None
+
+
+def _stream_file(rules, project_root, dart_file, buffer, screened, options, profile):
+    """Réécriture en flux d'un gros fichier ; retourne un FileResult.
+
+    Hors simulation, le résultat est préparé directement dans un fichier
+    temporaire. Un fichier qui ne se découpe pas en régions est traité en
+    mémoire si memory_limit le permet, sinon il est laissé intact.
+    """
+    path = str(dart_file)
+    scanned = screened[2]
+    try:
+        try:
+            return _stream_regions(rules, project_root, dart_file, buffer, screened, options, profile)
+        except stream.NotStreamable as e:
+            if not stream.fits_in_memory(scanned, options.memory_limit):
+                return FileResult(path, FAILED, message=f"Fichier trop volumineux pour {path}: {e}")
+        result, new_content = _rewrite(rules, project_root, path, screened + (decode(buffer),),
+                                       options, profile)
+    except Exception as e:
+        return FileResult(path, FAILED, message=f"Erreur lors de la migration de {path}: {e}")
+    if new_content is None:
+        return result
+    return stage_result(result, dart_file, new_content, rules, options.run_id, options.cache)
+
+
+def _stream_regions(rules, project_root, dart_file, buffer, screened, options, profile):
+    """Règles appliquées région par région, puis imports et sortie par morceaux."""
+    path = str(dart_file)
+    relative = os.path.relpath(path, project_root)
+    state, digest, scanned, applicable = screened
+    collect = partial(collect_edits, rules=applicable, profile=profile)
+    hits = stream.find_hits(buffer, Prefilter(applicable).literals)
+    edits = []
+    counts = {}
+    rule_counts = {}
+    targets = []
+    changes = [] if options.changes else None
+    spans = [] if options.write and options.verify else None
+    decoded = lines = counted = shift = 0
+    for start, end, text, region_edits in stream.rewrite_regions(
+            buffer, hits, collect, memory_limit=options.memory_limit):
+        decoded += end - start
+        if not region_edits:
+            continue
+        for kind, n in notification_counts(text, splice(text, region_edits)).items():
+            counts[kind] = counts.get(kind, 0) + n
+        for edit in region_edits:
+            rule_counts[edit.label] = rule_counts.get(edit.label, 0) + 1
+            targets.extend(t for t in edit.rule.imports if t not in targets)
+        if changes is not None or spans is not None:
+            lines += stream.count_lines(buffer, counted, start)
+            counted = start
+        if spans is not None:
+            spans.extend(written_spans(text, region_edits, line=lines + 1 + shift))
+            shift += sum(edit.replacement.count('\n') - text.count('\n', edit.start, edit.end)
+                         for edit in region_edits)
+        if changes is not None:
+            for record in change_records(relative, text, region_edits):
+                record['start_line'] += lines
+                record['end_line'] += lines
+                changes.append(record)
+        edits.extend(stream.byte_edits(start, text, region_edits))
+    if not edits:
+        entry = _cache_entry(state, digest, UNTOUCHED)
+        return FileResult(path, UNTOUCHED, cache_entry=entry, bytes_scanned=scanned,
+                          bytes_decoded=decoded, streamed=True)
+
+    owner = None
+    if targets:
+        header = stream.read_header(buffer, directives_end, options.memory_limit)
+        owner = part_of(header)
+        insert_at, block = missing_imports(header, path, project_root, targets)
+        if block:
+            at = len(header[:insert_at].encode('utf-8'))
+            if any(start < at < end for start, end, _ in edits):
+                raise stream.NotStreamable("imports à insérer dans une modification")
+            index = bisect.bisect_left([start for start, _, _ in edits], at)
+            if spans is not None:
+                added = block.count('\n')
+                spans[index:] = [(first + added, last + added, label)
+                                 for first, last, label in spans[index:]]
+            edits.insert(index, (at, at, block.encode('utf-8')))
+
+    result = FileResult(path, MIGRATED, counts, bytes_scanned=scanned, bytes_decoded=decoded,
+                        rule_counts=rule_counts, streamed=True, spans=spans)
+    if owner is not None:
+        result.part_of = (owner, targets)
+    if not options.write:
+        if options.diff:
+            result.diff = stream.segments_diff(relative, buffer, edits)
+        result.changes = changes
+        return result
+    if not options.cache:
+        result.staged = stage_chunks(dart_file, stream.spliced(buffer, edits), options.run_id)
+        return result
+    output = stream.OutputDigest(Prefilter(rules).literals)
+    result.staged = stage_chunks(dart_file, output.feed(stream.spliced(buffer, edits)), options.run_id)
+    result.cache_entry = dict(file_state(result.staged), sha256=output.hexdigest(),
+                              status=UNTOUCHED if output.found else SKIPPED)
+    return result
+
+
+def stage_result(result, dart_file, new_content, rules, run_id='', cache=True):
+    """Écrit new_content dans un fichier temporaire et complète result (staged, cache)."""
+    try:
+        # Le renommage sur la cible conserve le mtime du fichier temporaire.
+        result.staged = stage(dart_file, new_content, run_id)
+        if cache:
+            result.cache_entry = dict(file_state(result.staged), sha256=content_hash(new_content),
+                                      status=settled_status(new_content, rules))
+    except Exception as e:
+        return FileResult(result.path, FAILED,
+                          message=f"Erreur lors de la migration de {result.path}: {e}")
+    return result
+
+
+def migrate_file_result(file_path, project_root, rules):
+    """Migre un fichier avec les règles données, écrit le résultat et retourne le FileResult."""
+    result = process_file(rules, project_root, (file_path, None))
+    if result.staged is not None:
+        with BatchWriter(batch_size=1) as writer:
+            writer.add(result.staged, file_path)
+    return result
+
+
+def migrate_file(file_path, project_root, rules):
+    """Migre un fichier ; True s'il a été modifié, False sinon (erreur affichée), comme
+    les migrate_file() historiques des scripts."""
+    result = migrate_file_result(file_path, project_root, rules)
+    if result.status == FAILED:
+        print(result.message)
+    elif result.status == ERROR:
+        print(f"Erreur: {file_path}: {result.message}")
+    return result.status == MIGRATED
@@ -0,0 +1,196 @@
+"""
+Corpus doré des migrations NotificationService (v1, v2, final).
+
+Chaque cas est un répertoire du corpus :
+- input.dart : extrait réel de lib/ (l'en-tête indique le fichier d'origine)
+  ou cas adversarial (chaînes, commentaires, parenthèses imbriquées, appel non
+  fermé, fins de ligne CRLF...) ;
+- expected.dart : la migration attendue, écrite à la main d'après le contrat
+  de NotificationService (showError préfixe lui-même « Erreur: » et retire
+  « Exception: ») ;
+- <implémentation>.dart, facultatif : sortie figée d'une implémentation qui
+  s'écarte de la référence. C'est une divergence connue, visible dans le
+  dépôt et dans les matrices.
+
+run_cases() migre chaque cas par chaque implémentation, en mémoire et imports
+compris, comme si le fichier était lib/features/golden/<cas>.dart. La source
+passe d'abord par prefilter.decode(), comme à la lecture d'un fichier : les
+fins de ligne CRLF y sont normalisées comme lors d'une vraie exécution.
+agreement() et throughput() donnent les matrices du rapport.
+"""
+
+import difflib
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from codemod import engine
+from codemod.prefilter import decode
+
+IMPLEMENTATIONS = {
+    'v1': 'migrate_to_notification_service',
+    'v2': 'migrate_to_notification_service_v2',
+    'final': 'migrate_to_notification_service_final',
+}
+INPUT = 'input.dart'
+REFERENCE = 'expected'
+# Tours de mesure du débit ; le meilleur tour est retenu.
+DEFAULT_REPEAT = 5
+
+
+class Case(NamedTuple):
+    """Un cas du corpus ; pinned associe une implémentation à sa sortie figée."""
+
+    name: str
+    source: str
+    expected: str
+    pinned: dict
+
+    def wanted(self, implementation):
+        """Sortie attendue d'implementation : sa sortie figée, sinon la référence."""
+        return self.pinned.get(implementation, self.expected)
+
+
+def _read(path):
+    # newline='' : les fins de ligne CRLF font partie des cas.
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def load_cases(directory):
+    """Cas des sous-répertoires de directory qui contiennent input.dart, par nom."""
+    cases = []
+    for case_dir in sorted(Path(directory).iterdir()):
+        if not (case_dir / INPUT).is_file():
+            continue
+        pinned = {name: _read(case_dir / f'{name}.dart')
+                  for name in IMPLEMENTATIONS if (case_dir / f'{name}.dart').is_file()}
+        cases.append(Case(case_dir.name, _read(case_dir / INPUT),
+                          _read(case_dir / f'{REFERENCE}.dart'), pinned))
+    return cases
+
+
+def load_rules(implementations=tuple(IMPLEMENTATIONS)):
+    """{implémentation: règles}, dans l'ordre de implementations."""
+    return {name: engine.load_rules([IMPLEMENTATIONS[name]]) for name in implementations}
+
+
+def virtual_path(root, name):
+    """Chemin fictif du cas name sous root, qui fixe le chemin relatif des imports ajoutés."""
+    return Path(root) / 'lib' / 'features' / 'golden' / f'{name}.dart'
+
+
+def migrate(rules, case, root):
+    """(contenu migré, modifications) du cas, sans rien lire ni écrire d'autre.
+
+    La source est décodée comme un fichier lu par le moteur (voir decode()).
+    """
+    source = decode(case.source.encode('utf-8'))
+    return engine.migrate_content(source, virtual_path(root, case.name), root, rules)
+
+
+def run_cases(cases, rules_by_implementation, root):
+    """{nom du cas: {implémentation: contenu migré}}."""
+    return {case.name: {name: migrate(rules, case, root)[0]
+                        for name, rules in rules_by_implementation.items()}
+            for case in cases}
+
+
+def agreement(cases, outputs):
+    """Matrice d'accord : {a: {b: nombre de cas où a et b donnent le même texte}}.
+
+    La référence (expected.dart) est traitée comme une implémentation de plus.
+    """
+    columns = {}
+    for case in cases:
+        columns.setdefault(REFERENCE, []).append(case.expected)
+        for name, output in outputs[case.name].items():
+            columns.setdefault(name, []).append(output)
+    return {a: {b: sum(x == y for x, y in zip(columns[a], columns[b])) for b in columns}
+            for a in columns}
+
+
+def divergences(cases, outputs):
+    """[(cas, [implémentations dont la sortie diffère de la référence])], cas concernés seulement."""
+    found = []
+    for case in cases:
+        names = [name for name, output in outputs[case.name].items() if output != case.expected]
+        if names:
+            found.append((case.name, names))
+    return found
+
+
+class Throughput(NamedTuple):
+    """Débit d'une implémentation sur tout le corpus (meilleur tour)."""
+
+    seconds: float
+    files_per_sec: float
+    mb_per_sec: float
+    edits: int
+
+
+def throughput(cases, rules_by_implementation, root, repeat=DEFAULT_REPEAT):
+    """{implémentation: Throughput}, chaque tour migrant tous les cas en mémoire."""
+    size = sum(len(case.source.encode('utf-8')) for case in cases)
+    results = {}
+    for name, rules in rules_by_implementation.items():
+        best = None
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            edits = sum(len(migrate(rules, case, root)[1]) for case in cases)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = Throughput(best, len(cases) / best if best else 0.0,
+                                   size / (1 << 20) / best if best else 0.0, edits)
+    return results
+
+
+def unified(expected, actual, name, label):
+    """Diff unifié de la sortie attendue vers la sortie obtenue ; les \\r sont rendus visibles."""
+    def lines(text):
+        return [line.replace('\r', '\\r') for line in text.splitlines(keepends=True)]
+    return ''.join(difflib.unified_diff(lines(expected), lines(actual),
+                                        fromfile=f'{name}/{label}', tofile=f'{name} (obtenu)'))
+
+
+def pin(directory, case, implementation, output):
+    """Fige output comme sortie de implementation pour case ; retire le fichier si elle rejoint la référence."""
+    path = Path(directory) / case.name / f'{implementation}.dart'
+    if output == case.expected:
+        if path.is_file():
+            path.unlink()
+    elif case.pinned.get(implementation) != output:
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(output)
+
+
+def format_report(cases, outputs, timings):
+    """Lignes du rapport : corpus, matrice d'accord, écarts à la référence, débit."""
+    real = sum(case.name.startswith('real_') for case in cases)
+    size = sum(len(case.source.encode('utf-8')) for case in cases)
+    lines = [f"Corpus doré : {len(cases)} cas ({real} extraits de lib/, {len(cases) - real} adversariaux), "
+             f"{size / 1024:.1f} Ko"]
+
+    matrix = agreement(cases, outputs)
+    names = list(matrix)
+    width = max(len(name) for name in names) + 2
+    lines.append('')
+    lines.append(f"Accord (cas aux sorties identiques, sur {len(cases)}) :")
+    lines.append(' ' * width + ''.join(f'{name:>{width}}' for name in names))
+    for a in names:
+        lines.append(f'{a:<{width}}' + ''.join(f'{matrix[a][b]:>{width}}' for b in names))
+
+    found = divergences(cases, outputs)
+    if found:
+        lines.append('')
+        lines.append('Écarts à la référence :')
+        for name, implementations in found:
+            lines.append(f"  {name}: {', '.join(implementations)}")
+
+    if timings:
+        lines.append('')
+        lines.append(f"{'Impl.':<8}{'Temps (ms)':>12}{'Fichiers/s':>12}{'Mo/s':>9}{'Sites':>7}")
+        for name, result in timings.items():
+            lines.append(f"{name:<8}{result.seconds * 1000:>12.2f}{result.files_per_sec:>12.0f}"
+                         f"{result.mb_per_sec:>9.2f}{result.edits:>7}")
+    return lines
@@ -0,0 +1,154 @@
+"""
+Ajout des imports demandés par les règles (Rule.imports).
+
+Seul le bloc de directives en tête de fichier est examiné : la lecture
+s'arrête à la première ligne qui n'est ni une directive library, import,
+export, part ou part of, ni un commentaire. Les imports s'insèrent avant les
+directives part. Un fichier part of partage les imports de sa bibliothèque :
+rien n'y est inséré, l'appelant signale le fichier (voir part_of()). Un
+import existant est reconnu qu'il soit relatif ou de la forme
+package:<nom du pubspec>/..., et quel que soit le chemin relatif utilisé
+pour y arriver. Le chemin relatif d'un répertoire vers lib/<cible> est
+calculé une seule fois par répertoire.
+"""
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+_DIRECTIVE = re.compile(r'''((?:library|import|export)\b|part\s+of\b|part(?=\s*['"]))''')
+_URI = re.compile(r'''(['"])(.*?)\1''')
+
+
+@lru_cache(maxsize=None)
+def package_name(project_root):
+    """Nom du package déclaré dans pubspec.yaml, ou None."""
+    try:
+        with open(os.path.join(project_root, 'pubspec.yaml'), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('name:'):
+                    return line.split(':', 1)[1].strip().strip('\'"') or None
+    except OSError:
+        pass
+    return None
+
+
+@lru_cache(maxsize=None)
+def relative_import(directory, lib_dir, target):
+    """Chemin d'import de lib/<target> depuis les fichiers de directory."""
+    depth = len(Path(directory).relative_to(lib_dir).parts)
+    return '../' * depth + target if depth > 0 else target
+
+
+def locate_import_block(content):
+    """Position d'insertion d'un import et URIs déjà importées.
+
+    La position est la fin de la ligne du dernier import (ou, à défaut, de
+    la directive library) ; sans directive, c'est le début de la première
+    ligne de code, après les commentaires d'en-tête.
+    """
+    insert_at, uris, _, _ = _scan_directives(content)
+    return insert_at, uris
+
+
+def directives_end(content):
+    """Position où s'arrête la lecture du bloc de directives."""
+    return _scan_directives(content)[2]
+
+
+def part_of(content):
+    """Bibliothèque désignée par la directive part of du fichier (URI ou nom), ou None."""
+    return _scan_directives(content)[3]
+
+
+def _scan_directives(content):
+    uris = []
+    insert_at = None
+    owner = None
+    pos = 0
+    length = len(content)
+    while pos < length:
+        line_end = content.find('\n', pos)
+        if line_end < 0:
+            line_end = length
+        line = content[pos:line_end].lstrip()
+        if not line or line.startswith('//'):
+            pos = line_end + 1
+            continue
+        if line.startswith('/*'):
+            close = content.find('*/', pos)
+            if close < 0:
+                break
+            line_end = content.find('\n', close)
+            pos = length if line_end < 0 else line_end + 1
+            continue
+        directive = _DIRECTIVE.match(line)
+        if directive is None:
+            break
+        semicolon = content.find(';', pos)
+        if semicolon < 0:
+            break
+        line_end = content.find('\n', semicolon)
+        line_end = length if line_end < 0 else line_end + 1
+        kind = directive.group(1)
+        if kind == 'import':
+            uri = _URI.search(content, pos, semicolon)
+            if uri:
+                uris.append(uri.group(2))
+        if kind.startswith('part'):
+            if kind != 'part':
+                uri = _URI.search(content, pos, semicolon)
+                owner = uri.group(2) if uri else content[pos:semicolon].split(None, 2)[-1]
+            if insert_at is None:
+                insert_at = pos
+        elif kind != 'export' or insert_at is None:
+            insert_at = line_end
+        pos = line_end
+    if insert_at is None:
+        insert_at = min(pos, length)
+    return insert_at, uris, min(pos, length), owner
+
+
+def imports_target(uri, directory, lib_dir, target, package):
+    """Vrai si uri, importée depuis directory, désigne lib/<target>."""
+    if uri.startswith('dart:'):
+        return False
+    if uri.startswith('package:'):
+        name, _, path = uri[len('package:'):].partition('/')
+        return path == target and (package is None or name == package)
+    return os.path.normpath(os.path.join(directory, uri)) == os.path.normpath(os.path.join(lib_dir, target))
+
+
+def missing_imports(content, file_path, project_root, targets):
+    """(position d'insertion, texte à insérer) des imports de lib/<target> absents.
+
+    Le texte est vide si aucun ne manque, ou si content est un fichier part of.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    lib_dir = os.path.join(os.path.abspath(project_root), 'lib')
+    package = package_name(str(project_root))
+    insert_at, uris, _, owner = _scan_directives(content)
+    if owner is not None:
+        return insert_at, ''
+    lines = [
+        f"import '{relative_import(directory, lib_dir, target)}';"
+        for target in targets
+        if not any(imports_target(uri, directory, lib_dir, target, package) for uri in uris)
+    ]
+    if not lines:
+        return insert_at, ''
+    block = '\n'.join(lines)
+    if insert_at == len(content) and content and not content.endswith('\n'):
+        block = '\n' + block
+    else:
+        block += '\n'
+    return insert_at, block
+
+
+def add_imports(content, file_path, project_root, targets):
+    """Ajoute les imports relatifs de lib/<target> absents du bloc d'imports."""
+    insert_at, block = missing_imports(content, file_path, project_root, targets)
+    if not block:
+        return content
+    return content[:insert_at] + block + content[insert_at:]
@@ -0,0 +1,194 @@
+"""
+Patterns compilés des migrations ScaffoldMessenger → NotificationService.
+
+Les jeux de patterns de v1 et v2 sont compilés et vérifiés par
+codemod.patterns.compile_patterns() au premier accès à V1_PATTERNS ou
+V2_PATTERNS, c'est-à-dire au chargement du script qui s'en sert : un script
+ne paie que la compilation de ses propres patterns. Les remplacements sont
+des fonctions de niveau module. Les scripts de migration n'ont donc aucun
+coût de préparation par fichier.
+"""
+
+import re
+
+from codemod.patterns import compile_patterns
+
+ANCHOR = 'ScaffoldMessenger.of(context).showSnackBar'
+FLAGS = re.MULTILINE | re.DOTALL
+
+# --- v1 (migrate_to_notification_service.py) --------------------------------
+
+def v1_conditional(match):
+    content_text = match.group(1)
+    condition = match.group(2)
+    return f'if ({condition}) {{\n        NotificationService.showSuccess(context, {content_text});\n      }} else {{\n        NotificationService.showError(context, {content_text});\n      }}'
+
+# Patterns dans l'ordre historique des passes : à un site donné, le premier
+# pattern qui correspond l'emporte. Tous s'arrêtent à la première parenthèse
+# fermante non attendue, un match ne déborde donc jamais sur l'appel suivant.
+V1_SPECS = [
+    # Pattern 1: Succès avec backgroundColor: Colors.green (multi-ligne)
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content: Text\(([^)]+)\),\s*backgroundColor: Colors\.green,\s*\),\s*\);',
+     r'NotificationService.showSuccess(context, \1);'),
+    # Pattern 2: Erreur avec backgroundColor: Colors.red (multi-ligne)
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content: Text\(([^)]+)\),\s*backgroundColor: Colors\.red,\s*\),\s*\);',
+     r'NotificationService.showError(context, \1);'),
+    # Pattern 3: Erreur avec 'Erreur: ' prefix et backgroundColor: Colors.red
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content: Text\(\'Erreur: \'\s*\+\s*([^)]+)\),\s*backgroundColor: Colors\.red,\s*\),\s*\);',
+     r'NotificationService.showError(context, \1);'),
+    # Pattern 4: Erreur avec replaceAll('Exception: ', '')
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content: Text\(\'Erreur: \'\s*\+\s*([^)]+\.replaceAll\(\'Exception: \', \'\'\))\),\s*backgroundColor: Colors\.red,\s*\),\s*\);',
+     r'NotificationService.showError(context, \1);'),
+    # Pattern 5: const SnackBar avec backgroundColor: Colors.red
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*const SnackBar\(\s*content: Text\(([^)]+)\),\s*backgroundColor: Colors\.red,\s*\),\s*\);',
+     r'NotificationService.showError(context, \1);'),
+    # Pattern 6: SnackBar avec backgroundColor: Colors.red (sans const)
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content: Text\(([^)]+)\),\s*backgroundColor: Colors\.red,\s*\),\s*\);',
+     r'NotificationService.showError(context, \1);'),
+    # Pattern 7: SnackBar avec backgroundColor: Theme.of(context).colorScheme.error
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content: Text\(([^)]+)\),\s*backgroundColor: Theme\.of\(context\)\.colorScheme\.error,\s*\),\s*\);',
+     r'NotificationService.showError(context, \1);'),
+    # Pattern 8: const SnackBar simple (sans backgroundColor) - généralement info
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*const SnackBar\(\s*content: Text\(([^)]+)\),\s*\),\s*\);',
+     r'NotificationService.showInfo(context, \1);'),
+    # Pattern 9: SnackBar simple (sans backgroundColor) - généralement info
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content: Text\(([^)]+)\),\s*\),\s*\);',
+     r'NotificationService.showInfo(context, \1);'),
+    # Pattern 10: SnackBar avec backgroundColor conditionnel (success ? green : red)
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content: Text\(([^)]+)\),\s*backgroundColor: ([^)]+)\s*\?\s*Colors\.green\s*:\s*Colors\.red,\s*\),\s*\);',
+     v1_conditional),
+]
+
+
+# --- v2 (migrate_to_notification_service_v2.py) -----------------------------
+
+TEXT_CALL = re.compile(r'Text\(([^)]+)\)')
+
+def show(method, text):
+    return f'NotificationService.{method}(context, {text});'
+
+def v2_success(m):
+    return show('showSuccess', m.group(1))
+
+def v2_error(m):
+    return show('showError', m.group(1))
+
+def v2_info(m):
+    return show('showInfo', m.group(1))
+
+def conditional(condition, content_text, when_true='showSuccess', when_false='showError'):
+    """if/else entre deux appels NotificationService, selon condition."""
+    return f'''if ({condition}) {{
+        NotificationService.{when_true}(context, {content_text});
+      }} else {{
+        NotificationService.{when_false}(context, {content_text});
+      }}'''
+
+def v2_conditional(m):
+    return conditional(m.group(2).strip(), m.group(1))
+
+def v2_by_color(m):
+    # Extraire le texte du Text()
+    text_match = TEXT_CALL.search(m.group(0))
+    if text_match:
+        method = 'showSuccess' if m.group(1) == 'green' else 'showError'
+        return show(method, text_match.group(1))
+    return m.group(0)  # Fallback
+
+# Règles dans l'ordre historique des passes : à un site donné, la première
+# règle qui correspond l'emporte, exactement comme avec les re.sub successifs.
+V2_SPECS = [
+    # Pattern 1: Succès avec backgroundColor: Colors.green (multi-ligne avec DOTALL)
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content:\s*Text\(([^)]+)\),\s*backgroundColor:\s*Colors\.green[^)]*\),\s*\);',
+     v2_success),
+    # Pattern 2: Erreur avec backgroundColor: Colors.red
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content:\s*Text\(([^)]+)\),\s*backgroundColor:\s*Colors\.red[^)]*\),\s*\);',
+     v2_error),
+    # Pattern 3: Erreur avec 'Erreur: ' + variable
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content:\s*Text\(\'Erreur:\s*\'[^)]*\+\s*([^)]+)\),\s*backgroundColor:\s*Colors\.red[^)]*\),\s*\);',
+     v2_error),
+    # Pattern 4: const SnackBar avec backgroundColor: Colors.red
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*const\s+SnackBar\(\s*content:\s*Text\(([^)]+)\),\s*backgroundColor:\s*Colors\.red[^)]*\),\s*\);',
+     v2_error),
+    # Pattern 5: SnackBar avec backgroundColor: Theme.of(context).colorScheme.error
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content:\s*Text\(([^)]+)\),\s*backgroundColor:\s*Theme\.of\(context\)\.colorScheme\.error[^)]*\),\s*\);',
+     v2_error),
+    # Pattern 6: const SnackBar simple (info)
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*const\s+SnackBar\(\s*content:\s*Text\(([^)]+)\),\s*\),\s*\);',
+     v2_info),
+    # Pattern 7: SnackBar simple sans backgroundColor (info)
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content:\s*Text\(([^)]+)\),\s*\),\s*\);',
+     v2_info),
+    # Pattern 8: SnackBar avec backgroundColor conditionnel (success ? green : red)
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content:\s*Text\(([^)]+)\),\s*backgroundColor:\s*([^?]+)\s*\?\s*Colors\.green\s*:\s*Colors\.red[^)]*\),\s*\);',
+     v2_conditional),
+    # Pattern 9: Patterns multi-lignes complexes avec Text() sur plusieurs lignes
+    (r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content:\s*Text\([^)]*\),\s*backgroundColor:\s*Colors\.(green|red)[^)]*\),\s*\);',
+     v2_by_color),
+]
+
+# Seul le pattern 8 peut déborder d'un site sur le suivant ([^?]+ traverse
+# les parenthèses). Ce préfixe sert à détecter ce cas.
+V2_CONDITIONAL_PREFIX_SOURCE = (
+    r'ScaffoldMessenger\.of\(context\)\.showSnackBar\(\s*SnackBar\(\s*content:\s*Text\(([^)]+)\),\s*backgroundColor:\s*'
+)
+V2_CONDITIONAL_INDEX = 7
+
+
+# --- version finale (migrate_to_notification_service_final.py) --------------
+
+# Arguments de SnackBar que NotificationService remplace sans perte notable.
+MIGRATABLE_SNACKBAR_ARGUMENTS = frozenset({'content', 'backgroundColor', 'duration'})
+
+# Type de notification d'après la couleur de fond et le texte, sans passer le
+# bloc en minuscules.
+ERROR_BACKGROUND = re.compile(r'colors\.red|colorscheme\.error', re.IGNORECASE)
+SUCCESS_BACKGROUND = re.compile(r'colors\.green', re.IGNORECASE)
+ERREUR_TEXT = re.compile(r'[\'"]erreur:', re.IGNORECASE)
+
+
+def notification_type(background, text):
+    """'error', 'success' ou 'info' d'après la couleur de fond et le texte (compactés)."""
+    background = background or ''
+    # Erreur (recherches insensibles à la casse, sans copie en minuscules)
+    if ERROR_BACKGROUND.search(background) or ERREUR_TEXT.search(text or ''):
+        return 'error'
+    # Succès
+    if SUCCESS_BACKGROUND.search(background):
+        return 'success'
+    # Info par défaut
+    return 'info'
+
+def conditional_types(condition, text):
+    """Types des branches d'un fond conditionnel (condition, alors, sinon)."""
+    _, when_true, when_false = condition
+    return notification_type(when_true, text), notification_type(when_false, text)
+
+def snackbar_type(background, text, condition=None):
+    """Type d'un SnackBar : 'conditional' si les branches d'un fond conditionnel diffèrent."""
+    if condition is None:
+        return notification_type(background, text)
+    when_true, when_false = conditional_types(condition, text)
+    return when_true if when_true == when_false else 'conditional'
+
+# Nettoyage du texte migré.
+ERREUR_PREFIX = re.compile(r'[\'"]\s*erreur\s*:\s*[\'"]\s*\+\s*', re.IGNORECASE)
+EXCEPTION_REPLACE_ALL = re.compile(r'\.replaceAll\s*\(\s*[\'"]Exception:\s*[\'"]\s*,\s*[\'"]\s*[\'"]\s*\)')
+
+# Jeux compilés à la demande (voir __getattr__).
+_LAZY = {
+    'V1_PATTERNS': lambda: compile_patterns(V1_SPECS, FLAGS, ANCHOR),
+    'V2_PATTERNS': lambda: compile_patterns(V2_SPECS, FLAGS, ANCHOR),
+    'V2_CONDITIONAL_PREFIX': lambda: compile_patterns(
+        [(V2_CONDITIONAL_PREFIX_SOURCE, '')], FLAGS, ANCHOR)[0][0],
+}
+
+
+def __getattr__(name):
+    """Compile un jeu de patterns à son premier accès, puis le garde dans le module."""
+    try:
+        factory = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = factory()
+    return value
@@ -0,0 +1,84 @@
+"""
+Compilation et vérification des patterns de règles.
+
+compile_patterns() compile une fois pour toutes, avec leurs options, les
+patterns d'une règle et vérifie au chargement du module que chacun compile,
+commence par un préfixe littéral (celui de l'ancre de la règle, le cas
+échéant), lu sur l'arbre de sre_parse et sensible à la casse, et que ses
+gabarits de remplacement ne citent que des groupes existants. Une règle invalide échoue ainsi au démarrage, avant de toucher un
+fichier, et aucun pattern ne dépend du cache interne de re.
+"""
+
+import re
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+_GROUP_REFERENCE = re.compile(r'\\(\d+)|\\g<(\d+)>')
+
+
+class PatternError(ValueError):
+    """Pattern de règle invalide."""
+
+
+def literal_prefix(source, flags=0):
+    """Texte que tout match de source commence nécessairement par reconnaître.
+
+    Le préfixe est lu sur l'arbre de sre_parse : une alternative, un
+    caractère répété ou facultatif et un groupe insensible à la casse
+    l'arrêtent.
+    """
+    chars = []
+    _collect_literals(sre_parse.parse(source, flags), chars)
+    return ''.join(chars)
+
+
+def _collect_literals(items, chars):
+    """Ajoute à chars les littéraux de tête de items ; faux s'il s'est arrêté avant la fin."""
+    for op, value in items:
+        if op is sre_parse.LITERAL:
+            chars.append(chr(value))
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, _, sub = value
+            if add_flags & re.IGNORECASE or not _collect_literals(sub, chars):
+                return False
+        else:
+            return False
+    return True
+
+
+def compile_patterns(specs, flags=0, anchor=None):
+    """Compile [(source, remplacement)] en [(pattern compilé, remplacement)].
+
+    Le remplacement est un gabarit (str, pour match.expand) ou un callable
+    de niveau module. Lève PatternError si un pattern ne compile pas, ne
+    commence pas par anchor (ou par un littéral quelconque sans anchor),
+    ignore la casse (le préfiltre cherche le littéral tel quel), ou si un
+    gabarit cite un groupe inexistant.
+    """
+    compiled = []
+    for index, (source, replacement) in enumerate(specs, 1):
+        try:
+            pattern = re.compile(source, flags)
+        except re.error as e:
+            raise PatternError(f"pattern {index} ne compile pas : {e}") from e
+        if pattern.flags & re.IGNORECASE:
+            raise PatternError(f"pattern {index} ignore la casse : son préfixe littéral "
+                               f"n'est pas celui du préfiltre")
+        prefix = literal_prefix(source, flags)
+        if anchor is not None and not prefix.startswith(anchor):
+            raise PatternError(f"pattern {index} ne commence pas par le littéral {anchor!r}")
+        if not prefix:
+            raise PatternError(f"pattern {index} ne commence pas par un littéral")
+        if isinstance(replacement, str):
+            for reference in _GROUP_REFERENCE.finditer(replacement):
+                group = int(reference.group(1) or reference.group(2))
+                if group > pattern.groups:
+                    raise PatternError(f"pattern {index} : le remplacement cite le groupe {group} "
+                                       f"sur {pattern.groups}")
+        elif not callable(replacement):
+            raise PatternError(f"pattern {index} : remplacement ni gabarit ni callable")
+        compiled.append((pattern, replacement))
+    return compiled
@@ -0,0 +1,266 @@
+"""
+Pipeline asyncio de migration (--async).
+
+Quatre étapes reliées par des files bornées :
+
+  découverte → lecture → calcul → écriture
+
+La découverte parcourt l'arborescence dans un thread, au fil de l'eau. Les
+lectures et les écritures (fichiers temporaires de codemod.writer) sont
+lancées en parallèle dans un pool de threads, ce qui recouvre les attentes
+d'E/S sur les disques réseau ou les overlays de conteneur. Le calcul
+(engine.transform_file, c'est-à-dire les mêmes règles que le mode série)
+tourne dans un exécuteur : un pool de processus avec --jobs N, sinon un
+thread dédié. Les fichiers à réécrire en flux ne sont pas lus : l'étape de
+calcul les projette en mémoire et prépare elle-même leur fichier temporaire.
+
+Chaque file a une taille maximale et chaque étape limite ses opérations en
+cours : quand une étape prend du retard, les précédentes attendent. Le
+nombre de fichiers en mémoire reste donc borné quelle que soit la taille de
+l'arborescence. Chaque fichier reçoit son numéro d'ordre à la découverte :
+les résultats terminés en avance attendent leurs prédécesseurs, et
+on_result() les reçoit dans l'ordre des fichiers, comme avec le pool de
+processus (diffs et journal des modifications stables d'une exécution à
+l'autre).
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from functools import partial
+
+from codemod.cache import file_state
+from codemod.engine import DEFAULT_OPTIONS, stage_result, transform_file
+from codemod.results import ERROR, FileResult
+from codemod.writer import BatchWriter, new_run_id, remove_stale
+
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_IO_WORKERS = 16
+DISCOVERY_BATCH = 32
+
+# Fin de flux dans une file.
+_DONE = object()
+
+
+def _read(path, stream_threshold):
+    """(état, octets) du fichier ; octets à None pour un fichier à réécrire en flux."""
+    with open(path, 'rb') as f:
+        state = file_state(path)
+        if stream_threshold is not None and state['size'] >= stream_threshold:
+            return state, None
+        return state, f.read()
+
+
+def _next_batch(iterator):
+    batch = []
+    for item in iterator:
+        batch.append(item)
+        if len(batch) >= DISCOVERY_BATCH:
+            break
+    return batch
+
+
+class Pipeline:
+    """Une exécution du pipeline ; voir run()."""
+
+    def __init__(self, rules, project_root, jobs, cache, options, queue_size, io_workers):
+        self.rules = rules
+        self.project_root = project_root
+        self.cache = cache
+        self.options = options
+        self.io_workers = io_workers
+        self.jobs = jobs
+        self.paths = asyncio.Queue(queue_size)
+        self.loaded = asyncio.Queue(queue_size)
+        self.computed = asyncio.Queue(queue_size)
+        self.results = asyncio.Queue(queue_size)
+        self.directories = set()
+        self.discovered = 0
+        self.loop = asyncio.get_running_loop()
+        self.io_pool = ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix='codemod-io')
+        if jobs > 1:
+            self.cpu_pool = ProcessPoolExecutor(max_workers=jobs)
+        else:
+            self.cpu_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='codemod-cpu')
+        self.transform = partial(transform_file, rules, project_root, options=options)
+
+    def shutdown(self, cancel=False):
+        self.io_pool.shutdown(wait=True, cancel_futures=cancel)
+        self.cpu_pool.shutdown(wait=True, cancel_futures=cancel)
+
+    def _io(self, func, *args):
+        return self.loop.run_in_executor(self.io_pool, func, *args)
+
+    async def discover(self, dart_files):
+        iterator = iter(dart_files)
+        while True:
+            batch = await self._io(_next_batch, iterator)
+            if not batch:
+                break
+            for dart_file in batch:
+                self.directories.add(os.path.dirname(os.path.realpath(dart_file)))
+                await self.paths.put((self.discovered, dart_file))
+                self.discovered += 1
+        await self.paths.put(_DONE)
+
+    async def read(self):
+        """Lit les fichiers, au plus io_workers à la fois."""
+        slots = asyncio.Semaphore(self.io_workers)
+        pending = set()
+
+        async def read_one(index, dart_file):
+            try:
+                known = None
+                if self.cache is not None:
+                    key = os.path.relpath(dart_file, self.project_root)
+                    try:
+                        entry = self.cache.lookup(key, await self._io(file_state, dart_file))
+                    except OSError:
+                        entry = None
+                    if entry is not None:
+                        await self.results.put((index, FileResult(str(dart_file), entry['status'],
+                                                                  cached=True)))
+                        return
+                    known = self.cache.get(key)
+                try:
+                    state, data = await self._io(_read, dart_file, self.options.stream_threshold)
+                except Exception as e:
+                    await self.results.put((index, FileResult(str(dart_file), ERROR, message=str(e))))
+                    return
+                await self.loaded.put((index, (dart_file, known, state, data)))
+            finally:
+                slots.release()
+
+        while (item := await self.paths.get()) is not _DONE:
+            await slots.acquire()
+            task = asyncio.ensure_future(read_one(*item))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        await _gather(pending)
+        await self.loaded.put(_DONE)
+
+    async def compute(self):
+        """Applique les règles dans l'exécuteur, au plus deux fichiers par worker à la fois."""
+        slots = asyncio.Semaphore(2 * max(1, self.jobs))
+        pending = set()
+
+        async def compute_one(index, task):
+            try:
+                result, new_content = await self.loop.run_in_executor(self.cpu_pool, self.transform, task)
+                await self.computed.put((index, task[0], result, new_content))
+            finally:
+                slots.release()
+
+        while (item := await self.loaded.get()) is not _DONE:
+            await slots.acquire()
+            future = asyncio.ensure_future(compute_one(*item))
+            pending.add(future)
+            future.add_done_callback(pending.discard)
+        await _gather(pending)
+        await self.computed.put(_DONE)
+
+    async def write(self):
+        """Écrit les fichiers migrés dans leurs fichiers temporaires, au plus io_workers à la fois."""
+        slots = asyncio.Semaphore(self.io_workers)
+        pending = set()
+
+        async def write_one(index, dart_file, result, new_content):
+            try:
+                result = await self._io(stage_result, result, dart_file, new_content, self.rules,
+                                        self.options.run_id, self.options.cache)
+                await self.results.put((index, result))
+            finally:
+                slots.release()
+
+        while (item := await self.computed.get()) is not _DONE:
+            index, dart_file, result, new_content = item
+            if new_content is None:
+                await self.results.put((index, result))
+                continue
+            await slots.acquire()
+            task = asyncio.ensure_future(write_one(index, dart_file, result, new_content))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        await _gather(pending)
+        await self.results.put(_DONE)
+
+
+async def _gather(tasks):
+    if tasks:
+        await asyncio.gather(*list(tasks))
+
+
+class _Failure:
+    """Exception d'une étape, transmise au consommateur des résultats."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+async def _guard(stage, results):
+    try:
+        await stage
+    except asyncio.CancelledError:
+        raise
+    except BaseException as e:
+        await results.put(_Failure(e))
+
+
+async def run_async(rules, dart_files, project_root, on_result, jobs=1, cache=None,
+                    options=DEFAULT_OPTIONS, writer=None, queue_size=DEFAULT_QUEUE_SIZE,
+                    io_workers=DEFAULT_IO_WORKERS):
+    """Traite dart_files (itérable parcouru au fil de l'eau) ; voir run()."""
+    if writer is None:
+        writer = BatchWriter()
+    if not options.run_id:
+        options = replace(options, run_id=new_run_id())
+    options = replace(options, cache=cache is not None)
+    pipeline = Pipeline(rules, project_root, jobs, cache, options, queue_size, io_workers)
+    stages = [asyncio.ensure_future(_guard(stage, pipeline.results)) for stage in (
+        pipeline.discover(dart_files), pipeline.read(), pipeline.compute(), pipeline.write())]
+    # Résultats terminés avant ceux des fichiers découverts plus tôt.
+    ready = {}
+    next_index = 0
+    try:
+        while (item := await pipeline.results.get()) is not _DONE:
+            if isinstance(item, _Failure):
+                raise item.error
+            index, result = item
+            ready[index] = result
+            while next_index in ready:
+                result = ready.pop(next_index)
+                next_index += 1
+                if cache is not None and options.write:
+                    key = os.path.relpath(result.path, project_root)
+                    if result.cache_entry is not None:
+                        cache.update(key, result.cache_entry)
+                    elif not result.cached:
+                        cache.discard(key)
+                if result.staged is not None:
+                    # fsync et renommages des lots hors de la boucle d'événements.
+                    await pipeline._io(writer.add, result.staged, result.path)
+                on_result(result)
+        await asyncio.gather(*stages)
+        if not writer.transaction:
+            await pipeline._io(writer.flush)
+    except BaseException:
+        for stage in stages:
+            stage.cancel()
+        await asyncio.gather(*stages, return_exceptions=True)
+        writer.abort()
+        pipeline.shutdown(cancel=True)
+        remove_stale(sorted(pipeline.directories), options.run_id)
+        raise
+    pipeline.shutdown()
+
+
+def run(rules, dart_files, project_root, on_result, **kwargs):
+    """Exécute le pipeline asyncio ; on_result(FileResult) est appelé pour chaque fichier.
+
+    Mêmes options que runner.run(), plus queue_size (taille de chaque file)
+    et io_workers (lectures et écritures simultanées). Comme avec
+    runner.run(), les fichiers préparés sont validés par writer et le cache
+    est mis à jour hors simulation.
+    """
+    asyncio.run(run_async(rules, dart_files, project_root, on_result, **kwargs))
@@ -0,0 +1,53 @@
+"""
+Préfiltre sur octets bruts.
+
+Les fichiers sont chargés en bytes (ou projetés en mémoire avec mmap au-delà
+de MMAP_THRESHOLD) et les littéraux de préfiltre des règles y sont cherchés
+sans décodage UTF-8. Seuls les fichiers retenus sont décodés, à partir du
+tampon déjà chargé.
+"""
+
+import hashlib
+import mmap
+import os
+from contextlib import contextmanager
+
+# Au-delà de cette taille, le fichier est projeté en mémoire plutôt que lu.
+MMAP_THRESHOLD = 1 << 20
+
+
+@contextmanager
+def open_buffer(path, mmap_threshold=MMAP_THRESHOLD):
+    """Contenu brut du fichier : bytes, ou mmap en lecture seule pour les gros fichiers."""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < mmap_threshold or size == 0:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def buffer_hash(buffer):
+    return hashlib.sha256(buffer).hexdigest()
+
+
+def decode(buffer):
+    """Décode le tampon comme open(..., 'r', encoding='utf-8') (retours ligne universels)."""
+    text = bytes(buffer).decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+class Prefilter:
+    """Littéraux de préfiltre d'un jeu de règles, encodés une fois pour toutes."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.literals = [rule.prefilter.encode('utf-8') for rule in self.rules]
+
+    def applicable(self, buffer):
+        """Règles dont le littéral apparaît dans le tampon brut."""
+        return [rule for rule, literal in zip(self.rules, self.literals)
+                if buffer.find(literal) >= 0]
@@ -0,0 +1,289 @@
+"""
+Profilage des exécutions (--profile).
+
+FileProfile mesure, pour un fichier, le temps et les octets de chaque phase
+(io, matching, imports, write ou report) ainsi que, pour chaque règle, le
+temps passé dans le matcher et le rewriter, le nombre de sites proposés et
+de modifications retenues. Les règles qui exposent leurs patterns compilés
+(Rule.patterns, Rule.probes) ont en plus des statistiques par pattern :
+appels à match(), search(), finditer() et sub(), succès, temps et octets
+reconnus.
+
+Sans --profile, rien de ce module n'est appelé sur le chemin critique : le
+moteur ne fait qu'un test « profile is None » par fichier et par règle.
+RunProfile agrège les profils des fichiers dans le processus parent et les
+restitue en tableau et en JSON.
+"""
+
+import heapq
+import json
+import os
+import sys
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+NO_PHASE = nullcontext()
+
+# Profil du fichier en cours de traitement dans ce processus, pour les sondes.
+_current = None
+
+
+def phase(profile, name, nbytes=0):
+    """Chronomètre une phase si profile n'est pas None, sinon ne fait rien."""
+    return NO_PHASE if profile is None else profile.phase(name, nbytes)
+
+
+def _add(table, key, **values):
+    stats = table.get(key)
+    if stats is None:
+        stats = table[key] = dict.fromkeys(values, 0)
+    for name, value in values.items():
+        stats[name] = stats.get(name, 0) + value
+    return stats
+
+
+class PatternProbe:
+    """Se substitue à un pattern compilé : compte et chronomètre ses appels.
+
+    match(), search(), finditer() et sub() sont mesurés ; pour finditer() et
+    sub(), chaque appel est un essai et chaque occurrence un succès. Les
+    autres attributs sont délégués au pattern.
+    """
+
+    def __init__(self, compiled, label):
+        self.compiled = compiled
+        self.label = label
+
+    def _record(self, matches, seconds, nbytes):
+        if _current is not None:
+            _add(_current.patterns, self.label, attempts=1, matches=matches,
+                 seconds=seconds, bytes=nbytes)
+
+    def _timed(self, method, string, pos, endpos):
+        start = perf_counter()
+        m = method(string, pos, endpos)
+        self._record(m is not None, perf_counter() - start, m.end() - m.start() if m else 0)
+        return m
+
+    def match(self, string, pos=0, endpos=sys.maxsize):
+        return self._timed(self.compiled.match, string, pos, endpos)
+
+    def search(self, string, pos=0, endpos=sys.maxsize):
+        return self._timed(self.compiled.search, string, pos, endpos)
+
+    def finditer(self, string, pos=0, endpos=sys.maxsize):
+        matches = nbytes = 0
+        seconds = 0.0
+        iterator = self.compiled.finditer(string, pos, endpos)
+        try:
+            while True:
+                start = perf_counter()
+                m = next(iterator, None)
+                seconds += perf_counter() - start
+                if m is None:
+                    return
+                matches += 1
+                nbytes += m.end() - m.start()
+                yield m
+        finally:
+            self._record(matches, seconds, nbytes)
+
+    def sub(self, repl, string, count=0):
+        found = []
+
+        def replace(m):
+            found.append(m.end() - m.start())
+            return repl(m) if callable(repl) else m.expand(repl)
+
+        start = perf_counter()
+        result = self.compiled.sub(replace, string, count)
+        self._record(len(found), perf_counter() - start, sum(found))
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.compiled, name)
+
+
+def _probe_target(rule, name):
+    """(module, attribut) d'une entrée de Rule.probes."""
+    module_name, _, attribute = name.rpartition(':')
+    return sys.modules[module_name or rule.module], attribute
+
+
+@contextmanager
+def instrument(rules):
+    """Remplace par des sondes les patterns exposés par les règles, le temps du bloc.
+
+    Les objets d'origine sont remis en place à la sortie : hors du bloc, les
+    règles ne paient plus le coût des sondes. Un pattern déjà sondé (bloc
+    imbriqué) est laissé au bloc englobant.
+    """
+    replaced = []
+
+    def swap(module, attribute, value):
+        replaced.append((module, attribute, getattr(module, attribute)))
+        setattr(module, attribute, value)
+
+    try:
+        for rule in rules:
+            for name in rule.probes:
+                module, attribute = _probe_target(rule, name)
+                compiled = getattr(module, attribute)
+                if not isinstance(compiled, PatternProbe):
+                    swap(module, attribute, PatternProbe(compiled, f'{rule.name}:{attribute}'))
+            if rule.patterns is None:
+                continue
+            module = sys.modules[rule.module]
+            pairs = getattr(module, rule.patterns)
+            if pairs and isinstance(pairs[0][0], PatternProbe):
+                continue
+            swap(module, rule.patterns, [
+                (PatternProbe(compiled, f'{rule.name}:pattern{index}'), replacement)
+                for index, (compiled, replacement) in enumerate(pairs, 1)
+            ])
+        yield
+    finally:
+        for module, attribute, original in reversed(replaced):
+            setattr(module, attribute, original)
+
+
+class FileProfile:
+    """Mesures d'un fichier ; to_dict() les rend transmissibles depuis un worker."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.phases = {}
+        self.rules = {}
+        self.patterns = {}
+
+    @contextmanager
+    def activate(self):
+        global _current
+        previous, _current = _current, self
+        start = perf_counter()
+        try:
+            yield self
+        finally:
+            self.seconds += perf_counter() - start
+            _current = previous
+
+    @contextmanager
+    def phase(self, name, nbytes=0):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            _add(self.phases, name, calls=1, seconds=perf_counter() - start, bytes=nbytes)
+
+    def add_bytes(self, name, nbytes):
+        """Octets d'une phase connus seulement une fois la phase commencée."""
+        _add(self.phases, name, calls=0, seconds=0.0, bytes=nbytes)
+
+    def timed_sites(self, rule, content, sites):
+        """Itère sur les sites du matcher en chronométrant le matcher seul."""
+        stats = _add(self.rules, rule.name, sites=0, edits=0, seconds=0.0,
+                     rewrite_seconds=0.0, bytes=len(content))
+        iterator = iter(sites)
+        while True:
+            start = perf_counter()
+            try:
+                site = next(iterator)
+            except StopIteration:
+                stats['seconds'] += perf_counter() - start
+                return
+            stats['seconds'] += perf_counter() - start
+            stats['sites'] += 1
+            yield site
+
+    def timed_rewriter(self, rule):
+        """rule.rewriter, chronométré dans les statistiques de la règle."""
+        def rewrite(data):
+            start = perf_counter()
+            try:
+                return rule.rewriter(data)
+            finally:
+                self.rules[rule.name]['rewrite_seconds'] += perf_counter() - start
+        return rewrite
+
+    def count_edit(self, rule):
+        self.rules[rule.name]['edits'] += 1
+
+    def to_dict(self):
+        return {'seconds': self.seconds, 'phases': self.phases,
+                'rules': self.rules, 'patterns': self.patterns}
+
+
+class RunProfile:
+    """Agrège les profils des FileResult ; retient les `slowest` fichiers les plus lents."""
+
+    def __init__(self, project_root, slowest=10):
+        self.project_root = project_root
+        self.slowest = slowest
+        self.files = 0
+        self.seconds = 0.0
+        self.phases = {}
+        self.rules = {}
+        self.patterns = {}
+        self._slowest = []
+
+    def add(self, result):
+        profile = result.profile
+        if profile is None:
+            return
+        self.files += 1
+        self.seconds += profile['seconds']
+        for table, values in ((self.phases, profile['phases']), (self.rules, profile['rules']),
+                              (self.patterns, profile['patterns'])):
+            for key, stats in values.items():
+                _add(table, key, **stats)
+        entry = (profile['seconds'], result.path)
+        if len(self._slowest) < self.slowest:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+
+    def slowest_files(self):
+        return sorted(self._slowest, reverse=True)
+
+    def to_dict(self):
+        return {
+            'files': self.files,
+            'seconds': self.seconds,
+            'phases': self.phases,
+            'rules': self.rules,
+            'patterns': self.patterns,
+            'slowest_files': [{'file': self._relative(path), 'seconds': seconds}
+                              for seconds, path in self.slowest_files()],
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+
+    def print(self, stream=None):
+        stream = stream or sys.stdout
+
+        def emit(line=''):
+            print(line, file=stream)
+
+        emit(f"\nProfil ({self.files} fichiers traités, {self.seconds:.3f} s):")
+        emit(f"  {'Phase':<28}{'Appels':>9}{'Temps (s)':>11}{'Octets':>14}")
+        for name, stats in sorted(self.phases.items(), key=lambda item: -item[1]['seconds']):
+            emit(f"  {name:<28}{stats['calls']:>9}{stats['seconds']:>11.3f}{stats['bytes']:>14}")
+        if self.rules:
+            emit(f"\n  {'Règle':<36}{'Sites':>7}{'Modifs':>8}{'Match (s)':>11}{'Réécr. (s)':>11}{'Octets':>14}")
+            for name, stats in sorted(self.rules.items()):
+                emit(f"  {name:<36}{stats['sites']:>7}{stats['edits']:>8}{stats['seconds']:>11.3f}"
+                     f"{stats['rewrite_seconds']:>11.3f}{stats['bytes']:>14}")
+        if self.patterns:
+            emit(f"\n  {'Pattern':<36}{'Essais':>9}{'Succès':>8}{'Temps (s)':>11}{'Octets':>12}")
+            for name, stats in sorted(self.patterns.items(), key=lambda item: -item[1]['seconds']):
+                emit(f"  {name:<36}{stats['attempts']:>9}{stats['matches']:>8}"
+                     f"{stats['seconds']:>11.3f}{stats['bytes']:>12}")
+        if self._slowest:
+            emit("\n  Fichiers les plus lents:")
+            for seconds, path in self.slowest_files():
+                emit(f"    {seconds * 1000:8.2f} ms  {self._relative(path)}")
+
+    def _relative(self, path):
+        return os.path.relpath(path, self.project_root)
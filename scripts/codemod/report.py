@@ -0,0 +1,73 @@
+"""
+Rendu des modifications sans écriture : diff unifié et journal JSONL.
+"""
+
+import difflib
+import json
+
+
+def unified_diff(relative_path, before, after):
+    """Diff unifié de before vers after, avec les préfixes a/ et b/ de git."""
+    return ''.join(difflib.unified_diff(
+        before.splitlines(keepends=True),
+        after.splitlines(keepends=True),
+        fromfile=f'a/{relative_path}',
+        tofile=f'b/{relative_path}',
+    ))
+
+
+def change_records(relative_path, content, edits):
+    """Une entrée par modification : fichier, span (lignes et colonnes à partir de 1,
+    fin incluse), règle, texte d'origine et remplacement.
+
+    Les positions se réfèrent au contenu d'origine ; les modifications sont
+    triées, le décompte des lignes se fait donc en un seul parcours.
+    """
+    records = []
+    line = 1
+    counted = 0
+    for start, end, replacement, rule, label in edits:
+        last = max(start, end - 1)
+        line += content.count('\n', counted, start)
+        start_line = line
+        line += content.count('\n', start, last)
+        counted = last
+        records.append({
+            'file': relative_path,
+            'start_line': start_line,
+            'start_column': start - content.rfind('\n', 0, start),
+            'end_line': line,
+            'end_column': last - content.rfind('\n', 0, last),
+            'rule': label,
+            'original': content[start:end],
+            'replacement': replacement,
+        })
+    return records
+
+
+def written_spans(content, edits, new_content=None, line=1):
+    """(première ligne, dernière ligne, règle) de chaque remplacement dans le texte écrit.
+
+    Les lignes se réfèrent à splice(content, edits), dont la première porte
+    le numéro line. new_content est ce même texte après l'ajout des imports :
+    les lignes insérées en tête décalent alors toutes les modifications.
+    """
+    spans = []
+    first_line = line
+    last = 0
+    for start, end, replacement, _, label in edits:
+        line += content.count('\n', last, start)
+        first = line
+        line += replacement.count('\n')
+        spans.append((first, line, label))
+        last = end
+    if new_content is not None and spans:
+        shift = new_content.count('\n') - (line - first_line + content.count('\n', last))
+        if shift:
+            spans = [(first + shift, end_line + shift, label) for first, end_line, label in spans]
+    return spans
+
+
+def format_records(records):
+    """Lignes JSONL des entrées, chacune terminée par un saut de ligne."""
+    return ''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records)
@@ -0,0 +1,60 @@
+"""
+Résultats par fichier renvoyés par le moteur et agrégés par le runner.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+# Statuts d'un fichier traité.
+SKIPPED = 'skipped'      # aucun préfiltre de règle dans le fichier
+UNTOUCHED = 'untouched'  # préfiltre présent mais rien de migrable
+MIGRATED = 'migrated'
+FAILED = 'failed'        # erreur pendant la migration
+ERROR = 'error'          # erreur de lecture avant la migration
+
+_NOTIFICATION_CALL = re.compile(r'NotificationService\.show(\w+)\(')
+
+
+@dataclass
+class FileResult:
+    """Résultat du traitement d'un fichier, renvoyé par les workers."""
+
+    path: str
+    status: str
+    counts: dict = field(default_factory=dict)
+    message: str = None
+    # Sites modifiés par variante de règle (voir Rule.label()).
+    rule_counts: dict = field(default_factory=dict)
+    # Mesures de codemod.profile.FileProfile, avec --profile seulement.
+    profile: dict = None
+    # État du fichier après traitement, pour le cache (None : ne pas cacher).
+    cache_entry: dict = None
+    cached: bool = False
+    # Fichier temporaire contenant le résultat, à renommer sur path.
+    staged: str = None
+    # Octets lus pour le préfiltre et octets effectivement décodés en str.
+    bytes_scanned: int = 0
+    bytes_decoded: int = 0
+    # Fichier réécrit en flux, région par région (codemod.stream).
+    streamed: bool = False
+    # En mode simulation (--dry-run) : diff unifié et journal des modifications.
+    diff: str = None
+    changes: list = None
+    # Avec --verify : (première ligne, dernière ligne, règle) de chaque
+    # modification dans le fichier écrit (voir codemod.verify).
+    spans: list = None
+    # Fichier part of migré : (bibliothèque, imports requis), à ajouter à la
+    # bibliothèque faute de pouvoir les insérer dans le fichier.
+    part_of: tuple = None
+
+
+def notification_counts(before, after):
+    """Nombre d'appels NotificationService.showX ajoutés, par type (success, error, …)."""
+    counts = {}
+    for m in _NOTIFICATION_CALL.finditer(after):
+        kind = m.group(1).lower()
+        counts[kind] = counts.get(kind, 0) + 1
+    for m in _NOTIFICATION_CALL.finditer(before):
+        kind = m.group(1).lower()
+        counts[kind] = counts.get(kind, 0) - 1
+    return {kind: n for kind, n in sorted(counts.items()) if n > 0}
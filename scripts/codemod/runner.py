@@ -0,0 +1,581 @@
+"""
+Exécution d'une migration sur l'arborescence, en série ou sur un pool de
+processus (--jobs N).
+
+Les fichiers viennent de codemod.discovery (racines lib/features,
+lib/shared, lib/core et lib/app par défaut, --root, --include, --exclude,
+--changed-since) et sont traités au fil de leur découverte. Chaque fichier
+produit un FileResult ; le processus parent les reçoit dans l'ordre des
+fichiers et imprime le même résumé qu'une exécution en série.
+Avec --async, le pipeline de codemod.pipeline remplace run() ; avec --watch,
+chaque lot de fichiers modifiés donne lieu à un nouveau passage. Avec
+--verify, les fichiers migrés sont vérifiés après écriture (codemod.verify)
+et, avec --rollback, ceux où une règle a introduit une erreur retrouvent
+leur contenu d'origine. Avec
+--index, l'index des sites showSnackBar restants (codemod.sites) est mis à
+jour en fin de passage.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+
+from codemod.cache import CACHE_FILE, RunCache, file_state, ruleset_name, ruleset_version
+from codemod.engine import DEFAULT_OPTIONS, RunOptions, process_file
+from codemod import discovery, pipeline, sites, stream, verify, watch
+from codemod.pipeline import DEFAULT_QUEUE_SIZE
+from codemod.profile import RunProfile
+from codemod.report import format_records
+from codemod.writer import DEFAULT_BATCH_SIZE, BatchWriter, new_run_id, remove_stale
+from codemod.results import ERROR, FAILED, MIGRATED, SKIPPED, FileResult
+
+PROFILE_FILE = 'codemod_profile.json'
+MB = 1 << 20
+DEFAULT_CHUNKSIZE = 16
+
+
+def _process_batch(worker, tasks):
+    return [worker(task) for task in tasks]
+
+
+def run(rules, dart_files, project_root, jobs=1, chunksize=None, cache=None,
+        options=DEFAULT_OPTIONS, writer=None):
+    """Itère sur les FileResult de dart_files, dans l'ordre de dart_files.
+
+    dart_files est parcouru au fil de l'eau (un générateur de
+    codemod.discovery convient) : le premier fichier est traité sans
+    attendre la fin de la découverte. Avec jobs > 1, les fichiers sont
+    répartis par paquets de chunksize sur un pool de processus, au plus deux
+    paquets par worker en cours ; l'ordre et le contenu des résultats sont
+    ceux d'une exécution en série. Avec un RunCache, les fichiers inchangés
+    depuis la dernière exécution sont rendus sans être relus, et le cache est
+    mis à jour (sauf en simulation, où il n'est que consulté).
+
+    Les workers préparent les fichiers migrés dans des fichiers temporaires ;
+    writer (un BatchWriter) les valide par lots dans le processus parent. Si
+    l'itération est interrompue, les fichiers en attente sont abandonnés.
+    """
+    if writer is None:
+        writer = BatchWriter()
+    if chunksize is None:
+        chunksize = DEFAULT_CHUNKSIZE
+    if not options.run_id:
+        options = replace(options, run_id=new_run_id())
+    options = replace(options, cache=cache is not None)
+    worker = partial(process_file, rules, project_root, options=options)
+    directories = set()
+    executor = None
+
+    def entries():
+        """(fichier, résultat du cache, tâche) ; la tâche est None pour un fichier en cache."""
+        for dart_file in dart_files:
+            directories.add(os.path.dirname(os.path.realpath(dart_file)))
+            known = None
+            if cache is not None:
+                key = os.path.relpath(dart_file, project_root)
+                try:
+                    entry = cache.lookup(key, file_state(dart_file))
+                except OSError:
+                    entry = None
+                if entry is not None:
+                    yield dart_file, FileResult(str(dart_file), entry['status'], cached=True), None
+                    continue
+                known = cache.get(key)
+            yield dart_file, None, (dart_file, known)
+
+    def finish(dart_file, result):
+        if cache is not None and options.write:
+            key = os.path.relpath(dart_file, project_root)
+            if result.cache_entry is not None:
+                cache.update(key, result.cache_entry)
+            else:
+                cache.discard(key)
+        if result.staged is not None:
+            writer.add(result.staged, str(dart_file))
+        return result
+
+    def submit(batch, last):
+        nonlocal executor
+        tasks = [task for _, _, task in batch if task is not None]
+        if not tasks:
+            return None
+        if executor is None and last and len(tasks) == 1:
+            # Un seul fichier à traiter : inutile de démarrer le pool.
+            future = Future()
+            future.set_result(_process_batch(worker, tasks))
+            return future
+        if executor is None:
+            executor = ProcessPoolExecutor(max_workers=jobs)
+        return executor.submit(_process_batch, worker, tasks)
+
+    def settle(batch, future):
+        processed = iter(future.result() if future is not None else ())
+        for dart_file, result, task in batch:
+            yield result if task is None else finish(dart_file, next(processed))
+
+    try:
+        if jobs <= 1:
+            for dart_file, result, task in entries():
+                yield result if task is None else finish(dart_file, worker(task))
+        else:
+            in_flight = deque()
+            batch = []
+            for item in entries():
+                batch.append(item)
+                if len(batch) < chunksize:
+                    continue
+                in_flight.append((batch, submit(batch, last=False)))
+                batch = []
+                while len(in_flight) > 2 * jobs:
+                    yield from settle(*in_flight.popleft())
+            if batch:
+                in_flight.append((batch, submit(batch, last=True)))
+            while in_flight:
+                yield from settle(*in_flight.popleft())
+        if not writer.transaction:
+            writer.flush()
+    except BaseException:
+        writer.abort()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+            executor = None
+        remove_stale(sorted(directories), options.run_id)
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+class Summary:
+    """Agrège les FileResult et imprime le résumé de fin d'exécution.
+
+    Les diffs et le journal des modifications éventuels sont écrits au fil de
+    l'eau, dès qu'un fichier est traité ; stream reçoit les messages et le
+    résumé (stderr quand stdout porte les diffs).
+    """
+
+    def __init__(self, project_root, dry_run=False, diff_stream=None, changes_stream=None,
+                 stream=None):
+        self.project_root = project_root
+        self.dry_run = dry_run
+        self.diff_stream = diff_stream
+        self.changes_stream = changes_stream
+        self.stream = stream or sys.stdout
+        self.total_with_snackbar = 0
+        self.migrated_count = 0
+        self.failed_count = 0
+        self.errors = []
+        self.counts = {}
+        self.rule_counts = {}
+        self.cached_count = 0
+        self.bytes_scanned = 0
+        self.bytes_decoded = 0
+        self.streamed_count = 0
+        self.part_files = []
+        self.verification = None
+        self.restored_count = 0
+        # Sites showSnackBar restants par raison, avec --index.
+        self.site_counts = None
+
+    def add(self, result):
+        relative = os.path.relpath(result.path, self.project_root)
+        self.cached_count += result.cached
+        self.streamed_count += result.streamed
+        self.bytes_scanned += result.bytes_scanned
+        self.bytes_decoded += result.bytes_decoded
+        if result.status == ERROR:
+            error_msg = f"✗ Erreur avec {relative}: {result.message}"
+            self.errors.append(error_msg)
+            self._print(error_msg)
+            return
+        if result.status == SKIPPED:
+            return
+        self.total_with_snackbar += 1
+        if result.status == FAILED:
+            self.failed_count += 1
+            self._print(result.message)
+        elif result.status == MIGRATED:
+            self.migrated_count += 1
+            for kind, n in result.counts.items():
+                self.counts[kind] = self.counts.get(kind, 0) + n
+            for label, n in result.rule_counts.items():
+                self.rule_counts[label] = self.rule_counts.get(label, 0) + n
+            if self.diff_stream is not None and result.diff:
+                self.diff_stream.write(result.diff)
+                self.diff_stream.flush()
+            if self.changes_stream is not None and result.changes:
+                self.changes_stream.write(format_records(result.changes))
+                self.changes_stream.flush()
+            self._print(f"✓ À migrer: {relative}" if self.dry_run else f"✓ Migré: {relative}")
+            if result.part_of is not None:
+                library, targets = result.part_of
+                self.part_files.append(relative)
+                self._print(f"⚠ {relative} est une partie de {library} : import(s) "
+                            f"{', '.join(targets)} à vérifier dans la bibliothèque")
+
+    def add_verification(self, verification, restored=()):
+        """Diagnostics de la vérification ; les fichiers restaurés ne comptent plus comme migrés."""
+        self.verification = verification
+        for diagnostic in verification.diagnostics:
+            relative = os.path.relpath(diagnostic.path, self.project_root)
+            if diagnostic.rule is None:
+                origin = 'hors modifications'
+            else:
+                origin = f"{'règle' if diagnostic.inside else 'après'} {diagnostic.rule}"
+            if diagnostic.preexisting:
+                origin += ', déjà présent'
+            self._print(f"✗ {relative}:{diagnostic.line}:{diagnostic.column}: "
+                        f"{diagnostic.message} [{origin}]")
+        for result in restored:
+            self.restored_count += 1
+            self.migrated_count -= 1
+            for kind, n in result.counts.items():
+                self.counts[kind] -= n
+            for label, n in result.rule_counts.items():
+                self.rule_counts[label] -= n
+            self._print(f"↺ Restauré: {os.path.relpath(result.path, self.project_root)}")
+        self.counts = {kind: n for kind, n in self.counts.items() if n}
+        self.rule_counts = {label: n for label, n in self.rule_counts.items() if n}
+
+    def _print(self, *args):
+        print(*args, file=self.stream)
+
+    def print(self):
+        migrated_label = "Fichiers à migrer" if self.dry_run else "Fichiers migrés"
+        self._print(f"\n{'='*60}")
+        self._print(f"Résumé{' (simulation, aucun fichier écrit)' if self.dry_run else ''}:")
+        self._print(f"  Fichiers avec ScaffoldMessenger: {self.total_with_snackbar}")
+        self._print(f"  {migrated_label}: {self.migrated_count}")
+        self._print(f"  Fichiers restants: {self.total_with_snackbar - self.migrated_count}")
+        if self.counts:
+            detail = ', '.join(f"{kind}={n}" for kind, n in sorted(self.counts.items()))
+            self._print(f"  Notifications: {detail}")
+        if self.cached_count:
+            self._print(f"  Fichiers inchangés (cache): {self.cached_count}")
+        self._print(f"  Octets lus: {self.bytes_scanned} (décodés: {self.bytes_decoded})")
+        if self.streamed_count:
+            self._print(f"  Fichiers réécrits en flux: {self.streamed_count}")
+        if self.part_files:
+            self._print(f"  Fichiers part of (imports à vérifier dans la bibliothèque): "
+                        f"{len(self.part_files)}")
+        if self.verification is not None:
+            verification = self.verification
+            self._print(f"  Vérification ({verification.checker}): {verification.files} fichier(s), "
+                        f"{len(verification.failing)} en erreur, {len(verification.regressed)} "
+                        f"du fait des règles ({verification.seconds:.2f} s)")
+            if verification.diagnostics:
+                detail = ', '.join(f"{rule or 'hors modifications'}={n}" for rule, n in
+                                   sorted(verification.rule_counts().items(), key=lambda item: item[0] or ''))
+                self._print(f"  Diagnostics par règle: {detail}")
+        if self.restored_count:
+            self._print(f"  Fichiers restaurés: {self.restored_count}")
+        if self.site_counts is not None:
+            detail = ', '.join(f"{reason}={n}" for reason, n in sorted(self.site_counts.items()))
+            self._print(f"  Sites showSnackBar restants: {sum(self.site_counts.values())}"
+                        f"{f' ({detail})' if detail else ''}")
+        peak = stream.peak_rss_mb()
+        if peak is not None:
+            self._print(f"  Pic mémoire (RSS): {peak:.1f} Mo")
+        if self.errors:
+            self._print(f"  Erreurs: {len(self.errors)}")
+        self._print(f"{'='*60}")
+
+
+def add_discovery_arguments(parser):
+    """Options de sélection des fichiers (voir discovery_from_args())."""
+    parser.add_argument(
+        '--root', action='append', dest='roots', metavar='DIR',
+        help=('répertoire à parcourir, relatif au projet (répétable ; défaut : '
+              f"{', '.join(discovery.DEFAULT_ROOTS)})"),
+    )
+    parser.add_argument(
+        '--include', action='append', metavar='GLOB',
+        help=("ne retenir que les fichiers dont le chemin relatif au projet correspond "
+              f"(répétable ; défaut : {', '.join(discovery.DEFAULT_INCLUDES)})"),
+    )
+    parser.add_argument(
+        '--exclude', action='append', default=[], metavar='GLOB',
+        help='écarter les fichiers dont le chemin relatif au projet correspond (répétable)',
+    )
+    parser.add_argument(
+        '--no-gitignore', action='store_true',
+        help='ne pas appliquer les .gitignore (build/, .dart_tool/ et generated/ restent exclus)',
+    )
+    parser.add_argument(
+        '--changed-since', metavar='REF',
+        help='ne traiter que les fichiers modifiés depuis le ref git REF ou non suivis',
+    )
+
+
+def discovery_from_args(project_root, args):
+    """Discovery des options de add_discovery_arguments()."""
+    return discovery.Discovery(project_root, roots=args.roots or discovery.DEFAULT_ROOTS,
+                               includes=args.include or discovery.DEFAULT_INCLUDES,
+                               excludes=args.exclude, gitignore=not args.no_gitignore,
+                               changed_since=args.changed_since)
+
+
+def build_parser(description=None):
+    """Parseur des options communes ; les scripts peuvent y ajouter les leurs."""
+    parser = argparse.ArgumentParser(description=description,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '-j', '--jobs', type=int, default=1,
+        help='nombre de processus de migration (défaut : 1, en série ; 0 = nombre de CPU)',
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help=f'ignorer et ne pas mettre à jour {CACHE_FILE}',
+    )
+    parser.add_argument(
+        '--transaction', action='store_true',
+        help="n'écrire aucun fichier si une erreur survient pendant l'exécution",
+    )
+    parser.add_argument(
+        '--batch-size', type=int, default=DEFAULT_BATCH_SIZE, metavar='N',
+        help=f'fichiers validés (fsync puis renommage) par lot (défaut : {DEFAULT_BATCH_SIZE})',
+    )
+    parser.add_argument(
+        '-n', '--dry-run', action='store_true',
+        help="simuler : ne rien écrire, seulement lister les fichiers à migrer",
+    )
+    parser.add_argument(
+        '--diff', action='store_true',
+        help='simuler et écrire sur stdout le diff unifié de chaque fichier (implique --dry-run)',
+    )
+    parser.add_argument(
+        '--changes-log', metavar='FICHIER',
+        help="simuler et écrire une ligne JSON par modification ('-' pour stdout ; implique --dry-run)",
+    )
+    parser.add_argument(
+        '--async', action='store_true', dest='use_async',
+        help='pipeline asyncio : lectures et écritures concurrentes, calcul dans un exécuteur',
+    )
+    parser.add_argument(
+        '--queue-size', type=int, default=DEFAULT_QUEUE_SIZE, metavar='N',
+        help=f'taille des files entre étapes du pipeline --async (défaut : {DEFAULT_QUEUE_SIZE})',
+    )
+    add_discovery_arguments(parser)
+    parser.add_argument(
+        '--watch', action='store_true',
+        help='après le premier passage, surveiller les racines et migrer chaque fichier modifié',
+    )
+    parser.add_argument(
+        '--poll-interval', type=float, default=watch.DEFAULT_POLL_INTERVAL, metavar='S',
+        help=('intervalle de relecture de --watch quand inotify est indisponible '
+              f'(défaut : {watch.DEFAULT_POLL_INTERVAL} s)'),
+    )
+    parser.add_argument(
+        '--debounce', type=float, default=watch.DEFAULT_DEBOUNCE, metavar='S',
+        help=('--watch : attendre S secondes sans modification avant de traiter une rafale '
+              f'(défaut : {watch.DEFAULT_DEBOUNCE} s)'),
+    )
+    parser.add_argument(
+        '--stream-threshold', type=float, default=stream.DEFAULT_STREAM_THRESHOLD / MB,
+        metavar='MO',
+        help=('réécrire en flux, région par région, les fichiers d\'au moins MO Mo '
+              f'(défaut : {stream.DEFAULT_STREAM_THRESHOLD // MB} ; 0 = jamais)'),
+    )
+    parser.add_argument(
+        '--memory-limit', type=float, default=stream.DEFAULT_MEMORY_LIMIT / MB, metavar='MO',
+        help=('mémoire maximale pour un fichier réécrit en flux ; au-delà il est laissé intact '
+              f'(défaut : {stream.DEFAULT_MEMORY_LIMIT // MB})'),
+    )
+    parser.add_argument(
+        '--verify', nargs='?', const=verify.AUTO, choices=verify.CHECKERS, metavar='CONTRÔLE',
+        help=('vérifier les fichiers migrés après écriture, en un seul lot : '
+              f'{verify.DART} (dart analyze), {verify.LOCAL} (délimiteurs et instructions) '
+              f'ou {verify.AUTO} (dart analyze si le SDK est disponible ; défaut)'),
+    )
+    parser.add_argument(
+        '--rollback', action='store_true',
+        help=('rendre leur contenu d\'origine aux fichiers où la vérification trouve une erreur '
+              'introduite par une règle (implique --verify)'),
+    )
+    parser.add_argument(
+        '--index', action='store_true',
+        help=(f'mettre à jour {sites.INDEX_FILE}, l\'index des sites showSnackBar restants '
+              '(interrogeable avec scripts/snackbar_sites.py)'),
+    )
+    parser.add_argument(
+        '--profile', nargs='?', const='', metavar='FICHIER',
+        help=('mesurer temps, essais et octets par phase, règle et pattern ; '
+              f'tableau en fin de résumé et rapport JSON (défaut : {PROFILE_FILE} '
+              'à la racine du projet)'),
+    )
+    return parser
+
+
+def main(rules, project_root, description=None, argv=None, args=None):
+    """Point d'entrée commun des scripts de migration.
+
+    args permet de passer des options déjà analysées avec build_parser().
+    """
+    if args is None:
+        args = build_parser(description).parse_args(argv)
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    dry_run = args.dry_run or args.diff or args.changes_log is not None
+    if args.rollback and args.verify is None:
+        args.verify = verify.AUTO
+    if args.verify is not None:
+        if dry_run:
+            raise SystemExit("✗ --verify et --rollback portent sur les fichiers écrits, "
+                             "pas sur une simulation")
+        if args.verify == verify.DART and verify.find_dart() is None:
+            raise SystemExit("✗ SDK Dart introuvable (dart absent du PATH) ; "
+                             f"--verify {verify.LOCAL} utilise le contrôle local")
+    options = RunOptions(write=not dry_run, diff=args.diff,
+                         changes=args.changes_log is not None,
+                         profile=args.profile is not None,
+                         stream_threshold=int(args.stream_threshold * MB) or None,
+                         memory_limit=int(args.memory_limit * MB),
+                         verify=args.verify is not None)
+    finder = discovery_from_args(project_root, args)
+
+    changes_stream = None
+    if args.changes_log == '-':
+        changes_stream = sys.stdout
+    elif args.changes_log is not None:
+        changes_stream = open(args.changes_log, 'w', encoding='utf-8')
+    try:
+        try:
+            summary = execute(rules, finder, project_root, args, options, changes_stream,
+                              complete=finder.changed_since is None)
+        except discovery.DiscoveryError as e:
+            raise SystemExit(f"✗ {e}") from e
+        if args.watch:
+            _watch(rules, finder, project_root, args, options, changes_stream, summary.stream)
+    finally:
+        if changes_stream is not None and changes_stream is not sys.stdout:
+            changes_stream.close()
+    return summary
+
+
+def execute(rules, dart_files, project_root, args, options, changes_stream=None, complete=False):
+    """Un passage sur dart_files : migration, cache, résumé ; retourne le Summary.
+
+    complete indique que dart_files couvre tout le périmètre : l'index de
+    --index oublie alors les fichiers qui n'en font plus partie.
+    """
+    cache = None
+    if not args.no_cache:
+        cache = RunCache(project_root / CACHE_FILE, ruleset_name(rules),
+                         ruleset_version(rules)).load()
+
+    stdout_busy = args.diff or changes_stream is sys.stdout
+    summary = Summary(project_root, dry_run=not options.write,
+                      diff_stream=sys.stdout if args.diff else None,
+                      changes_stream=changes_stream,
+                      stream=sys.stderr if stdout_busy else sys.stdout)
+    writer = BatchWriter(batch_size=args.batch_size, transaction=args.transaction,
+                         keep_originals=args.rollback)
+    profile = RunProfile(project_root) if options.profile else None
+    # Fichiers écrits par ce passage, à vérifier avec --verify.
+    written = []
+    # Fichiers parcourus, pour l'index de --index.
+    seen = []
+
+    def handle(result):
+        summary.add(result)
+        if args.index:
+            seen.append(result.path)
+        if profile is not None:
+            profile.add(result)
+        if options.verify and result.status == MIGRATED and result.staged is not None:
+            written.append(result)
+
+    try:
+        if args.use_async:
+            pipeline.run(rules, dart_files, project_root, handle, jobs=args.jobs, cache=cache,
+                         options=options, writer=writer, queue_size=args.queue_size)
+        else:
+            for result in run(rules, dart_files, project_root, jobs=args.jobs, cache=cache,
+                              options=options, writer=writer):
+                handle(result)
+        if writer.transaction:
+            if summary.errors or summary.failed_count:
+                writer.abort()
+                summary._print(f"✗ Transaction annulée : {writer.aborted} fichier(s) non écrit(s)")
+                cache = None
+                written = []
+            else:
+                writer.flush()
+        if written:
+            _verify(written, project_root, args, writer, cache, summary)
+    finally:
+        writer.discard_originals()
+    if args.index:
+        index = sites.SiteIndex(project_root / sites.INDEX_FILE).load()
+        index.refresh(seen, project_root, complete=complete)
+        index.save()
+        summary.site_counts = index.counts()
+    if cache is not None and options.write:
+        cache.save()
+    summary.print()
+    if profile is not None:
+        profile.print(summary.stream)
+        path = profile_path(project_root, args)
+        profile.write_json(path)
+        summary._print(f"Rapport de profil: {path}")
+    return summary
+
+
+def profile_path(project_root, args):
+    """Rapport JSON de --profile : le fichier donné, sinon PROFILE_FILE à la racine du projet."""
+    if args.profile:
+        return Path(args.profile)
+    return Path(project_root) / PROFILE_FILE
+
+
+def _verify(results, project_root, args, writer, cache, summary):
+    """Vérifie les fichiers écrits ; avec --rollback, restaure ceux où une règle a introduit une erreur.
+
+    Les contenus d'origine gardés par writer servent de référence : une
+    erreur déjà présente avant la migration ne provoque pas de restauration.
+    """
+    originals = {result.path: writer.originals[result.path]
+                 for result in results if result.path in writer.originals}
+    try:
+        verification = verify.verify(results, project_root, args.verify, originals)
+    except verify.VerificationError as e:
+        summary._print(f"✗ Vérification impossible : {e}")
+        return
+    restored = []
+    regressed = set(verification.regressed)
+    if args.rollback and regressed:
+        restored = [result for result in results if result.path in regressed]
+        writer.restore(result.path for result in restored)
+        if cache is not None:
+            # Le contenu d'origine sera migré, et vérifié, au prochain passage.
+            for result in restored:
+                cache.discard(os.path.relpath(result.path, project_root))
+    summary.add_verification(verification, restored)
+
+
+def _watch(rules, finder, project_root, args, options, changes_stream, stream):
+    """Boucle de --watch : un passage par lot de fichiers modifiés, jusqu'à Ctrl+C.
+
+    Les racines de finder sont surveillées ; seuls les fichiers qu'il retient
+    (globs, .gitignore) sont migrés, même avec --changed-since.
+    """
+    def on_change(paths):
+        paths = [Path(path) for path in paths if finder.accepts(path)]
+        if not paths:
+            return
+        print(f"\n[{time.strftime('%H:%M:%S')}] {len(paths)} fichier(s) modifié(s)", file=stream)
+        execute(rules, paths, project_root, args, options, changes_stream)
+
+    roots = finder.root_paths()
+    names = ', '.join(os.path.relpath(root, project_root) for root in roots)
+    print(f"\nSurveillance de {names} (Ctrl+C pour arrêter)...", file=stream, flush=True)
+    try:
+        watch.watch(roots, on_change, interval=args.poll_interval, debounce=args.debounce)
+    except KeyboardInterrupt:
+        print("\nSurveillance arrêtée.", file=stream)
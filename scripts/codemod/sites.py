@@ -0,0 +1,245 @@
+"""
+Index des appels showSnackBar restants (.codemod_index.json).
+
+find_sites() relève avec le DartScanner chaque appel .showSnackBar(...) du
+code (hors chaînes et commentaires), quel que soit son receveur : ligne et
+colonne du début de l'expression, type de notification détecté comme le
+fait la version finale de la migration, et raison pour laquelle celle-ci ne
+le réécrit pas (PENDING quand elle le réécrirait : le site n'a simplement
+pas encore été migré ; EXPRESSION quand un fond conditionnel ne peut pas
+devenir un if/else).
+
+SiteIndex garde ces sites par fichier avec l'état (mtime, taille) et
+l'empreinte SHA-256 du contenu, comme le cache des exécutions : refresh()
+ne relit que les fichiers dont l'état a changé et ne réanalyse que ceux dont
+l'empreinte diffère. query() interroge l'index chargé sans relire
+l'arborescence.
+"""
+
+import bisect
+import json
+import os
+import re
+import sys
+from typing import NamedTuple
+
+from codemod import notification_patterns as patterns
+from codemod.cache import file_state, source_version
+from codemod.dart_scanner import SNACKBAR_ANCHOR, DartScanner, snackbar_call_at
+from codemod.prefilter import buffer_hash, decode, open_buffer
+
+INDEX_FILE = '.codemod_index.json'
+INDEX_FORMAT = 1
+LITERAL = b'showSnackBar'
+# Longueur maximale du détail d'un site (receveur, argument...).
+DETAIL_LENGTH = 60
+
+# Raisons de non-migration, dans l'ordre où elles sont testées.
+UNCLOSED = 'unclosed'          # appel sans parenthèse fermante
+RECEIVER = 'receiver'          # receveur autre que le littéral ScaffoldMessenger.of(context)
+NOT_SNACKBAR = 'not_snackbar'  # argument qui n'est pas un SnackBar(...) littéral
+CONTENT = 'content'            # content qui n'est pas un Text(...)
+ARGUMENTS = 'arguments'        # arguments de SnackBar que NotificationService ne reprend pas
+EXPRESSION = 'expression'      # fond conditionnel dans une expression (=>) : pas d'if/else
+PENDING = 'pending'            # migrable par la version finale
+REASONS = (UNCLOSED, RECEIVER, NOT_SNACKBAR, CONTENT, ARGUMENTS, EXPRESSION, PENDING)
+
+# Type d'un site dont le SnackBar n'a pas pu être analysé.
+UNKNOWN = 'unknown'
+TYPES = ('error', 'success', 'info', 'conditional', UNKNOWN)
+
+_CALL = re.compile(r'\.\s*showSnackBar\s*\(')
+_RECEIVER_CHAR = re.compile(r'[A-Za-z0-9_$.!?]')
+_NAMED_ARGUMENT = re.compile(r'([A-Za-z_$][A-Za-z0-9_$]*)\s*:(?!:)')
+
+
+class Site(NamedTuple):
+    """Un appel showSnackBar ; line et column (à partir de 1) repèrent le début du receveur."""
+
+    line: int
+    column: int
+    type: str
+    reason: str
+    detail: str = ''
+
+
+def find_sites(source, scanner=None):
+    """Sites showSnackBar du code de source, dans l'ordre du fichier."""
+    if scanner is None:
+        scanner = DartScanner(source)
+    skip_starts = sorted(scanner.skips)
+    closers = {close: open_index for open_index, close in scanner.pairs.items()}
+    sites = []
+    line, counted = 1, 0
+    for m in _CALL.finditer(source):
+        index = bisect.bisect_right(skip_starts, m.start()) - 1
+        if index >= 0 and m.start() < scanner.skips[skip_starts[index]]:
+            continue
+        start = _receiver_start(source, closers, m.start())
+        line += source.count('\n', counted, start)
+        counted = start
+        column = start - source.rfind('\n', 0, start)
+        sites.append(Site(line, column, *_diagnose(scanner, source, m, start)))
+    return sites
+
+
+def _receiver_start(source, closers, dot):
+    """Début de l'expression receveur qui précède le . de .showSnackBar."""
+    start = dot
+    while start > 0:
+        char = source[start - 1]
+        if char in ')]':
+            opener = closers.get(start - 1)
+            if opener is None:
+                break
+            start = opener
+        elif _RECEIVER_CHAR.match(char):
+            start -= 1
+        elif char.isspace() and source[start] == '.':
+            # Chaîne d'appels coupée avant le point : ScaffoldMessenger.of(context)\n.showSnackBar
+            previous = start
+            while previous > 0 and source[previous - 1].isspace():
+                previous -= 1
+            if previous == 0:
+                break
+            start = previous
+        else:
+            break
+    return start
+
+
+def _diagnose(scanner, source, m, start):
+    """(type, raison, détail) du site trouvé par m."""
+    open_index = m.end() - 1
+    call = snackbar_call_at(scanner, start, open_index)
+    if call is None:
+        return UNKNOWN, UNCLOSED, ''
+    kind = UNKNOWN if call.snackbar is None else patterns.snackbar_type(
+        call.background, call.text, call.condition)
+    name_end = source.rindex('showSnackBar', m.start(), open_index) + len('showSnackBar')
+    if source[name_end - len(SNACKBAR_ANCHOR):name_end] != SNACKBAR_ANCHOR:
+        receiver = scanner.compact(start, m.start()).rstrip('?')
+        if receiver == SNACKBAR_ANCHOR[:-len('.showSnackBar')]:
+            # Même receveur, mais coupé ou espacé autrement que l'ancre.
+            receiver += ' (mise en forme)'
+        return kind, RECEIVER, _short(receiver)
+    if call.snackbar is None:
+        return kind, NOT_SNACKBAR, _short(scanner.compact(open_index + 1, scanner.closing(open_index)))
+    if not call.text:
+        return kind, CONTENT, _short(call.arguments.get('content', ''))
+    extra = sorted(_argument_name(name, text) for name, text in call.arguments.items()
+                   if name not in patterns.MIGRATABLE_SNACKBAR_ARGUMENTS)
+    if extra:
+        return kind, ARGUMENTS, ', '.join(extra)
+    if kind == 'conditional' and not call.statement:
+        return kind, EXPRESSION, ''
+    return kind, PENDING, ''
+
+
+def _argument_name(name, text):
+    """Nom affiché d'un argument ; named_arguments() indexe par position un argument nommé
+    précédé d'un commentaire, que la version finale ne migre pas."""
+    if isinstance(name, str):
+        return name
+    m = _NAMED_ARGUMENT.match(DartScanner(text).compact(0, len(text)))
+    return f'{m.group(1)} (après un commentaire)' if m else 'positionnel'
+
+
+def _short(text):
+    text = ' '.join(text.split())
+    return text if len(text) <= DETAIL_LENGTH else text[:DETAIL_LENGTH - 1] + '…'
+
+
+def under(relative, directory):
+    """Vrai si relative (séparateur /) passe par directory, à n'importe quelle profondeur."""
+    directory = directory.strip('/')
+    return f'/{directory}/' in f'/{relative}'
+
+
+class SiteIndex:
+    """Sites showSnackBar par fichier, persistés dans path (voir le docstring du module)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.version = source_version([sys.modules[__name__]])
+        # Chemin relatif -> {mtime_ns, size, sha256, sites: [Site._asdict()]}.
+        self.files = {}
+        self.hashed = 0
+        self.rescanned = 0
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get('format') == INDEX_FORMAT and data.get('version') == self.version:
+            self.files = data.get('files', {})
+        return self
+
+    def refresh(self, paths, project_root, complete=True):
+        """Met à jour les fichiers de paths ; avec complete, oublie les autres.
+
+        Un fichier dont mtime et taille n'ont pas changé n'est pas relu ; un
+        fichier relu dont l'empreinte n'a pas changé n'est pas réanalysé.
+        """
+        seen = set()
+        for path in paths:
+            key = os.path.relpath(path, project_root)
+            seen.add(key)
+            entry = self.files.get(key)
+            try:
+                state = file_state(path)
+                if entry and entry['mtime_ns'] == state['mtime_ns'] and entry['size'] == state['size']:
+                    continue
+                with open_buffer(path) as buffer:
+                    digest = buffer_hash(buffer)
+                    self.hashed += 1
+                    if entry and entry['sha256'] == digest:
+                        entry.update(state)
+                        continue
+                    sites = find_sites(decode(buffer)) if buffer.find(LITERAL) >= 0 else []
+            except (OSError, UnicodeDecodeError):
+                self.files.pop(key, None)
+                continue
+            self.rescanned += 1
+            self.files[key] = dict(state, sha256=digest, sites=[site._asdict() for site in sites])
+        if complete:
+            self.files = {key: entry for key, entry in self.files.items() if key in seen}
+        return self
+
+    def save(self):
+        data = {'format': INDEX_FORMAT, 'version': self.version, 'files': self.files}
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1, sort_keys=True, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def query(self, types=(), reasons=(), directories=(), globs=()):
+        """Itère sur les (chemin relatif, Site) retenus, par fichier puis par position.
+
+        Chaque critère non vide restreint le résultat : type parmi types,
+        raison parmi reasons, fichier sous l'un des directories (voir
+        under()) ou correspondant à l'un des globs compilés.
+        """
+        for key in sorted(self.files):
+            relative = key.replace(os.sep, '/')
+            if directories and not any(under(relative, directory) for directory in directories):
+                continue
+            if globs and not any(glob.match(relative) for glob in globs):
+                continue
+            for fields in self.files[key]['sites']:
+                site = Site(**fields)
+                if types and site.type not in types:
+                    continue
+                if reasons and site.reason not in reasons:
+                    continue
+                yield key, site
+
+    def counts(self):
+        """{raison: nombre de sites} sur tout l'index."""
+        counts = {}
+        for entry in self.files.values():
+            for site in entry['sites']:
+                counts[site['reason']] = counts.get(site['reason'], 0) + 1
+        return counts
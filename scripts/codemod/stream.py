@@ -0,0 +1,368 @@
+"""
+Réécriture en flux des gros fichiers (fichiers générés de plusieurs Mo).
+
+Au-delà de --stream-threshold, un fichier n'est jamais décodé en entier. Le
+tampon (mmap) est découpé en régions autour des occurrences des littéraux de
+préfiltre : chacune part du début de la ligne d'une occurrence et s'étend
+d'environ deux fois `window` octets (voir rewrite_regions()). Seules les
+régions sont décodées et passées aux règles ; le fichier de sortie est
+ensuite écrit par morceaux, les portions intactes étant recopiées telles
+quelles depuis le tampon.
+
+Un commentaire /* */ ou une chaîne triple ouverts avant une région sont
+suivis par un lexer minimal sur les octets et restitués aux règles par un
+préfixe synthétique : le scanner Dart ignore ainsi les ancres commentées
+comme sur le fichier entier.
+
+Une région dont une modification approche la fin (appel plus long que
+prévu) est agrandie. Si elle dépasse memory_limit, ou si une règle réécrit
+la région entière (repli multipass de la v2), NotStreamable est levée et le
+moteur retombe sur le traitement en mémoire quand la taille du fichier le
+permet. Un appel plus long que la fenêtre n'est pas reconnu et reste
+inchangé. Les fichiers contenant des retours chariot ne sont pas traités en
+flux : leur normalisation demande le fichier entier.
+"""
+
+import hashlib
+import re
+import sys
+
+from codemod.prefilter import decode
+from codemod.report import unified_diff
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_STREAM_THRESHOLD = 4 << 20
+DEFAULT_MEMORY_LIMIT = 256 << 20
+DEFAULT_WINDOW = 64 << 10
+# Taille des morceaux recopiés depuis le tampon vers la sortie.
+COPY_CHUNK = 1 << 20
+# Lecture de l'en-tête (bloc d'imports) : morceau initial et marge exigée
+# entre la fin du bloc de directives et la fin du morceau.
+HEADER_CHUNK = 64 << 10
+HEADER_MARGIN = 1 << 10
+# Mémoire du traitement en mémoire rapportée à la taille du fichier (tampon,
+# contenu décodé, contenu migré et ses morceaux).
+IN_MEMORY_FACTOR = 4
+
+_CODE = re.compile(rb"//|/\*|'''|\"\"\"|['\"]")
+_COMMENT = re.compile(rb"/\*|\*/")
+_IDENT_CHAR = re.compile(rb'[A-Za-z0-9_$]')
+
+
+def _string_end(quote, raw):
+    alternatives = [re.escape(quote)]
+    if len(quote) == 1:
+        alternatives.append(rb'\n')
+    if not raw:
+        alternatives.insert(0, rb'\\.')
+    return re.compile(b'|'.join(alternatives), re.DOTALL)
+
+
+_STRING_END = {(quote, raw): _string_end(quote, raw)
+               for quote in (b"'", b'"', b"'''", b'"""') for raw in (False, True)}
+
+
+class NotStreamable(Exception):
+    """Le fichier ne peut pas être réécrit région par région."""
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus et de ses workers, en Mo (None sous Windows)."""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss est en octets sous macOS, en kilo-octets ailleurs.
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def streamable(buffer, threshold):
+    """Vrai si le tampon doit être réécrit en flux."""
+    return threshold is not None and len(buffer) >= threshold and buffer.find(b'\r') < 0
+
+
+def fits_in_memory(size, memory_limit):
+    """Vrai si un fichier de size octets peut être traité en mémoire sous memory_limit."""
+    return size * IN_MEMORY_FACTOR <= memory_limit
+
+
+def line_start(buffer, pos):
+    return buffer.rfind(b'\n', 0, pos) + 1
+
+
+def line_end(buffer, pos):
+    """Fin (saut de ligne compris) de la ligne qui contient pos, bornée à la fin du tampon."""
+    if pos >= len(buffer):
+        return len(buffer)
+    newline = buffer.find(b'\n', pos)
+    return len(buffer) if newline < 0 else newline + 1
+
+
+def count_lines(buffer, start, end):
+    """Sauts de ligne de buffer[start:end], compté par morceaux."""
+    lines = 0
+    for pos in range(start, end, COPY_CHUNK):
+        lines += buffer[pos:min(end, pos + COPY_CHUNK)].count(b'\n')
+    return lines
+
+
+def find_hits(buffer, literals):
+    """Positions triées des occurrences des littéraux (bytes) dans le tampon."""
+    hits = set()
+    for literal in literals:
+        pos = buffer.find(literal)
+        while pos >= 0:
+            hits.add(pos)
+            pos = buffer.find(literal, pos + 1)
+    return sorted(hits)
+
+
+class LexicalContext:
+    """Contexte lexical au fil du tampon : code, commentaire /* */ ou chaîne.
+
+    Seuls les commentaires de bloc (imbriqués en Dart) et les chaînes triples
+    s'étendent sur plusieurs lignes : une chaîne simple se termine au plus
+    tard en fin de ligne, comme dans DartScanner.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.pos = 0
+        self.depth = 0
+        # (guillemets, brute) de la chaîne ouverte.
+        self.string = None
+
+    def advance(self, end):
+        """Avance l'analyse jusqu'à end (début de ligne)."""
+        buffer = self.buffer
+        i = self.pos
+        while i < end:
+            if self.depth:
+                m = _COMMENT.search(buffer, i, end)
+                if m is None:
+                    break
+                self.depth += 1 if m.group() == b'/*' else -1
+                i = m.end()
+            elif self.string is not None:
+                m = _STRING_END[self.string].search(buffer, i, end)
+                if m is None:
+                    break
+                i = m.end()
+                if m.group() in (self.string[0], b'\n'):
+                    self.string = None
+            else:
+                m = _CODE.search(buffer, i, end)
+                if m is None:
+                    break
+                token = m.group()
+                i = m.end()
+                if token == b'//':
+                    i = line_end(buffer, i)
+                elif token == b'/*':
+                    self.depth = 1
+                else:
+                    start = m.start()
+                    raw = (start > 0 and buffer[start - 1:start] in (b'r', b'R')
+                           and (start < 2 or not _IDENT_CHAR.match(buffer[start - 2:start - 1])))
+                    self.string = (token, raw)
+        self.pos = max(self.pos, end)
+
+    def prefix(self):
+        """Texte qui replace le scanner dans le contexte courant, suivi d'un saut de ligne."""
+        if self.depth:
+            return '/*' * self.depth + '\n'
+        if self.string is not None:
+            quote, raw = self.string
+            return ('r' if raw else '') + quote.decode('ascii') + '\n'
+        return ''
+
+
+def rewrite_regions(buffer, hits, collect, window=DEFAULT_WINDOW, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """Itère sur les régions du tampon : (début, fin, texte, modifications).
+
+    Une région reçoit les occurrences de hits situées à moins de window
+    octets de sa première occurrence, plus window octets de contexte après
+    la dernière (qui contiennent en général l'occurrence suivante). Seules
+    les modifications qui commencent avant l'occurrence suivante sont
+    retenues ; la région suivante reprend après la dernière d'entre elles.
+
+    collect(texte) rend les Edit des règles sur le texte d'une région,
+    préfixe de contexte compris ; les modifications rendues sont décalées
+    pour se rapporter au texte de la région seul. Lève NotStreamable si une
+    région dépasse memory_limit octets ou si une modification la couvre
+    entièrement.
+    """
+    size = len(buffer)
+    context = LexicalContext(buffer)
+    index = 0
+    cursor = 0
+    while True:
+        while index < len(hits) and hits[index] < cursor:
+            index += 1
+        if index == len(hits):
+            return
+        start = line_start(buffer, hits[index])
+        last = index
+        while last + 1 < len(hits) and hits[last + 1] < hits[index] + window:
+            last += 1
+        index = last + 1
+        owned_end = hits[index] if index < len(hits) else size
+        end = line_end(buffer, max(hits[last] + window, owned_end))
+        while True:
+            if end - start > memory_limit:
+                raise NotStreamable(f"région de {end - start} octets à l'offset {start}, "
+                                    f"au-delà de la limite de {memory_limit} octets")
+            context.advance(start)
+            prefix = context.prefix()
+            text = prefix + decode(buffer[start:end])
+            low = len(prefix) + len(decode(buffer[start:max(start, cursor)]))
+            high = len(prefix) + len(decode(buffer[start:owned_end]))
+            found = collect(text)
+            edits = [edit for edit in found if low <= edit.start < high]
+            if _settled(found, edits, len(prefix), len(text), start == 0, end == size, window):
+                break
+            end = line_end(buffer, end + (end - start))
+        cursor = owned_end
+        if edits:
+            cursor = max(cursor, start + len(text[len(prefix):edits[-1].end].encode('utf-8')))
+        yield start, end, text[len(prefix):], [
+            edit._replace(start=edit.start - len(prefix), end=edit.end - len(prefix)) for edit in edits]
+
+
+def _settled(found, kept, prefix_length, length, at_start, at_end, window):
+    """Vrai si les modifications retenues ne dépendent pas de la fin de la région."""
+    for edit in found:
+        if edit.start <= prefix_length and edit.end == length and not (at_start and at_end):
+            raise NotStreamable("une règle réécrit la région entière")
+    return at_end or all(edit.end <= length - window // 2 for edit in kept)
+
+
+def byte_edits(start, text, edits):
+    """Modifications d'une région en positions du tampon : [(début, fin, remplacement en bytes)]."""
+    result = []
+    offset = start
+    last = 0
+    for edit in edits:
+        offset += len(text[last:edit.start].encode('utf-8'))
+        end = offset + len(text[edit.start:edit.end].encode('utf-8'))
+        result.append((offset, end, edit.replacement.encode('utf-8')))
+        offset, last = end, edit.end
+    return result
+
+
+def read_header(buffer, directives_end, memory_limit=DEFAULT_MEMORY_LIMIT):
+    """Début décodé du tampon, assez long pour contenir tout le bloc de directives.
+
+    directives_end(texte) rend la position où s'arrête la lecture du bloc
+    (voir codemod.imports).
+    """
+    size = HEADER_CHUNK
+    while True:
+        end = line_end(buffer, size)
+        header = decode(buffer[:end])
+        if end == len(buffer) or directives_end(header) + HEADER_MARGIN <= len(header):
+            return header
+        if end > memory_limit:
+            raise NotStreamable("bloc de directives trop long")
+        size = 2 * end
+
+
+def spliced(buffer, edits, start=0, end=None):
+    """Morceaux (bytes) de buffer[start:end] avec les modifications triées appliquées."""
+    if end is None:
+        end = len(buffer)
+    last = start
+    for edit_start, edit_end, replacement in edits:
+        yield from _copy(buffer, last, edit_start)
+        yield replacement
+        last = edit_end
+    yield from _copy(buffer, last, end)
+
+
+def context_span(buffer, start, end, lines=3):
+    """Segment qui étend [start, end) de `lines` lignes entières de chaque côté."""
+    start = line_start(buffer, start)
+    for _ in range(lines):
+        if start > 0:
+            start = line_start(buffer, start - 1)
+    if end > 0 and buffer[end - 1:end] != b'\n':
+        end = line_end(buffer, end)
+    for _ in range(lines):
+        end = line_end(buffer, end)
+    return start, end
+
+
+def segments_diff(relative_path, buffer, edits):
+    """Diff unifié du tampon avec les modifications triées [(début, fin, remplacement)].
+
+    Chaque modification est comparée avec trois lignes de contexte, les
+    segments qui se recouvrent étant fusionnés ; les numéros de ligne des
+    blocs sont ensuite décalés à leur place dans le fichier. Seuls les
+    segments sont décodés.
+    """
+    merged = []
+    for edit_start, edit_end, replacement in edits:
+        start, end = context_span(buffer, edit_start, edit_end)
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+            merged[-1][2].append((edit_start, edit_end, replacement))
+        else:
+            merged.append([start, end, [(edit_start, edit_end, replacement)]])
+    parts = []
+    lines = counted = delta = 0
+    for start, end, segment_edits in merged:
+        before = decode(buffer[start:end])
+        after = b''.join(spliced(buffer, segment_edits, start, end)).decode('utf-8')
+        lines += count_lines(buffer, counted, start)
+        counted = start
+        diff = shift_hunks(unified_diff(relative_path, before, after), lines, lines + delta)
+        if parts:
+            # En-têtes --- / +++ : une seule fois en tête du diff.
+            diff = diff.split('\n', 2)[2]
+        parts.append(diff)
+        delta += after.count('\n') - before.count('\n')
+    return ''.join(parts)
+
+
+class OutputDigest:
+    """Empreinte sha256 d'une sortie écrite par morceaux et littéraux qui y restent.
+
+    feed() laisse passer les morceaux en les examinant ; un littéral à
+    cheval sur deux morceaux est trouvé grâce à la fin du morceau précédent.
+    """
+
+    def __init__(self, literals):
+        self.literals = list(literals)
+        self.found = set()
+        self._sha256 = hashlib.sha256()
+        self._keep = max(map(len, self.literals), default=1) - 1
+        self._tail = b''
+
+    def feed(self, chunks):
+        for chunk in chunks:
+            self._sha256.update(chunk)
+            joined = self._tail + chunk
+            self.found.update(literal for literal in self.literals if literal in joined)
+            self._tail = joined[len(joined) - self._keep:] if self._keep else b''
+            yield chunk
+
+    def hexdigest(self):
+        return self._sha256.hexdigest()
+
+
+def _copy(buffer, start, end):
+    for pos in range(start, end, COPY_CHUNK):
+        yield buffer[pos:min(end, pos + COPY_CHUNK)]
+
+
+_HUNK = re.compile(r'^@@ -(\d+)((?:,\d+)?) \+(\d+)((?:,\d+)?) @@', re.MULTILINE)
+
+
+def shift_hunks(diff, old_offset, new_offset):
+    """Décale les numéros de ligne des en-têtes de blocs d'un diff unifié."""
+    return _HUNK.sub(lambda m: f'@@ -{int(m.group(1)) + old_offset}{m.group(2)} '
+                               f'+{int(m.group(3)) + new_offset}{m.group(4)} @@', diff)
@@ -0,0 +1,355 @@
+"""
+Vérification des fichiers migrés (--verify).
+
+Une fois les fichiers écrits, ceux que la migration a modifiés sont vérifiés
+en un seul lot : par une seule invocation de `dart analyze` quand le SDK Dart
+est disponible, sinon par check_source(), un contrôle local de l'équilibre
+des délimiteurs et des instructions. Le contrôle local ne remplace pas
+l'analyseur mais repère ce que les réécritures peuvent casser : délimiteur
+non fermé ou en trop, chaîne ou commentaire non terminé, point-virgule dans
+des parenthèses, instruction (if, return...) en position d'expression,
+comme le bloc if/else du pattern 8 de v2 derrière un =>.
+
+Chaque diagnostic est rattaché à la modification dont les lignes le
+contiennent (FileResult.spans), sinon à la dernière modification qui le
+précède : c'est la règle, et la variante, qui a produit le code fautif.
+
+Quand les contenus d'origine sont disponibles (--rollback), ils sont
+vérifiés par le même contrôle : un diagnostic qui s'y trouvait déjà, au
+même message près, est marqué preexisting. Seuls les fichiers où une règle
+a introduit une erreur (Verification.regressed) sont alors restaurés.
+"""
+
+import bisect
+import os
+import re
+import shutil
+import subprocess
+import time
+from collections import Counter
+from typing import NamedTuple
+
+from codemod.dart_scanner import DartScanner
+
+AUTO = 'auto'
+DART = 'dart'
+LOCAL = 'local'
+CHECKERS = (AUTO, DART, LOCAL)
+
+# Longueur maximale d'une ligne de commande dart analyze ; au-delà, le lot
+# est découpé (ARG_MAX, limite de Windows).
+MAX_COMMAND_LENGTH = 30000
+# Diagnostics gardés par fichier pour le contrôle local : après la première
+# erreur, les suivantes ne sont souvent que des conséquences.
+MAX_DIAGNOSTICS = 10
+
+# Sortie de dart analyze --format=machine :
+# SÉVÉRITÉ|TYPE|CODE|CHEMIN|LIGNE|COLONNE|LONGUEUR|MESSAGE, | échappé en \|.
+_MACHINE_FIELD = re.compile(r'(?<!\\)\|')
+_MACHINE_ESCAPE = re.compile(r'\\(.)')
+
+_OPENERS = {'(': ')', '[': ']', '{': '}'}
+_CLOSERS = {')': '(', ']': '[', '}': '{'}
+_STATEMENTS = ('if', 'for', 'while', 'do', 'return', 'try', 'break', 'continue')
+# Éléments de collection admis entre crochets : [if (a) x, for (...) y].
+_COLLECTION_ELEMENTS = ('if', 'for')
+_TOKEN = re.compile(r'[()\[\]{};]|=>|[=!<>]=|=|(?<![\w$])(?:%s)(?![\w$])' % '|'.join(_STATEMENTS))
+_NOT_NEWLINE = re.compile(r'[^\n]')
+# Numéros de ligne des messages, ignorés pour comparer avant et après migration.
+_LINE_REFERENCE = re.compile(r'ligne \d+')
+# Suffixe des copies des contenus d'origine soumises à dart analyze.
+BASELINE_SUFFIX = '.codemod-base.dart'
+
+
+class VerificationError(Exception):
+    """Vérification impossible (analyseur introuvable ou en échec)."""
+
+
+class Diagnostic(NamedTuple):
+    """Une erreur dans un fichier migré ; rule et inside sont remplis par verify()."""
+
+    path: str
+    line: int
+    column: int
+    message: str
+    rule: str = None
+    # Vrai si la ligne est dans la modification de rule, faux si elle la suit.
+    inside: bool = False
+    # Vrai si le contenu d'origine avait déjà ce diagnostic.
+    preexisting: bool = False
+
+
+def find_dart():
+    """Chemin de l'exécutable dart, ou None si le SDK n'est pas dans le PATH."""
+    return shutil.which('dart')
+
+
+def dart_analyze(paths, project_root, dart):
+    """Erreurs signalées par dart analyze sur paths, en aussi peu d'invocations que possible."""
+    diagnostics = []
+    for batch in _command_batches([os.path.abspath(path) for path in paths]):
+        try:
+            completed = subprocess.run([dart, 'analyze', '--format=machine', *batch],
+                                       cwd=project_root, capture_output=True)
+        except OSError as e:
+            raise VerificationError(f"dart analyze n'a pas pu être lancé : {e}") from e
+        output = (completed.stdout + completed.stderr).decode('utf-8', 'replace')
+        found = parse_machine_output(output)
+        # Codes de sortie : 0 à 3 selon la sévérité des problèmes trouvés.
+        if completed.returncode not in (0, 1, 2, 3) and not found:
+            message = output.strip().splitlines()[-1:] or [f'code {completed.returncode}']
+            raise VerificationError(f"dart analyze a échoué : {message[0]}")
+        diagnostics.extend(found)
+    return diagnostics
+
+
+def _command_batches(paths):
+    batch = []
+    length = 0
+    for path in paths:
+        if batch and length + len(path) + 1 > MAX_COMMAND_LENGTH:
+            yield batch
+            batch, length = [], 0
+        batch.append(path)
+        length += len(path) + 1
+    if batch:
+        yield batch
+
+
+def parse_machine_output(output):
+    """Diagnostics de sévérité ERROR d'une sortie dart analyze --format=machine."""
+    diagnostics = []
+    for line in output.splitlines():
+        fields = _MACHINE_FIELD.split(line, 7)
+        if len(fields) != 8 or fields[0] != 'ERROR':
+            continue
+        _, _, code, path, line_number, column, _, message = (
+            _MACHINE_ESCAPE.sub(r'\1', field) for field in fields)
+        try:
+            line_number, column = int(line_number), int(column)
+        except ValueError:
+            continue
+        diagnostics.append(Diagnostic(path, line_number, column, f'{message} ({code.lower()})'))
+    return diagnostics
+
+
+def check_files(paths):
+    """Erreurs du contrôle local sur chaque fichier de paths."""
+    diagnostics = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                source = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            diagnostics.append(Diagnostic(path, 1, 1, f'illisible : {e}'))
+            continue
+        diagnostics.extend(Diagnostic(path, line, column, message)
+                           for line, column, message in check_source(source))
+    return diagnostics
+
+
+def check_source(source):
+    """Erreurs de délimiteurs et d'instructions : [(ligne, colonne, message)].
+
+    Chaînes et commentaires sont d'abord masqués (voir DartScanner) ; le
+    contrôle ne porte que sur le code.
+    """
+    scanner = DartScanner(source)
+    errors = []
+    parts = []
+    last = 0
+    for start in sorted(scanner.skips):
+        end = scanner.skips[start]
+        problem = _unterminated(source, start, end)
+        if problem is not None:
+            errors.append((start, problem))
+        parts.append(source[last:start])
+        parts.append(_NOT_NEWLINE.sub(' ', source[start:end]))
+        last = end
+    parts.append(source[last:])
+    code = ''.join(parts)
+
+    # Pile des délimiteurs ouverts : (caractère, position, en-tête de for).
+    stack = []
+    expression_at = -1
+    keyword, keyword_end = None, -1
+    for m in _TOKEN.finditer(code):
+        token, pos = m.group(), m.start()
+        if len(errors) >= MAX_DIAGNOSTICS:
+            break
+        if token in _OPENERS:
+            header = (token == '(' and keyword == 'for' and not code[keyword_end:pos].strip())
+            stack.append((token, pos, header))
+        elif token in _CLOSERS:
+            if stack and stack[-1][0] == _CLOSERS[token]:
+                stack.pop()
+            elif any(opener == _CLOSERS[token] for opener, _, _ in stack):
+                opener, at, _ = stack[-1]
+                errors.append((pos, f"« {token} » ferme « {opener} » ouvert ligne {_line(code, at)}"))
+                while stack[-1][0] != _CLOSERS[token]:
+                    stack.pop()
+                stack.pop()
+            else:
+                errors.append((pos, f"« {token} » sans délimiteur ouvrant"))
+        elif token == ';':
+            if stack and (stack[-1][0] == '[' or (stack[-1][0] == '(' and not stack[-1][2])):
+                errors.append((pos, f"« ; » dans « {stack[-1][0]} » ouvert ligne {_line(code, stack[-1][1])}"))
+        elif token in ('=>', '='):
+            expression_at = m.end()
+        elif token in _STATEMENTS:
+            keyword, keyword_end = token, m.end()
+            if expression_at >= 0 and not code[expression_at:pos].strip():
+                errors.append((pos, f"instruction « {token} » en position d'expression"))
+            elif stack and stack[-1][0] == '(':
+                errors.append((pos, f"instruction « {token} » dans des parenthèses"))
+            elif stack and stack[-1][0] == '[' and token not in _COLLECTION_ELEMENTS:
+                errors.append((pos, f"instruction « {token} » dans une liste"))
+    for opener, pos, _ in stack[:MAX_DIAGNOSTICS - len(errors)]:
+        errors.append((pos, f"« {opener} » jamais fermé"))
+    errors.sort()
+    return [(_line(source, pos), pos - source.rfind('\n', 0, pos), message)
+            for pos, message in errors[:MAX_DIAGNOSTICS]]
+
+
+def _unterminated(source, start, end):
+    """Message si la chaîne ou le commentaire source[start:end] n'est pas terminé."""
+    text = source[start:end]
+    if text.startswith('//'):
+        return None
+    if text.startswith('/*'):
+        return None if len(text) >= 4 and text.endswith('*/') else "commentaire /* non terminé"
+    body = text[1:] if text[0] in 'rR' else text
+    quote = body[:3] if body[:3] in ("'''", '"""') else body[:1]
+    if len(body) >= 2 * len(quote) and body.endswith(quote):
+        return None
+    return "chaîne non terminée"
+
+
+def _line(text, pos):
+    return text.count('\n', 0, pos) + 1
+
+
+def attribute(line, spans):
+    """(règle, dans la modification) pour un diagnostic à la ligne line ; (None, False) avant toute modification."""
+    index = bisect.bisect_right([first for first, _, _ in spans], line) - 1
+    if index < 0:
+        return None, False
+    _, last, rule = spans[index]
+    return rule, line <= last
+
+
+class Verification:
+    """Bilan de la vérification d'un lot de fichiers migrés."""
+
+    def __init__(self, checker, files, diagnostics, seconds):
+        self.checker = checker
+        self.files = files
+        self.diagnostics = diagnostics
+        self.seconds = seconds
+
+    @property
+    def failing(self):
+        """Chemins des fichiers en erreur, triés."""
+        return sorted({diagnostic.path for diagnostic in self.diagnostics})
+
+    @property
+    def regressed(self):
+        """Chemins des fichiers dont une règle a introduit une erreur, triés.
+
+        Un diagnostic compte s'il est rattaché à une modification (rule non
+        None) et absent du contenu d'origine.
+        """
+        return sorted({diagnostic.path for diagnostic in self.diagnostics
+                       if diagnostic.rule is not None and not diagnostic.preexisting})
+
+    def rule_counts(self):
+        """Diagnostics par règle (None : hors de toute modification)."""
+        counts = {}
+        for diagnostic in self.diagnostics:
+            counts[diagnostic.rule] = counts.get(diagnostic.rule, 0) + 1
+        return counts
+
+
+def verify(results, project_root, checker=AUTO, originals=None):
+    """Vérifie les fichiers des FileResult migrés ; retourne une Verification.
+
+    checker vaut DART (dart analyze, VerificationError sans SDK), LOCAL
+    (contrôle local) ou AUTO (dart analyze si possible, contrôle local sinon).
+    originals, facultatif, associe le chemin d'un résultat à une copie de son
+    contenu d'origine, vérifiée elle aussi pour repérer les diagnostics
+    antérieurs à la migration.
+    """
+    start = time.perf_counter()
+    paths = [result.path for result in results]
+    dart = None
+    if checker != LOCAL:
+        dart = find_dart()
+        if dart is None and checker == DART:
+            raise VerificationError("SDK Dart introuvable (dart absent du PATH)")
+    diagnostics = None
+    name = 'contrôle local'
+    if dart is not None:
+        try:
+            diagnostics = dart_analyze(paths, project_root, dart)
+            name = 'dart analyze'
+        except VerificationError:
+            if checker == DART:
+                raise
+            dart = None
+    if diagnostics is None:
+        diagnostics = check_files(paths)
+    before = baseline(originals or {}, project_root, dart)
+
+    # dart analyze rend des chemins absolus : on revient aux chemins des résultats.
+    spans = {os.path.abspath(result.path): (result.path, result.spans or []) for result in results}
+    attributed = []
+    for diagnostic in diagnostics:
+        path, file_spans = spans.get(os.path.abspath(diagnostic.path), (diagnostic.path, []))
+        rule, inside = attribute(diagnostic.line, file_spans)
+        known = before.get(path)
+        key = _message_key(diagnostic.message)
+        preexisting = bool(known and known[key])
+        if preexisting:
+            known[key] -= 1
+        attributed.append(diagnostic._replace(path=path, rule=rule, inside=inside,
+                                              preexisting=preexisting))
+    attributed.sort(key=lambda diagnostic: (diagnostic.path, diagnostic.line, diagnostic.column))
+    return Verification(name, len(paths), attributed, time.perf_counter() - start)
+
+
+def baseline(originals, project_root, dart=None):
+    """{chemin: Counter des messages} des contenus d'origine de originals.
+
+    Avec dart, les copies sont analysées sous un nom en .dart à côté du
+    fichier, pour que ses imports relatifs se résolvent comme l'original.
+    """
+    if not originals:
+        return {}
+    if dart is None:
+        diagnostics = check_files(originals.values())
+        by_copy = {os.path.abspath(copy): path for path, copy in originals.items()}
+    else:
+        by_copy = {}
+        try:
+            for path, original in originals.items():
+                directory, name = os.path.split(os.path.abspath(path))
+                copy = os.path.join(directory, f'.{name}{BASELINE_SUFFIX}')
+                shutil.copyfile(original, copy)
+                by_copy[copy] = path
+            diagnostics = dart_analyze(list(by_copy), project_root, dart)
+        finally:
+            for copy in by_copy:
+                try:
+                    os.unlink(copy)
+                except FileNotFoundError:
+                    pass
+    counts = {path: Counter() for path in originals}
+    for diagnostic in diagnostics:
+        path = by_copy.get(os.path.abspath(diagnostic.path))
+        if path is not None:
+            counts[path][_message_key(diagnostic.message)] += 1
+    return counts
+
+
+def _message_key(message):
+    return _LINE_REFERENCE.sub('ligne', message)
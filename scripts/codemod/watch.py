@@ -0,0 +1,231 @@
+"""
+Mode surveillance (--watch) : relance les règles sur les fichiers Dart
+modifiés sous une ou plusieurs racines, au fil des enregistrements.
+
+Un instantané (mtime, taille) de chaque fichier .dart sert de référence :
+seuls les fichiers dont l'état diffère de l'instantané sont traités, puis
+l'instantané est mis à jour, ce qui ignore aussi les écritures faites par la
+migration elle-même. Sous Linux, inotify (via ctypes, sans dépendance)
+signale les fichiers touchés ; ailleurs, ou si inotify n'est pas
+disponible, l'arborescence est relue par os.scandir à intervalle régulier.
+
+Les rafales d'événements (changement de branche, formatage de tout le
+projet) sont regroupées : le traitement part quand aucun événement n'est
+arrivé depuis `debounce` secondes, ou au plus tard après `max_delay`.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 0.15
+DEFAULT_MAX_DELAY = 5.0
+
+SUFFIX = '.dart'
+
+
+def _stat_key(path):
+    """(mtime_ns, taille) du fichier, ou None s'il n'existe plus."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _paths(roots):
+    """Liste de chemins (str) ; roots est un chemin ou une liste de chemins."""
+    if isinstance(roots, (str, os.PathLike)):
+        roots = [roots]
+    return [os.fspath(root) for root in roots]
+
+
+def scan(roots):
+    """Instantané {chemin: (mtime_ns, taille)} des fichiers .dart sous roots."""
+    snapshot = {}
+    stack = _paths(roots)
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.endswith(SUFFIX):
+                        st = entry.stat()
+                        snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+    return snapshot
+
+
+class PollingWatcher:
+    """Relit l'arborescence toutes les `interval` secondes."""
+
+    def __init__(self, roots, interval=DEFAULT_POLL_INTERVAL):
+        self.roots = _paths(roots)
+        self.interval = interval
+        self.last = scan(self.roots)
+
+    def poll(self, timeout=None):
+        """Chemins dont l'état a changé depuis le dernier appel ; attend au plus timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+            current = scan(self.roots)
+            changed = {path for path, state in current.items() if self.last.get(path) != state}
+            self.last = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+# Constantes de <sys/inotify.h>.
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, 'O_CLOEXEC', 0)
+WATCH_MASK = IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+_EVENT = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Un watch inotify par répertoire ; les nouveaux répertoires sont suivis à leur création."""
+
+    def __init__(self, roots):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        self.roots = _paths(roots)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1')
+        self.directories = {}
+        try:
+            for root in self.roots:
+                self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, directory):
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        self.directories[wd] = directory
+
+    def _watch_tree(self, top):
+        """Suit top et ses sous-répertoires ; retourne les fichiers .dart qu'ils contiennent."""
+        found = set()
+        for directory, _, files in os.walk(top):
+            self._watch(directory)
+            found.update(os.path.join(directory, name) for name in files if name.endswith(SUFFIX))
+        return found
+
+    def poll(self, timeout=None):
+        """Chemins signalés par inotify ; attend au plus timeout secondes."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Événements perdus : tout l'arbre redevient candidat.
+                changed.update(scan(self.roots))
+                continue
+            directory = self.directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        changed.update(self._watch_tree(path))
+                    except OSError:
+                        continue
+            elif name.endswith(SUFFIX):
+                changed.add(path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def create_watcher(roots, interval=DEFAULT_POLL_INTERVAL):
+    """InotifyWatcher sous Linux quand c'est possible, PollingWatcher sinon."""
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots, interval)
+
+
+def watch(roots, on_change, interval=DEFAULT_POLL_INTERVAL, debounce=DEFAULT_DEBOUNCE,
+          max_delay=DEFAULT_MAX_DELAY, watcher=None):
+    """Appelle on_change(chemins triés) pour chaque lot de fichiers modifiés sous roots, sans fin.
+
+    S'arrête sur KeyboardInterrupt (propagée à l'appelant).
+    """
+    snapshot = scan(roots)
+    if watcher is None:
+        watcher = create_watcher(roots, interval)
+    try:
+        while True:
+            candidates = set()
+            while not candidates:
+                candidates = watcher.poll(None)
+            deadline = time.monotonic() + max_delay
+            while time.monotonic() < deadline:
+                more = watcher.poll(min(debounce, max(0.0, deadline - time.monotonic())))
+                if not more:
+                    break
+                candidates |= more
+            changed = []
+            for path in sorted(candidates):
+                state = _stat_key(path)
+                if state is None:
+                    snapshot.pop(path, None)
+                elif snapshot.get(path) != state:
+                    changed.append(path)
+            if not changed:
+                continue
+            on_change(changed)
+            # Les écritures de la migration ne doivent pas relancer un passage.
+            for path in changed:
+                state = _stat_key(path)
+                if state is not None:
+                    snapshot[path] = state
+    finally:
+        watcher.close()
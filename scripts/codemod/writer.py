@@ -0,0 +1,235 @@
+"""
+Écriture atomique et groupée des fichiers migrés.
+
+Le contenu migré est d'abord écrit dans un fichier temporaire du même
+répertoire (stage() ou, par morceaux, stage_chunks() ; exécutables dans un
+worker). Le processus parent regroupe ensuite les fichiers préparés : à
+chaque lot, il fait un fsync de chaque fichier temporaire, les renomme
+atomiquement sur leur cible puis fait un fsync des répertoires concernés.
+Un arrêt brutal laisse donc chaque fichier Dart soit intact, soit
+entièrement migré.
+
+En mode transaction, rien n'est renommé avant la fin de l'exécution : si
+elle échoue, les fichiers temporaires sont supprimés et l'arborescence reste
+inchangée.
+
+Avec keep_originals, chaque cible garde avant son renommage un lien dur vers
+son contenu d'origine (une copie si le système de fichiers n'en permet pas) :
+restore() rend leur contenu aux fichiers dont la vérification a échoué.
+
+Les fichiers temporaires et copies d'origine portent dans leur nom le jeton
+de l'exécution (new_run_id()) : après une interruption, remove_stale() ne
+supprime que ceux de cette exécution, et les orphelins d'exécutions
+anciennes, sans toucher à ceux d'une exécution concurrente. Une cible qui
+est un lien symbolique est résolue : c'est le fichier pointé qui est
+remplacé, le lien reste en place.
+"""
+
+import os
+import shutil
+import stat
+import tempfile
+import time
+import uuid
+
+TMP_SUFFIX = '.codemod-tmp'
+ORIGINAL_SUFFIX = '.codemod-orig'
+DEFAULT_BATCH_SIZE = 64
+# Âge (secondes depuis la création) au-delà duquel un fichier de codemod
+# d'une autre exécution est considéré comme orphelin.
+STALE_AGE = 24 * 3600
+
+
+def new_run_id():
+    """Jeton d'une exécution, repris dans le nom de ses fichiers temporaires."""
+    return uuid.uuid4().hex[:12]
+
+
+def stage(path, content, run_id=''):
+    """Écrit content dans un fichier temporaire à côté de path ; retourne son chemin.
+
+    Le fichier temporaire reprend les permissions de path ; si path est un
+    lien symbolique, il est créé à côté du fichier pointé.
+    """
+    def write(fd):
+        with open(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+    return _stage(path, write, run_id)
+
+
+def stage_chunks(path, chunks, run_id=''):
+    """Comme stage(), pour un contenu fourni en morceaux de bytes (réécriture en flux)."""
+    def write(fd):
+        with open(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+    return _stage(path, write, run_id)
+
+
+def _stage(path, write, run_id):
+    directory, name = os.path.split(os.path.realpath(path))
+    prefix = f'.{name}.{run_id}.' if run_id else f'.{name}.'
+    fd, tmp_path = tempfile.mkstemp(prefix=prefix, suffix=TMP_SUFFIX, dir=directory)
+    try:
+        write(fd)
+        try:
+            os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+    except BaseException:
+        _unlink(tmp_path)
+        raise
+    return tmp_path
+
+
+def _unlink(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _fsync_path(path, flags=os.O_RDONLY):
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(directory):
+    # Pas de fsync de répertoire sous Windows : os.replace y suffit.
+    if os.name != 'posix':
+        return
+    _fsync_path(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+
+
+def remove_stale(directories, run_id=None, max_age=STALE_AGE):
+    """Supprime les fichiers temporaires et copies d'origine de codemod laissés dans directories.
+
+    Sert après une interruption, pour les fichiers préparés par des workers
+    dont le résultat n'a pas été reçu. Seuls sont supprimés ceux de
+    l'exécution run_id et ceux créés il y a plus de max_age secondes : les
+    fichiers d'une exécution concurrente restent en place.
+    """
+    removed = 0
+    limit = time.time() - max_age
+    for directory in directories:
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            continue
+        for name in names:
+            if not (name.startswith('.') and name.endswith((TMP_SUFFIX, ORIGINAL_SUFFIX))):
+                continue
+            path = os.path.join(directory, name)
+            if not (run_id and f'.{run_id}.' in name):
+                try:
+                    # ctime : date du lien dur pour une copie d'origine, dont le mtime est ancien.
+                    if os.lstat(path).st_ctime > limit:
+                        continue
+                except FileNotFoundError:
+                    continue
+            _unlink(path)
+            removed += 1
+    return removed
+
+
+def _keep_original(tmp_path, target):
+    """Lien dur (ou copie) du contenu actuel de target ; retourne son chemin, ou None."""
+    original = tmp_path[:-len(TMP_SUFFIX)] + ORIGINAL_SUFFIX
+    try:
+        os.link(target, original)
+    except FileNotFoundError:
+        return None
+    except OSError:
+        shutil.copy2(target, original)
+    return original
+
+
+class BatchWriter:
+    """Valide les fichiers préparés par lots de batch_size, ou en fin d'exécution.
+
+    S'utilise comme gestionnaire de contexte : à la sortie, les fichiers en
+    attente sont validés, sauf en cas d'exception où ils sont abandonnés.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, transaction=False, keep_originals=False):
+        self.batch_size = max(1, batch_size)
+        self.transaction = transaction
+        self.keep_originals = keep_originals
+        self.pending = []
+        # Cible -> copie de son contenu d'origine, avec keep_originals.
+        self.originals = {}
+        self.committed = 0
+        self.aborted = 0
+        self.restored = 0
+
+    def add(self, tmp_path, target):
+        self.pending.append((tmp_path, target))
+        if not self.transaction and len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """fsync des fichiers temporaires, renommage sur les cibles, fsync des répertoires."""
+        if not self.pending:
+            return
+        for tmp_path, _ in self.pending:
+            _fsync_path(tmp_path)
+        pending, self.pending = self.pending, []
+        directories = set()
+        for index, (tmp_path, target) in enumerate(pending):
+            real = os.path.realpath(target)
+            try:
+                if self.keep_originals and target not in self.originals:
+                    original = _keep_original(tmp_path, real)
+                    if original is not None:
+                        self.originals[target] = original
+                os.replace(tmp_path, real)
+            except BaseException:
+                self.pending = pending[index:]
+                raise
+            directories.add(os.path.dirname(real))
+            self.committed += 1
+        for directory in sorted(directories):
+            _fsync_directory(directory)
+
+    def abort(self):
+        """Supprime les fichiers temporaires en attente ; les cibles restent inchangées."""
+        for tmp_path, _ in self.pending:
+            _unlink(tmp_path)
+        self.aborted += len(self.pending)
+        self.pending = []
+
+    def restore(self, targets):
+        """Rend leur contenu d'origine aux cibles validées ; retourne leur nombre."""
+        directories = set()
+        restored = 0
+        for target in targets:
+            original = self.originals.pop(target, None)
+            if original is None:
+                continue
+            real = os.path.realpath(target)
+            os.replace(original, real)
+            directories.add(os.path.dirname(real))
+            restored += 1
+        for directory in sorted(directories):
+            _fsync_directory(directory)
+        self.restored += restored
+        return restored
+
+    def discard_originals(self):
+        """Supprime les copies d'origine : les fichiers validés le restent."""
+        for original in self.originals.values():
+            _unlink(original)
+        self.originals = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.abort()
+        return False
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Applique plusieurs codemods en un seul parcours du projet (lib/features,
+lib/shared, lib/core et lib/app par défaut, voir --root) : chaque fichier
+est lu une fois et toutes les règles applicables sont exécutées dans le
+même passage.
+
+Usage: python3 scripts/run_codemods.py --rule migrate_to_notification_service_final [--rule ...] [--jobs N]
+"""
+
+from pathlib import Path
+
+from codemod import engine, runner
+
+def main():
+    """Fonction principale."""
+    parser = runner.build_parser(__doc__)
+    parser.add_argument(
+        '--rule', action='append', required=True, dest='rules', metavar='MODULE',
+        help='script de scripts/ dont les règles sont appliquées (répétable)',
+    )
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    rules = engine.load_rules(args.rules)
+    runner.main(rules, project_root, args=args)
+
+if __name__ == '__main__':
+    main()
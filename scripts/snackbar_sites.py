@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Liste les appels showSnackBar restants d'après l'index .codemod_index.json
+(voir codemod/sites.py) : fichier, ligne, colonne, type de notification
+détecté et raison pour laquelle la migration finale ne les réécrit pas.
+
+L'index est mis à jour avant la requête : seuls les fichiers modifiés depuis
+la mise à jour précédente sont relus (--no-update : interroger l'index tel
+quel, sans toucher à l'arborescence).
+
+Raisons : pending (migrable, pas encore migré), receiver (receveur autre que
+ScaffoldMessenger.of(context)), not_snackbar, content (pas de Text(...)),
+arguments (action, behavior... que NotificationService ne reprend pas),
+expression (fond conditionnel après => : pas d'if/else possible), unclosed.
+
+Usage: python3 scripts/snackbar_sites.py [--type error] [--reason pending] [--under gaz] [--json]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from codemod import discovery, runner, sites
+
+
+def main():
+    """Fonction principale."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--type', action='append', dest='types', choices=sites.TYPES,
+                        help='ne garder que ce type de notification (répétable)')
+    parser.add_argument('--reason', action='append', dest='reasons', choices=sites.REASONS,
+                        help='ne garder que cette raison de non-migration (répétable)')
+    parser.add_argument('--under', action='append', dest='directories', default=[], metavar='DIR',
+                        help='ne garder que les fichiers sous un répertoire DIR, à toute profondeur '
+                             '(ex. gaz ; répétable)')
+    parser.add_argument('--path', action='append', dest='globs', default=[], metavar='GLOB',
+                        help='ne garder que les fichiers dont le chemin relatif au projet correspond (répétable)')
+    parser.add_argument('--json', action='store_true', help='une ligne JSON par site')
+    parser.add_argument('--no-update', action='store_true',
+                        help="ne pas mettre l'index à jour avant la requête")
+    runner.add_discovery_arguments(parser)
+    args = parser.parse_args()
+
+    project_root = Path(__file__).parent.parent
+    index = sites.SiteIndex(project_root / sites.INDEX_FILE).load()
+    if not args.no_update:
+        finder = runner.discovery_from_args(project_root, args)
+        try:
+            index.refresh(finder, project_root, complete=finder.changed_since is None)
+        except discovery.DiscoveryError as e:
+            raise SystemExit(f"✗ {e}") from e
+        index.save()
+
+    found = list(index.query(types=set(args.types or ()), reasons=set(args.reasons or ()),
+                             directories=args.directories,
+                             globs=[discovery.compile_glob(glob) for glob in args.globs]))
+    if args.json:
+        for relative, site in found:
+            print(json.dumps(dict(file=relative, **site._asdict()), ensure_ascii=False))
+        return
+
+    for relative, site in found:
+        detail = f"  {site.detail}" if site.detail else ''
+        print(f"{relative}:{site.line}:{site.column}  {site.type:<11}  {site.reason}{detail}")
+    counts = {}
+    for _, site in found:
+        counts[site.reason] = counts.get(site.reason, 0) + 1
+    detail = ', '.join(f"{reason}={n}" for reason, n in sorted(counts.items()))
+    print(f"\n{len(found)} site(s) dans {len({relative for relative, _ in found})} fichier(s)"
+          f"{f' ({detail})' if detail else ''}", file=sys.stderr)
+    if not args.no_update:
+        print(f"Index: {len(index.files)} fichier(s), {index.rescanned} réanalysé(s)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Configuration pytest des tests des scripts de migration.
+
+Les scripts s'importent depuis scripts/ (codemod, migrate_to_notification_service*).
+La fixture project fournit un petit projet synthétique (codemod.corpus) ;
+helpers.py regroupe les utilitaires communs aux tests.
+Les options --golden-update et --golden-repeat pilotent le corpus doré (voir
+test_golden.py). Le rapport (matrice d'accord, écarts à la référence, débit)
+s'affiche en fin de session dès qu'un test du corpus a tourné.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from codemod import golden  # noqa: E402
+from codemod.corpus import generate_corpus  # noqa: E402
+
+GOLDEN_DIR = Path(__file__).parent / 'golden'
+# Sorties du corpus calculées pendant la session, reprises par le rapport.
+OUTPUTS = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('golden', 'corpus doré des migrations NotificationService')
+    group.addoption('--golden-update', action='store_true',
+                    help="figer les sorties qui s'écartent de la référence (<implémentation>.dart) "
+                         "au lieu d'échouer")
+    group.addoption('--golden-repeat', type=int, default=golden.DEFAULT_REPEAT, metavar='N',
+                    help=f'tours de mesure du débit, 0 pour ne pas le mesurer '
+                         f'(défaut : {golden.DEFAULT_REPEAT})')
+
+
+def pytest_generate_tests(metafunc):
+    """Paramètres case (un cas du corpus) et implementation (v1, v2, final)."""
+    if 'case' in metafunc.fixturenames:
+        cases = golden.load_cases(GOLDEN_DIR)
+        metafunc.parametrize('case', cases, ids=[case.name for case in cases])
+    if 'implementation' in metafunc.fixturenames:
+        metafunc.parametrize('implementation', list(golden.IMPLEMENTATIONS))
+
+
+@pytest.fixture(scope='session')
+def golden_dir():
+    return GOLDEN_DIR
+
+
+@pytest.fixture(scope='session')
+def golden_cases():
+    return golden.load_cases(GOLDEN_DIR)
+
+
+@pytest.fixture(scope='session')
+def golden_rules():
+    return golden.load_rules()
+
+
+@pytest.fixture(scope='session')
+def golden_outputs(request, golden_cases, golden_rules):
+    """{cas: {implémentation: sortie}}, calculé une fois par session."""
+    outputs = golden.run_cases(golden_cases, golden_rules, GOLDEN_DIR)
+    request.config.stash[OUTPUTS] = (golden_cases, golden_rules, outputs)
+    return outputs
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if OUTPUTS not in config.stash:
+        return
+    cases, rules, outputs = config.stash[OUTPUTS]
+    repeat = config.getoption('--golden-repeat')
+    timings = golden.throughput(cases, rules, GOLDEN_DIR, repeat) if repeat > 0 else {}
+    terminalreporter.section('corpus doré')
+    for line in golden.format_report(cases, outputs, timings):
+        terminalreporter.write_line(line)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Projet synthétique (codemod.corpus) : tmp_path/lib/features, avec pubspec.yaml."""
+    generate_corpus(tmp_path, files=60, seed=3, hit_ratio=0.5, pathological_ratio=0.1)
+    (tmp_path / 'pubspec.yaml').write_text('name: demo\n', encoding='utf-8')
+    return tmp_path
+
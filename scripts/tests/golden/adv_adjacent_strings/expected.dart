@@ -0,0 +1,8 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class AdjacentStringCases {
+  void paid(BuildContext context, double amount, Payment payment) {
+    NotificationService.showSuccess(context, 'Le paiement de ${amount.toStringAsFixed(0)} FCFA ' 'a été enregistré (réf. ${payment.id})');
+  }
+}
@@ -0,0 +1,16 @@
+import 'package:flutter/material.dart';
+
+class AdjacentStringCases {
+  void paid(BuildContext context, double amount, Payment payment) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text(
+          'Le paiement de ${amount.toStringAsFixed(0)} FCFA '
+          'a été enregistré (réf. ${payment.id})',
+        ),
+        backgroundColor: Colors.green,
+        duration: const Duration(seconds: 3),
+      ),
+    );
+  }
+}
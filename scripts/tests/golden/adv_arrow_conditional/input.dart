@@ -0,0 +1,23 @@
+import 'package:flutter/material.dart';
+
+class ArrowCases extends StatelessWidget {
+  final bool ok;
+  final String message;
+
+  const ArrowCases({super.key, required this.ok, required this.message});
+
+  void _report(BuildContext context) => ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(
+          content: Text(message),
+          backgroundColor: ok ? Colors.green : Colors.red,
+        ),
+      );
+
+  @override
+  Widget build(BuildContext context) {
+    return TextButton(
+      onPressed: () => _report(context),
+      child: const Text('Envoyer'),
+    );
+  }
+}
@@ -0,0 +1,23 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class ArrowCases extends StatelessWidget {
+  final bool ok;
+  final String message;
+
+  const ArrowCases({super.key, required this.ok, required this.message});
+
+  void _report(BuildContext context) => if (ok) {
+        NotificationService.showSuccess(context, message);
+      } else {
+        NotificationService.showError(context, message);
+      }
+
+  @override
+  Widget build(BuildContext context) {
+    return TextButton(
+      onPressed: () => _report(context),
+      child: const Text('Envoyer'),
+    );
+  }
+}
@@ -0,0 +1,16 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class ConditionalCases {
+  void statement(BuildContext context, bool success, String message) {
+    if (success) {
+        NotificationService.showSuccess(context, message);
+      } else {
+        NotificationService.showError(context, message);
+      }
+  }
+
+  void themed(BuildContext context, String message) {
+    NotificationService.showError(context, message);
+  }
+}
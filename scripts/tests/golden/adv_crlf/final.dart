@@ -0,0 +1,12 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class CrlfCases {
+  void saved(BuildContext context) {
+    NotificationService.showSuccess(context, 'Enregistré');
+  }
+
+  void failed(BuildContext context, Object e) {
+    NotificationService.showError(context, 'Erreur: $e');
+  }
+}
@@ -0,0 +1,18 @@
+import 'package:flutter/material.dart';
+
+class CrlfCases {
+  void saved(BuildContext context) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      const SnackBar(
+        content: Text('Enregistré'),
+        backgroundColor: Colors.green,
+      ),
+    );
+  }
+
+  void failed(BuildContext context, Object e) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(content: Text('Erreur: $e'), backgroundColor: Colors.red),
+    );
+  }
+}
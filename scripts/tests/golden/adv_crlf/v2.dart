@@ -0,0 +1,17 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class CrlfCases {
+  void saved(BuildContext context) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      const SnackBar(
+        content: Text('Enregistré'),
+        backgroundColor: Colors.green,
+      ),
+    );
+  }
+
+  void failed(BuildContext context, Object e) {
+    NotificationService.showError(context, 'Erreur: $e');
+  }
+}
@@ -0,0 +1,18 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+// Le premier appel a un fond non conditionnel et aucun « ? » : le pattern 8
+// de v2 ([^?]+) déborde jusqu'au second appel.
+class CrossingCases {
+  void first(BuildContext context, String message) {
+    NotificationService.showInfo(context, message);
+  }
+
+  void second(BuildContext context, bool ok, String message) {
+    if (ok) {
+        NotificationService.showSuccess(context, message);
+      } else {
+        NotificationService.showError(context, message);
+      }
+  }
+}
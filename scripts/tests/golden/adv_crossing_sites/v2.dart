@@ -0,0 +1,23 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+// Le premier appel a un fond non conditionnel et aucun « ? » : le pattern 8
+// de v2 ([^?]+) déborde jusqu'au second appel.
+class CrossingCases {
+  void first(BuildContext context, String message) {
+    if (Colors.blue,
+      ),
+    );
+  }
+
+  void second(BuildContext context, bool ok, String message) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text(message),
+        backgroundColor: ok) {
+        NotificationService.showSuccess(context, message);
+      } else {
+        NotificationService.showError(context, message);
+      }
+  }
+}
@@ -0,0 +1,20 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class ErrorPrefixCases {
+  void concatenation(BuildContext context, Object e) {
+    NotificationService.showError(context, e.toString());
+  }
+
+  void doubleQuotes(BuildContext context, Object e) {
+    NotificationService.showError(context, "Erreur : " + e.toString());
+  }
+
+  void interpolation(BuildContext context, Object e) {
+    NotificationService.showError(context, 'Erreur: $e');
+  }
+
+  void withoutBackground(BuildContext context, String message) {
+    NotificationService.showError(context, message);
+  }
+}
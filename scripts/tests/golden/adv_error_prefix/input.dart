@@ -0,0 +1,36 @@
+import 'package:flutter/material.dart';
+
+class ErrorPrefixCases {
+  void concatenation(BuildContext context, Object e) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text('Erreur: ' + e.toString()),
+        backgroundColor: Colors.red,
+      ),
+    );
+  }
+
+  void doubleQuotes(BuildContext context, Object e) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text("Erreur : " + e.toString()),
+        backgroundColor: Colors.red,
+      ),
+    );
+  }
+
+  void interpolation(BuildContext context, Object e) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text('Erreur: $e'),
+        backgroundColor: Colors.red,
+      ),
+    );
+  }
+
+  void withoutBackground(BuildContext context, String message) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(content: Text('Erreur: ' + message)),
+    );
+  }
+}
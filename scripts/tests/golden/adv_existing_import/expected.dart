@@ -0,0 +1,10 @@
+import 'package:flutter/material.dart';
+
+import '../../shared.dart';
+
+class AlreadyImported {
+  void notify(BuildContext context) {
+    NotificationService.showInfo(context, 'Déjà migré');
+    NotificationService.showInfo(context, 'Pas encore migré');
+  }
+}
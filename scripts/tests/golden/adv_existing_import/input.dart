@@ -0,0 +1,12 @@
+import 'package:flutter/material.dart';
+
+import '../../shared.dart';
+
+class AlreadyImported {
+  void notify(BuildContext context) {
+    NotificationService.showInfo(context, 'Déjà migré');
+    ScaffoldMessenger.of(context).showSnackBar(
+      const SnackBar(content: Text('Pas encore migré')),
+    );
+  }
+}
@@ -0,0 +1,12 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class NestedParensCases {
+  void count(BuildContext context, List<Item> items) {
+    NotificationService.showSuccess(context, formatMessage(context, items.where((i) => i.isValid()).length));
+  }
+
+  void amount(BuildContext context, double amount) {
+    NotificationService.showInfo(context, 'Total : ${amount.toStringAsFixed(0)} FCFA (${(amount / 655.957).round()} €)');
+  }
+}
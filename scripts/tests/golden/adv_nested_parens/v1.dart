@@ -0,0 +1,20 @@
+import 'package:flutter/material.dart';
+
+class NestedParensCases {
+  void count(BuildContext context, List<Item> items) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text(formatMessage(context, items.where((i) => i.isValid()).length)),
+        backgroundColor: Colors.green,
+      ),
+    );
+  }
+
+  void amount(BuildContext context, double amount) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text('Total : ${amount.toStringAsFixed(0)} FCFA (${(amount / 655.957).round()} €)'),
+      ),
+    );
+  }
+}
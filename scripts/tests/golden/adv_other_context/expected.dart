@@ -0,0 +1,21 @@
+import 'package:flutter/material.dart';
+
+class OtherContextCases {
+  void dialog(BuildContext dialogContext) {
+    ScaffoldMessenger.of(dialogContext).showSnackBar(
+      const SnackBar(content: Text('Contexte du dialogue')),
+    );
+  }
+
+  void spaced(BuildContext context) {
+    ScaffoldMessenger.of(context) .showSnackBar(
+      const SnackBar(content: Text('Espace avant le point')),
+    );
+  }
+
+  void cascade(BuildContext context) {
+    ScaffoldMessenger.of(context)
+      ..hideCurrentSnackBar()
+      ..showSnackBar(const SnackBar(content: Text('Cascade')));
+  }
+}
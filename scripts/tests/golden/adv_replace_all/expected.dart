@@ -0,0 +1,16 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class ReplaceAllCases {
+  void prefixed(BuildContext context, Object e) {
+    NotificationService.showError(context, e.toString());
+  }
+
+  void bare(BuildContext context, Object e) {
+    NotificationService.showError(context, e.toString());
+  }
+
+  void otherReplacement(BuildContext context, Object e) {
+    NotificationService.showError(context, e.toString().replaceAll('StateError: ', ''));
+  }
+}
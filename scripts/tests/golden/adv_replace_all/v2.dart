@@ -0,0 +1,30 @@
+import 'package:flutter/material.dart';
+
+class ReplaceAllCases {
+  void prefixed(BuildContext context, Object e) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text('Erreur: ' + e.toString().replaceAll('Exception: ', '')),
+        backgroundColor: Colors.red,
+      ),
+    );
+  }
+
+  void bare(BuildContext context, Object e) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text(e.toString().replaceAll('Exception: ', '')),
+        backgroundColor: Colors.red,
+      ),
+    );
+  }
+
+  void otherReplacement(BuildContext context, Object e) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text(e.toString().replaceAll('StateError: ', '')),
+        backgroundColor: Colors.red,
+      ),
+    );
+  }
+}
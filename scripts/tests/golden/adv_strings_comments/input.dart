@@ -0,0 +1,19 @@
+// ScaffoldMessenger.of(context).showSnackBar(const SnackBar(content: Text('commentaire')));
+import 'package:flutter/material.dart';
+
+/* Ancien code :
+ScaffoldMessenger.of(context).showSnackBar(
+  const SnackBar(content: Text('bloc commenté')),
+);
+*/
+const snippet = '''
+ScaffoldMessenger.of(context).showSnackBar(
+  const SnackBar(content: Text('dans une chaîne')),
+);
+''';
+
+const inline = "ScaffoldMessenger.of(context).showSnackBar(SnackBar(content: Text('x')));";
+
+void documentation(BuildContext context) {
+  debugPrint(snippet + inline);
+}
@@ -0,0 +1,13 @@
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class TruncatedCases {
+  void done(BuildContext context) {
+    NotificationService.showInfo(context, 'Terminé');
+  }
+
+  void _broken(BuildContext context) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text('Fichier tronqué (${items.length}'),
+        backgroundColor: Colors.red,
@@ -0,0 +1,14 @@
+import 'package:flutter/material.dart';
+
+class TruncatedCases {
+  void done(BuildContext context) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      const SnackBar(content: Text('Terminé')),
+    );
+  }
+
+  void _broken(BuildContext context) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: Text('Fichier tronqué (${items.length}'),
+        backgroundColor: Colors.red,
@@ -0,0 +1,21 @@
+import 'package:flutter/material.dart';
+
+class ActionCases {
+  void undoable(BuildContext context, VoidCallback undo) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      SnackBar(
+        content: const Text('Élément supprimé'),
+        action: SnackBarAction(label: 'Annuler', onPressed: () => undo()),
+      ),
+    );
+  }
+
+  void styled(BuildContext context) {
+    ScaffoldMessenger.of(context).showSnackBar(
+      const SnackBar(
+        content: Text('Copié'),
+        behavior: SnackBarBehavior.floating,
+      ),
+    );
+  }
+}
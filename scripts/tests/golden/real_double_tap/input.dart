@@ -0,0 +1,44 @@
+// Extrait de lib/shared/presentation/widgets/double_tap_to_exit.dart
+// behavior, width et shape n'ont pas d'équivalent dans NotificationService.
+import 'package:flutter/material.dart';
+import 'package:flutter/services.dart';
+
+class _DoubleTapToExitState extends State<DoubleTapToExit> {
+  DateTime? _lastPressedTime;
+
+  @override
+  Widget build(BuildContext context) {
+    return PopScope(
+      canPop: false,
+      onPopInvokedWithResult: (didPop, result) async {
+        if (didPop) return;
+
+        final now = DateTime.now();
+        final bool isDoubleTap = _lastPressedTime != null &&
+            now.difference(_lastPressedTime!) < widget.duration;
+
+        if (isDoubleTap) {
+          await SystemChannels.platform.invokeMethod('SystemNavigator.pop');
+          return;
+        }
+
+        _lastPressedTime = now;
+        if (mounted) {
+          ScaffoldMessenger.of(context).clearSnackBars();
+          ScaffoldMessenger.of(context).showSnackBar(
+            SnackBar(
+              content: Text(widget.snackBarMessage),
+              duration: widget.duration,
+              behavior: SnackBarBehavior.floating,
+              width: 280, // Largeur fixe pour un look toast centré
+              shape: RoundedRectangleBorder(
+                borderRadius: BorderRadius.circular(24),
+              ),
+            ),
+          );
+        }
+      },
+      child: widget.child,
+    );
+  }
+}
@@ -0,0 +1,36 @@
+// Extrait de lib/shared/presentation/screens/expense_balance_screen.dart
+// Le premier appel est coupé par le formateur : receveur sur trois lignes.
+import 'dart:io';
+
+import 'package:flutter/material.dart';
+import 'package:open_file/open_file.dart';
+
+class ExpenseBalanceScreen extends StatelessWidget {
+  void _exportPdf(BuildContext context) {
+    _withProgress(context, () async {
+      try {
+        final file = await _generator.generate();
+
+        if (context.mounted) {
+          Navigator.of(context).pop();
+          final result = await OpenFile.open(file.path);
+          if (result.type != ResultType.done && context.mounted) {
+            ScaffoldMessenger.of(
+              context,
+            ).showSnackBar(SnackBar(content: Text('PDF généré: ${file.path}')));
+          }
+        }
+      } catch (e) {
+        if (context.mounted) {
+          Navigator.of(context).pop();
+          ScaffoldMessenger.of(context).showSnackBar(
+            SnackBar(
+              content: Text('Erreur lors de la génération PDF: $e'),
+              backgroundColor: Colors.red,
+            ),
+          );
+        }
+      }
+    });
+  }
+}
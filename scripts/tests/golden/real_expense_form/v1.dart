@@ -0,0 +1,39 @@
+// Extrait de lib/shared/presentation/widgets/expense_form_dialog.dart
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class _ExpenseFormDialogState extends State<ExpenseFormDialog> {
+  Future<void> _handleSave() async {
+    if (!_formKey.currentState!.validate()) return;
+
+    final amount = double.tryParse(_amountController.text);
+    if (amount == null || amount <= 0) {
+      NotificationService.showError(context, 'Montant invalide');
+      return;
+    }
+
+    final error = await widget.onSave(
+      amount: amount,
+      date: _selectedDate,
+      notes: _notesController.text.trim().isEmpty
+          ? null
+          : _notesController.text.trim(),
+    );
+
+    if (!mounted) return;
+
+    if (error != null) {
+      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(content: Text(error), backgroundColor: Colors.red),
+      );
+    } else {
+      Navigator.of(context).pop();
+      ScaffoldMessenger.of(context).showSnackBar(
+        const SnackBar(
+          content: Text('Dépense enregistrée avec succès'),
+          backgroundColor: Colors.green,
+        ),
+      );
+    }
+  }
+}
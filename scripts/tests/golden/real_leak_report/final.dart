@@ -0,0 +1,28 @@
+// Extrait de lib/features/gaz/presentation/widgets/leak_report_dialog.dart
+import 'package:flutter/material.dart';
+import 'package:flutter_riverpod/flutter_riverpod.dart';
+import '../../shared.dart';
+
+class _LeakReportDialogState extends ConsumerState<LeakReportDialog> {
+  Future<void> _submit(CylinderLeak leak) async {
+    setState(() => _isLoading = true);
+    try {
+      final auth = ref.read(authControllerProvider);
+      await ref.read(transactionServiceProvider).executeLeakDeclaration(
+        leak: leak,
+        userId: auth.currentUser?.id ?? '',
+      );
+
+      if (mounted) {
+        Navigator.of(context).pop(true);
+        NotificationService.showInfo(context, 'Fuite déclarée avec succès');
+      }
+    } catch (e) {
+      if (mounted) {
+        NotificationService.showError(context, 'Erreur: $e');
+      }
+    } finally {
+      if (mounted) setState(() => _isLoading = false);
+    }
+  }
+}
@@ -0,0 +1,31 @@
+// Extrait de lib/features/gaz/presentation/widgets/leak_report_dialog.dart
+import 'package:flutter/material.dart';
+import 'package:flutter_riverpod/flutter_riverpod.dart';
+
+class _LeakReportDialogState extends ConsumerState<LeakReportDialog> {
+  Future<void> _submit(CylinderLeak leak) async {
+    setState(() => _isLoading = true);
+    try {
+      final auth = ref.read(authControllerProvider);
+      await ref.read(transactionServiceProvider).executeLeakDeclaration(
+        leak: leak,
+        userId: auth.currentUser?.id ?? '',
+      );
+
+      if (mounted) {
+        Navigator.of(context).pop(true);
+        ScaffoldMessenger.of(context).showSnackBar(
+          const SnackBar(content: Text('Fuite déclarée avec succès')),
+        );
+      }
+    } catch (e) {
+      if (mounted) {
+        ScaffoldMessenger.of(context).showSnackBar(
+          SnackBar(content: Text('Erreur: $e'), backgroundColor: Colors.red),
+        );
+      }
+    } finally {
+      if (mounted) setState(() => _isLoading = false);
+    }
+  }
+}
@@ -0,0 +1,33 @@
+// Extrait de lib/features/gaz/presentation/widgets/gas_print_receipt_button.dart
+import 'package:flutter/material.dart';
+import '../../shared.dart';
+
+class _GasPrintReceiptButtonState extends State<GasPrintReceiptButton> {
+  Future<void> _print() async {
+    try {
+      final success = await _printer.print(widget.sale);
+
+      if (!mounted) return;
+      Navigator.of(context).pop(); // Close overlay
+
+      if (success) {
+        widget.onPrintSuccess?.call();
+        NotificationService.showSuccess(context, 'Reçu imprimé avec succès');
+      } else {
+        widget.onPrintError?.call('Erreur lors de l\'impression');
+        NotificationService.showError(context, 'Erreur lors de l\'impression. Vérifiez l\'imprimante.');
+      }
+    } catch (e) {
+      if (mounted) {
+        Navigator.of(context).pop(); // Close overlay on error
+      }
+      if (!mounted) return;
+      widget.onPrintError?.call(e.toString());
+      NotificationService.showError(context, '$e');
+    } finally {
+      if (mounted) {
+        setState(() => _isPrinting = false);
+      }
+    }
+  }
+}
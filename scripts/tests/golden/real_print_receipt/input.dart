@@ -0,0 +1,50 @@
+// Extrait de lib/features/gaz/presentation/widgets/gas_print_receipt_button.dart
+import 'package:flutter/material.dart';
+
+class _GasPrintReceiptButtonState extends State<GasPrintReceiptButton> {
+  Future<void> _print() async {
+    try {
+      final success = await _printer.print(widget.sale);
+
+      if (!mounted) return;
+      Navigator.of(context).pop(); // Close overlay
+
+      if (success) {
+        widget.onPrintSuccess?.call();
+        ScaffoldMessenger.of(context).showSnackBar(
+          const SnackBar(
+            content: Text('Reçu imprimé avec succès'),
+            backgroundColor: Colors.green,
+            duration: Duration(seconds: 2),
+          ),
+        );
+      } else {
+        widget.onPrintError?.call('Erreur lors de l\'impression');
+        ScaffoldMessenger.of(context).showSnackBar(
+          const SnackBar(
+            content: Text('Erreur lors de l\'impression. Vérifiez l\'imprimante.'),
+            backgroundColor: Colors.red,
+            duration: Duration(seconds: 2),
+          ),
+        );
+      }
+    } catch (e) {
+      if (mounted) {
+        Navigator.of(context).pop(); // Close overlay on error
+      }
+      if (!mounted) return;
+      widget.onPrintError?.call(e.toString());
+      ScaffoldMessenger.of(context).showSnackBar(
+        SnackBar(
+          content: Text('Erreur: $e'),
+          backgroundColor: Colors.red,
+          duration: const Duration(seconds: 2),
+        ),
+      );
+    } finally {
+      if (mounted) {
+        setState(() => _isPrinting = false);
+      }
+    }
+  }
+}
@@ -0,0 +1,28 @@
+// Extrait de lib/features/immobilier/presentation/widgets/payments/rent_matrix_view.dart
+import 'package:flutter/material.dart';
+import 'package:url_launcher/url_launcher.dart';
+import '../../shared.dart';
+
+class RentMatrixView extends StatelessWidget {
+  Future<void> _sendReminder(BuildContext context, String whatsappUrl) async {
+    // For now, we use a generic share or whatsapp link if phone is known
+    // String? phone = entry.contract.tenant?.phone;
+    // ...
+
+    try {
+      final uri = Uri.parse(whatsappUrl);
+      if (await canLaunchUrl(uri)) {
+        await launchUrl(uri);
+      } else {
+        // Fallback or show error
+        if (context.mounted) {
+          NotificationService.showInfo(context, 'Impossible de lancer WhatsApp. Vérifiez s\'il est installé.');
+        }
+      }
+    } catch (e) {
+      if (context.mounted) {
+        NotificationService.showError(context, '$e');
+      }
+    }
+  }
+}
@@ -0,0 +1,34 @@
+// Extrait de lib/features/eau_minerale/presentation/screens/sections/sales_screen.dart
+// Receveur local : aucune implémentation ne doit y toucher.
+import 'package:flutter/material.dart';
+import 'package:flutter_riverpod/flutter_riverpod.dart';
+
+class SalesScreen extends ConsumerWidget {
+  void _confirmVoid(BuildContext context, WidgetRef ref, Sale sale) {
+    showDialog<void>(
+      context: context,
+      builder: (dialogContext) => ConfirmDialog(
+        confirmLabel: 'Annuler la vente',
+        confirmColor: Theme.of(context).colorScheme.error,
+        onConfirm: () async {
+          final scaffoldMessenger = ScaffoldMessenger.of(context);
+          try {
+            final userId = ref.read(currentUserIdProvider);
+            await ref.read(salesControllerProvider).voidSale(sale.id, userId);
+
+            scaffoldMessenger.showSnackBar(
+              const SnackBar(content: Text('Vente annulée avec succès')),
+            );
+
+            // Rafraîchir les données
+            ref.invalidate(salesStateProvider);
+          } catch (e) {
+            scaffoldMessenger.showSnackBar(
+              SnackBar(content: Text('Erreur lors de l\'annulation : $e')),
+            );
+          }
+        },
+      ),
+    );
+  }
+}
@@ -0,0 +1,32 @@
+// Extrait de lib/features/gaz/presentation/widgets/gas_sale_form/tour_wholesaler_selector_widget.dart
+import 'package:flutter/material.dart';
+import 'package:flutter_riverpod/flutter_riverpod.dart';
+import '../../shared.dart';
+
+class _TourWholesalerSelectorWidgetState extends ConsumerState<TourWholesalerSelectorWidget> {
+  Widget _buildAddButton(ThemeData theme) {
+    return FilledButton(
+      onPressed: () async {
+        final name = _wholesalerNameController.text.trim();
+        if (name.isEmpty) {
+          NotificationService.showInfo(context, 'Le nom du grossiste est requis');
+          return;
+        }
+
+        try {
+          // Enregistrer formellement le grossiste
+          await ref.read(wholesalerServiceProvider).registerWholesaler(_draft(name));
+
+          if (mounted) {
+            NotificationService.showInfo(context, 'Grossiste "$name" ajouté avec succès');
+          }
+        } catch (e) {
+          if (mounted) {
+            NotificationService.showError(context, 'Erreur lors de l\'ajout: $e');
+          }
+        }
+      },
+      child: const Text('Ajouter'),
+    );
+  }
+}
@@ -0,0 +1,17 @@
+// Extrait de lib/features/boutique/presentation/screens/sections/widgets/treasury_operation_dialog.dart
+import 'package:flutter/material.dart';
+import 'package:flutter_riverpod/flutter_riverpod.dart';
+import '../../shared.dart';
+
+class _TreasuryOperationDialogState extends ConsumerState<TreasuryOperationDialog> {
+  Future<void> _submit() async {
+    final operation = _buildOperation();
+
+    try {
+      await ref.read(storeControllerProvider).recordTreasuryOperation(operation);
+      if (mounted) Navigator.pop(context);
+    } catch (e) {
+      if (mounted) NotificationService.showError(context, 'Erreur: $e');
+    }
+  }
+}
@@ -0,0 +1,29 @@
+"""
+Utilitaires communs aux tests des scripts de migration.
+"""
+
+from pathlib import Path
+
+from codemod import engine
+from codemod.golden import IMPLEMENTATIONS
+from codemod.runner import run
+
+
+def rules(implementation='final'):
+    """Règles d'un script de migration."""
+    return engine.load_rules([IMPLEMENTATIONS[implementation]])
+
+
+def dart_files(root):
+    """Fichiers Dart de root/lib, triés."""
+    return sorted((Path(root) / 'lib').rglob('*.dart'))
+
+
+def snapshot(root):
+    """{chemin relatif: contenu en octets} des fichiers de root/lib."""
+    return {str(path.relative_to(root)): path.read_bytes() for path in dart_files(root)}
+
+
+def migrate(root, implementation='final', **kwargs):
+    """Exécute runner.run() sur root/lib ; retourne la liste des FileResult."""
+    return list(run(rules(implementation), dart_files(root), root, **kwargs))
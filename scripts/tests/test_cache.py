@@ -0,0 +1,120 @@
+"""
+Cache incrémental (codemod.cache) : invalidation par mtime, taille,
+empreinte du contenu et version du jeu de règles.
+"""
+
+import os
+
+import pytest
+
+from codemod import engine, stream
+from codemod.cache import CACHE_FILE, RunCache, file_state, ruleset_name, ruleset_version
+from codemod.engine import RunOptions
+from codemod.results import MIGRATED, SKIPPED, UNTOUCHED
+
+from helpers import dart_files, migrate, rules
+
+
+def _cache(root, implementation='final', version=None):
+    found = rules(implementation)
+    return RunCache(root / CACHE_FILE, ruleset_name(found), version or ruleset_version(found)).load()
+
+
+def _run_and_save(root, implementation='final'):
+    cache = _cache(root, implementation)
+    results = migrate(root, implementation, cache=cache)
+    cache.save()
+    return results
+
+
+def test_lookup_requires_same_mtime_and_size(tmp_path):
+    path = tmp_path / 'a.dart'
+    path.write_text('void main() {}\n', encoding='utf-8')
+    cache = RunCache(tmp_path / CACHE_FILE, 'demo', 'v1')
+    state = file_state(path)
+    cache.update('a.dart', dict(state, sha256='x', status=SKIPPED))
+    assert cache.lookup('a.dart', state) is not None
+    assert cache.lookup('a.dart', dict(state, mtime_ns=state['mtime_ns'] + 1)) is None
+    assert cache.lookup('a.dart', dict(state, size=state['size'] + 1)) is None
+    assert cache.hits == 1
+
+
+def test_second_run_reads_nothing(project):
+    _run_and_save(project)
+    results = migrate(project, cache=_cache(project))
+    assert results and all(result.cached for result in results)
+    assert sum(result.bytes_scanned for result in results) == 0
+
+
+def test_touched_file_is_hashed_but_not_rewritten(project):
+    _run_and_save(project)
+    target = next(path for path, result in zip(dart_files(project), migrate(project, cache=_cache(project)))
+                  if result.status == UNTOUCHED)
+    stat = target.stat()
+    os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    cache = _cache(project)
+    results = {result.path: result for result in migrate(project, cache=cache)}
+    result = results[str(target)]
+    # mtime changé, contenu identique : relu pour l'empreinte, statut repris du cache.
+    assert result.cached and result.status == UNTOUCHED
+    assert result.bytes_scanned == target.stat().st_size
+    assert result.bytes_decoded == 0
+
+
+def test_changed_content_is_migrated_again(project):
+    _run_and_save(project)
+    target = dart_files(project)[0]
+    target.write_text(target.read_text(encoding='utf-8') + """
+void notify(BuildContext context) {
+  ScaffoldMessenger.of(context).showSnackBar(
+    const SnackBar(content: Text('Ajouté'), backgroundColor: Colors.green),
+  );
+}
+""", encoding='utf-8')
+    results = {result.path: result for result in migrate(project, cache=_cache(project))}
+    assert not results[str(target)].cached
+    assert "NotificationService.showSuccess(context, 'Ajouté');" in target.read_text(encoding='utf-8')
+
+
+def test_other_ruleset_version_ignores_entries(project):
+    _run_and_save(project)
+    assert _cache(project).entries
+    assert _cache(project, version='autre-version').entries == {}
+    results = migrate(project, cache=_cache(project, version='autre-version'))
+    assert not any(result.cached for result in results)
+
+
+def test_rulesets_are_stored_side_by_side(project):
+    _run_and_save(project, 'final')
+    _run_and_save(project, 'v2')
+    assert _cache(project, 'final').entries and _cache(project, 'v2').entries
+
+
+def test_ruleset_version_follows_rule_sources():
+    assert ruleset_version(rules('final')) == ruleset_version(rules('final'))
+    assert ruleset_version(rules('final')) != ruleset_version(rules('v2'))
+
+
+@pytest.mark.parametrize('stream_threshold', [None, 1])
+def test_no_cache_computes_no_hash(project, monkeypatch, stream_threshold):
+    hashed = []
+
+    def counting(func):
+        def wrapper(*args):
+            hashed.append(func.__name__)
+            return func(*args)
+        return wrapper
+
+    monkeypatch.setattr(engine, 'buffer_hash', counting(engine.buffer_hash))
+    monkeypatch.setattr(engine, 'content_hash', counting(engine.content_hash))
+    monkeypatch.setattr(stream.OutputDigest, 'hexdigest', counting(stream.OutputDigest.hexdigest))
+    options = RunOptions(stream_threshold=stream_threshold)
+    results = migrate(project, options=options)
+    assert any(result.status == MIGRATED for result in results)
+    assert hashed == []
+    assert all(result.cache_entry is None for result in results)
+
+    # Avec un cache, chaque fichier relu est haché.
+    migrate(project, options=options, cache=_cache(project))
+    assert hashed
@@ -0,0 +1,19 @@
+"""
+Corpus synthétique (codemod.corpus) : statistiques d'un corpus réutilisé.
+"""
+
+from codemod.corpus import corpus_stats, generate_corpus
+
+
+def test_stats_of_a_reused_corpus_match_generation(tmp_path):
+    stats = generate_corpus(tmp_path, files=80, seed=1, hit_ratio=0.5, pathological_ratio=0.3)
+    assert stats['files_with_snackbar'] and 'pathological' in stats['shapes']
+    assert corpus_stats(tmp_path) == stats
+
+
+def test_stats_count_unknown_snackbar_calls(tmp_path):
+    generate_corpus(tmp_path, files=5, seed=2, hit_ratio=0.0)
+    path = tmp_path / 'lib' / 'features' / 'other.dart'
+    path.write_text('void f() { messenger.showSnackBar(snackBar); }\n', encoding='utf-8')
+    stats = corpus_stats(tmp_path)
+    assert (stats['files'], stats['files_with_snackbar'], stats['shapes']) == (6, 1, {})
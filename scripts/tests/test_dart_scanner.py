@@ -0,0 +1,123 @@
+"""
+Scanner Dart (codemod.dart_scanner) : chaînes, commentaires et délimiteurs,
+découpage des appels showSnackBar et de leurs arguments.
+"""
+
+import pytest
+
+from codemod.dart_scanner import DartScanner, find_snackbar_calls, named_arguments, parse_call
+
+
+def _skipped(source):
+    scanner = DartScanner(source)
+    return [source[start:end] for start, end in sorted(scanner.skips.items())]
+
+
+@pytest.mark.parametrize('source, skipped', [
+    ("f('a(b', \"c)\");", ["'a(b'", '"c)"']),
+    # Interpolation : la chaîne interne et l'accolade ne ferment rien.
+    ("f('x ${g('}')} y', 1);", ["'x ${g('}')} y'"]),
+    ("f('${'${a}'}');", ["'${'${a}'}'"]),
+    # Chaîne raw : le \ n'échappe pas le délimiteur.
+    ("f(r'\\', 'b');", ["r'\\'", "'b'"]),
+    ("f('''a\n'b' (''', x);", ["'''a\n'b' ('''"]),
+    # Commentaires /* */ imbriqués.
+    ('f(/* a /* b ) */ c ( */ x); // )', ['/* a /* b ) */ c ( */', '// )']),
+])
+def test_strings_and_comments_are_skipped(source, skipped):
+    assert _skipped(source) == skipped
+
+
+def test_pairs_ignore_delimiters_in_strings_and_comments():
+    source = "f(a, [b, '(' /* ] */], {c})"
+    scanner = DartScanner(source)
+    assert scanner.closing(1) == len(source) - 1
+    assert source[scanner.closing(source.index('['))] == ']'
+    assert scanner.closing(source.index('{')) == source.index('}')
+
+
+@pytest.mark.parametrize('source', [
+    'f(a, (b);',
+    "f('non terminée);\ng(x)",
+    'f(/* ) jamais fermé',
+])
+def test_unbalanced_input(source):
+    # Pas d'exception ; la parenthèse de f reste sans partenaire.
+    scanner = DartScanner(source)
+    assert scanner.closing(1) == -1
+    assert list(find_snackbar_calls(source, scanner)) == []
+
+
+def test_stray_closer_is_ignored():
+    source = 'f(a]);'
+    assert DartScanner(source).closing(1) == source.index(')')
+
+
+def test_unterminated_single_quote_string_stops_at_end_of_line():
+    source = "f('abc\ng(x);"
+    assert _skipped(source) == ["'abc"]
+    assert DartScanner(source).closing(source.index('g') + 1) == source.index(')')
+
+
+def test_named_arguments():
+    source = "SnackBar(content: Text('a, b'), // c: d\n  backgroundColor: x ? y : z, 42,)"
+    scanner = DartScanner(source)
+    call = parse_call(scanner, 0, len(source))
+    arguments = {name: source[start:end] for name, (start, end) in named_arguments(scanner, call).items()}
+    assert arguments == {
+        'content': "Text('a, b')",
+        # Le commentaire précède le nom : l'argument n'est plus reconnu comme nommé.
+        0: '// c: d\n  backgroundColor: x ? y : z',
+        1: '42',
+    }
+
+
+@pytest.mark.parametrize('expression, parts', [
+    ('ok ? Colors.green : Colors.red', ('ok', 'Colors.green', 'Colors.red')),
+    ('a ?? b ? f(c ? d : e) : g', ('a ?? b', 'f(c ? d : e)', 'g')),
+    ('a ? b ? c : d : e', ('a', 'b ? c : d', 'e')),
+    ("x?.y ? '?' : z?[0]", ('x?.y', "'?'", 'z?[0]')),
+    ('Colors.red', None),
+    ('a ?? b', None),
+])
+def test_split_conditional(expression, parts):
+    scanner = DartScanner(expression)
+    spans = scanner.split_conditional(0, len(expression))
+    if parts is None:
+        assert spans is None
+    else:
+        assert tuple(expression[start:end] for start, end in spans) == parts
+
+
+@pytest.mark.parametrize('before, statement', [
+    ('void f() {\n  ', True),
+    ('a();\n  // commentaire\n  /* autre */ ', True),
+    ('', True),
+    ('void f() => ', False),
+    ('g(', False),
+])
+def test_snackbar_call_statement(before, statement):
+    source = before + 'ScaffoldMessenger.of(context).showSnackBar(const SnackBar(content: Text(m)));'
+    [call] = find_snackbar_calls(source)
+    assert call.statement is statement
+
+
+def test_find_snackbar_calls():
+    source = (
+        "// ScaffoldMessenger.of(context).showSnackBar(x);\n"
+        "final s = 'ScaffoldMessenger.of(context).showSnackBar(';\n"
+        "ScaffoldMessenger.of(context).showSnackBar(\n"
+        "  SnackBar(content: Text('Erreur: ${e.toString()}'), backgroundColor: ok ? Colors.green : Colors.red),\n"
+        ");\n"
+        "ScaffoldMessenger.of(context).showSnackBar(buildSnackBar())\n"
+        "ScaffoldMessenger.of(context).showSnackBar(\n"
+    )
+    first, second = find_snackbar_calls(source)
+    assert first.block.startswith('ScaffoldMessenger') and first.block.endswith(');')
+    assert first.text == "'Erreur: ${e.toString()}'"
+    assert first.background == 'ok ? Colors.green : Colors.red'
+    assert first.condition == ('ok', 'Colors.green', 'Colors.red')
+    # Argument qui n'est pas un SnackBar(...) littéral ; pas de point-virgule.
+    assert second.snackbar is None and second.text is None
+    assert second.block.endswith('buildSnackBar())')
+    assert not second.statement
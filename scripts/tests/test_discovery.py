@@ -0,0 +1,154 @@
+"""
+Découverte des fichiers (codemod.discovery) : globs, élagage, .gitignore
+(négation, motifs de répertoire) et --changed-since.
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from codemod.discovery import Discovery, DiscoveryError, compile_glob
+
+TREE = [
+    'lib/app/app.dart',
+    'lib/core/api.dart',
+    'lib/core/api.g.dart',
+    'lib/core/keep.g.dart',
+    'lib/features/a/a_screen.dart',
+    'lib/features/a/a_screen.freezed.dart',
+    'lib/features/a/notes.txt',
+    'lib/features/a/build/out.dart',
+    'lib/features/a/generated/intl.dart',
+    'lib/features/a/.hidden/x.dart',
+    'lib/features/b/legacy_screen.dart',
+    'lib/features/b/legacy_screens/old.dart',
+    'lib/features/b/local.dart',
+    'lib/features/b/deep/local.dart',
+    'lib/features/vendor/lib.dart',
+    'lib/features/vendor/keep.dart',
+    'lib/shared/utils/notification_service.dart',
+    'lib/shared/widgets/button.dart',
+    'test/widget_test.dart',
+]
+
+
+def _tree(root, paths=TREE):
+    for relative in paths:
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f'// {relative}\n', encoding='utf-8')
+    (root / '.gitignore').write_text(
+        '# Code généré\n*.g.dart\n!keep.g.dart\nlegacy*/\nvendor/\n!vendor/keep.dart\n',
+        encoding='utf-8')
+    (root / 'lib' / 'features' / 'b' / '.gitignore').write_text('/local.dart\n', encoding='utf-8')
+    return root
+
+
+def _relative(root, paths):
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+@pytest.mark.parametrize('pattern, path, matches', [
+    ('**/*.dart', 'lib/a.dart', True),
+    ('**/*.dart', 'a.dart', True),
+    ('lib/**/*.dart', 'lib/x/y/a.dart', True),
+    ('lib/*.dart', 'lib/x/a.dart', False),
+    ('lib/?.dart', 'lib/a.dart', True),
+    ('lib/?.dart', 'lib/ab.dart', False),
+    ('lib/[!a].dart', 'lib/a.dart', False),
+    ('lib/[!a].dart', 'lib/b.dart', True),
+    ('/lib/*.dart', 'lib/a.dart', True),
+    ('**/*.g.dart', 'lib/core/api.g.dart', True),
+])
+def test_glob(pattern, path, matches):
+    assert bool(compile_glob(pattern).match(path)) is matches
+
+
+def test_default_selection(tmp_path):
+    # Racines dans l'ordre par défaut, chemins triés dans chaque racine.
+    root = _tree(tmp_path)
+    assert _relative(root, Discovery(root)) == [
+        'lib/features/a/a_screen.dart',
+        'lib/features/a/a_screen.freezed.dart',
+        'lib/features/b/deep/local.dart',
+        'lib/features/b/legacy_screen.dart',
+        'lib/shared/widgets/button.dart',
+        'lib/core/api.dart',
+        'lib/core/keep.g.dart',
+        'lib/app/app.dart',
+    ]
+
+
+def test_gitignore_negation_and_directory_rules(tmp_path):
+    root = _tree(tmp_path)
+    found = set(_relative(root, Discovery(root)))
+    # *.g.dart ignoré, sauf keep.g.dart réinclus par !keep.g.dart.
+    assert 'lib/core/api.g.dart' not in found
+    assert 'lib/core/keep.g.dart' in found
+    # legacy*/ ne vise que les répertoires.
+    assert 'lib/features/b/legacy_screens/old.dart' not in found
+    assert 'lib/features/b/legacy_screen.dart' in found
+    # Un fichier d'un répertoire ignoré ne peut pas être réinclus.
+    assert 'lib/features/vendor/keep.dart' not in found
+    # /local.dart n'est ancré qu'au répertoire de son .gitignore.
+    assert 'lib/features/b/local.dart' not in found
+    assert 'lib/features/b/deep/local.dart' in found
+
+
+def test_accepts_agrees_with_the_walk(tmp_path):
+    root = _tree(tmp_path)
+    for gitignore in (True, False):
+        finder = Discovery(root, roots=['lib'], gitignore=gitignore)
+        found = set(finder)
+        for relative in TREE:
+            path = root / relative
+            assert finder.accepts(path) == (path in found), (relative, gitignore)
+
+
+def test_pruning_globs_and_protected_file(tmp_path):
+    root = _tree(tmp_path)
+    found = _relative(root, Discovery(root, roots=['lib', 'test'], gitignore=False,
+                                      excludes=['**/*.freezed.dart']))
+    assert 'lib/features/a/build/out.dart' not in found
+    assert 'lib/features/a/generated/intl.dart' not in found
+    assert 'lib/features/a/.hidden/x.dart' not in found
+    assert 'lib/features/a/a_screen.freezed.dart' not in found
+    assert 'lib/shared/utils/notification_service.dart' not in found
+    assert 'lib/core/api.g.dart' in found
+    assert 'test/widget_test.dart' in found
+
+    only_core = _relative(root, Discovery(root, roots=['lib'], includes=['lib/core/*.dart']))
+    assert only_core == ['lib/core/api.dart', 'lib/core/keep.g.dart']
+
+
+def _git(root, *args):
+    subprocess.run(['git', '-C', str(root), '-c', 'user.name=test', '-c', 'user.email=test@example.com',
+                    *args], check=True, capture_output=True)
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git absent')
+def test_changed_since(tmp_path):
+    root = _tree(tmp_path)
+    _git(root, 'init', '-q')
+    _git(root, 'add', '-A')
+    _git(root, 'commit', '-q', '-m', 'init')
+    (root / 'lib/core/api.dart').write_text('// modifié\n', encoding='utf-8')
+    (root / 'lib/app/app.dart').unlink()
+    (root / 'lib/features/a/new_screen.dart').write_text('// nouveau\n', encoding='utf-8')
+    (root / 'lib/core/new.g.dart').write_text('// ignoré\n', encoding='utf-8')
+    (root / 'test/widget_test.dart').write_text('// hors racines\n', encoding='utf-8')
+
+    found = _relative(root, Discovery(root, changed_since='HEAD'))
+    assert found == ['lib/core/api.dart', 'lib/features/a/new_screen.dart']
+
+    with pytest.raises(DiscoveryError):
+        list(Discovery(root, changed_since='no-such-ref'))
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='git absent')
+def test_changed_since_outside_a_repository(tmp_path, monkeypatch):
+    root = _tree(tmp_path)
+    monkeypatch.setenv('GIT_CEILING_DIRECTORIES', str(tmp_path.parent))
+    with pytest.raises(DiscoveryError):
+        list(Discovery(root, changed_since='HEAD'))
@@ -0,0 +1,113 @@
+"""
+Moteur des codemods : contrat des migrate_file() des scripts, règles qui se
+chevauchent et chargement des règles par nom de module.
+"""
+
+import re
+
+import pytest
+
+import migrate_to_notification_service_final as final
+from codemod import engine
+from codemod.results import MIGRATED, SKIPPED, FileResult
+
+SNACKBAR = """import 'package:flutter/material.dart';
+
+void notify(BuildContext context) {
+  ScaffoldMessenger.of(context).showSnackBar(
+    const SnackBar(content: Text('Enregistré'), backgroundColor: Colors.green),
+  );
+}
+"""
+
+
+def _dart_file(tmp_path, content):
+    path = tmp_path / 'lib' / 'features' / 'demo' / 'demo_screen.dart'
+    path.parent.mkdir(parents=True)
+    path.write_text(content, encoding='utf-8')
+    return path
+
+
+def test_script_migrate_file_returns_true_when_migrated(tmp_path):
+    path = _dart_file(tmp_path, SNACKBAR)
+    assert final.migrate_file(str(path), tmp_path) is True
+    content = path.read_text(encoding='utf-8')
+    assert "NotificationService.showSuccess(context, 'Enregistré');" in content
+    assert "import '../../shared.dart';" in content
+
+
+def test_script_migrate_file_returns_false_when_untouched(tmp_path):
+    path = _dart_file(tmp_path, "void main() {}\n")
+    assert final.migrate_file(str(path), tmp_path) is False
+    assert path.read_text(encoding='utf-8') == "void main() {}\n"
+
+
+def test_script_migrate_file_returns_false_on_error(tmp_path, capsys):
+    missing = tmp_path / 'lib' / 'absent.dart'
+    assert final.migrate_file(str(missing), tmp_path) is False
+    assert str(missing) in capsys.readouterr().out
+
+
+def test_migrate_file_result_exposes_file_result(tmp_path):
+    path = _dart_file(tmp_path, SNACKBAR)
+    result = engine.migrate_file_result(str(path), tmp_path, [final.RULE])
+    assert isinstance(result, FileResult)
+    assert result.status == MIGRATED
+    assert engine.migrate_file_result(str(path), tmp_path, [final.RULE]).status == SKIPPED
+
+
+def _rule(name, pattern):
+    """Règle jouet : chaque correspondance devient [nom:texte], étiquetée par son premier mot."""
+    compiled = re.compile(pattern)
+    return engine.Rule(
+        name=name,
+        prefilter='(',
+        matcher=lambda content: ((m.start(), m.end(), m.group(0)) for m in compiled.finditer(content)),
+        rewriter=lambda text: f'[{name}:{text}]',
+        labeler=lambda text: text.split('(')[0],
+    )
+
+
+OVERLAP = 'foo(1) bar(2) baz(3)\n'
+FIRST = _rule('first', r'ba[rz]\(\d\)')
+SECOND = _rule('second', r'foo\(\d\) bar|baz\(\d\)')
+
+
+@pytest.mark.parametrize('rules, expected, rule_counts', [
+    # bar(2) de first chevauche « foo(1) bar » de second, plus à gauche : second l'emporte.
+    # baz(3) : même début, la règle déclarée en premier l'emporte.
+    ([FIRST, SECOND], '[second:foo(1) bar](2) [first:baz(3)]\n', {'second:foo': 1, 'first:baz': 1}),
+    ([SECOND, FIRST], '[second:foo(1) bar](2) [second:baz(3)]\n', {'second:foo': 1, 'second:baz': 1}),
+])
+def test_overlapping_rules(tmp_path, rules, expected, rule_counts):
+    new_content, edits = engine.apply_rules(OVERLAP, rules)
+    assert new_content == expected
+    assert [(edit.start, edit.end, edit.label) for edit in edits] == [
+        (0, 10, 'second:foo'), (14, 20, f'{rules[0].name}:baz')]
+
+    path = _dart_file(tmp_path, OVERLAP)
+    result = engine.migrate_file_result(str(path), tmp_path, rules)
+    assert result.status == MIGRATED
+    assert result.rule_counts == rule_counts
+    assert path.read_text(encoding='utf-8') == expected
+
+
+def test_load_rules_by_module_name():
+    # Comme run_codemods.py --rule MODULE : règles dans l'ordre des modules.
+    found = engine.load_rules(['migrate_to_notification_service_final', 'migrate_to_notification_service'])
+    assert [rule.name for rule in found] == ['notification_service_final', 'notification_service_v1']
+    assert found[0] is final.RULE
+    with pytest.raises(ValueError, match='codemod.report'):
+        engine.load_rules(['codemod.report'])
+    with pytest.raises(ImportError):
+        engine.load_rules(['migrate_to_nowhere'])
+
+
+def test_first_loaded_script_wins_on_the_same_site(tmp_path):
+    # Sans const, le pattern 1 de v2 reconnaît aussi l'appel.
+    path = _dart_file(tmp_path, SNACKBAR.replace('const SnackBar', 'SnackBar'))
+    found = engine.load_rules(['migrate_to_notification_service_v2', 'migrate_to_notification_service_final'])
+    result = engine.migrate_file_result(str(path), tmp_path, found)
+    assert result.status == MIGRATED
+    assert list(result.rule_counts) == ['notification_service_v2:pattern1']
+    assert "NotificationService.showSuccess(context, 'Enregistré');" in path.read_text(encoding='utf-8')
@@ -0,0 +1,71 @@
+"""
+Corpus doré : v1, v2 et la version finale face à la migration attendue.
+
+Chaque implémentation doit reproduire expected.dart, ou sa sortie figée
+<implémentation>.dart quand elle s'en écarte (divergence connue). Une
+différence fait échouer le test avec le diff. Après un changement voulu des
+règles, pytest --golden-update refige les sorties. expected.dart ne se modifie
+qu'à la main.
+
+S'y ajoutent des contrôles croisés : chaque migration est idempotente, la
+migration en mémoire du corpus donne le fichier qu'écrit le moteur, la
+référence reste bien formée pour le contrôle local de --verify, et l'index
+des sites (snackbar_sites.py) compte autant de sites « pending » que la
+version finale en réécrit.
+
+Usage: python3 -m pytest scripts/tests [--golden-update] [--golden-repeat N]
+"""
+
+import pytest
+
+from codemod import engine, golden, sites
+from codemod.prefilter import decode
+from codemod.verify import check_source
+
+
+def test_output_matches_golden(case, implementation, golden_outputs, golden_dir, request):
+    output = golden_outputs[case.name][implementation]
+    if request.config.getoption('--golden-update'):
+        golden.pin(golden_dir, case, implementation, output)
+        return
+    wanted = case.wanted(implementation)
+    label = f'{implementation}.dart' if implementation in case.pinned else f'{golden.REFERENCE}.dart'
+    if output != wanted:
+        pytest.fail(f"sortie de {implementation} différente de {label} (--golden-update pour la figer) :\n"
+                    + golden.unified(wanted, output, case.name, label), pytrace=False)
+
+
+def test_pinned_outputs_diverge(case):
+    # Une sortie figée identique à la référence n'a plus lieu d'être.
+    stale = [name for name, output in case.pinned.items() if output == case.expected]
+    assert not stale, f"{case.name}: sorties figées identiques à la référence : {', '.join(stale)}"
+
+
+def test_migration_is_idempotent(case, implementation, golden_rules, golden_outputs, golden_dir):
+    output = golden_outputs[case.name][implementation]
+    again, _ = golden.migrate(golden_rules[implementation], case._replace(source=output), golden_dir)
+    assert again == output, golden.unified(output, again, case.name, f'{implementation} (1er passage)')
+
+
+def test_output_matches_written_file(case, implementation, golden_rules, golden_outputs, tmp_path):
+    # Même chemin que le cas, mais dans un vrai fichier traité par process_file().
+    path = golden.virtual_path(tmp_path, case.name)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(case.source.encode('utf-8'))
+    engine.migrate_file_result(str(path), tmp_path, golden_rules[implementation])
+    written = decode(path.read_bytes())
+    assert written == golden_outputs[case.name][implementation]
+
+
+def test_reference_is_well_formed(case):
+    # La migration attendue ne casse pas un fichier que le contrôle local accepte.
+    if check_source(case.source):
+        return
+    assert check_source(case.expected) == []
+
+
+def test_site_index_agrees_with_final(case, golden_rules, golden_dir):
+    # Les sites « pending » de l'index (codemod.sites) sont ceux que la version finale réécrit.
+    pending = [site for site in sites.find_sites(case.source) if site.reason == sites.PENDING]
+    _, edits = golden.migrate(golden_rules['final'], case, golden_dir)
+    assert len(pending) == len(edits)
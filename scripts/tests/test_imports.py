@@ -0,0 +1,67 @@
+"""
+Ajout des imports (codemod.imports) : directives part et part of.
+"""
+
+import pytest
+
+from codemod import imports
+from codemod.engine import RunOptions
+from codemod.results import MIGRATED
+
+from helpers import migrate
+
+PART = """part of '../demo_screen.dart';
+
+void notify(BuildContext context) {
+  ScaffoldMessenger.of(context).showSnackBar(
+    const SnackBar(content: Text('Enregistré'), backgroundColor: Colors.green),
+  );
+}
+"""
+
+
+def test_part_of_names_the_library():
+    assert imports.part_of(PART) == '../demo_screen.dart'
+    assert imports.part_of('// En-tête\npart of demo.screen;\n\nclass A {}\n') == 'demo.screen'
+    assert imports.part_of("library demo;\n\npart 'a.dart';\n") is None
+
+
+def test_part_file_gets_no_import(tmp_path):
+    path = tmp_path / 'lib' / 'demo' / 'parts' / 'notify.dart'
+    assert imports.add_imports(PART, str(path), tmp_path, ['shared.dart']) == PART
+
+
+@pytest.mark.parametrize('content, expected', [
+    ("import 'a.dart';\n\npart 'b.dart';\n",
+     "import 'a.dart';\nimport '../shared.dart';\n\npart 'b.dart';\n"),
+    ("library demo;\n\npart 'b.dart';\n",
+     "library demo;\nimport '../shared.dart';\n\npart 'b.dart';\n"),
+    ("part 'b.dart';\n\nclass A {}\n",
+     "import '../shared.dart';\npart 'b.dart';\n\nclass A {}\n"),
+    ("partition();\n", "import '../shared.dart';\npartition();\n"),
+    # Déclarations dont le nom commence par un mot-clé de directive.
+    ("import 'a.dart';\n\nimportCsv(BuildContext context) {\n  final a = 'x';\n}\n",
+     "import 'a.dart';\nimport '../shared.dart';\n\nimportCsv(BuildContext context) {\n"
+     "  final a = 'x';\n}\n"),
+    ("library_helpers() {\n  final a = 'x';\n}\n",
+     "import '../shared.dart';\nlibrary_helpers() {\n  final a = 'x';\n}\n"),
+    ("export 'a.dart';\nexporter() => 1;\n",
+     "export 'a.dart';\nimport '../shared.dart';\nexporter() => 1;\n"),
+])
+def test_imports_go_before_part_directives(tmp_path, content, expected):
+    path = tmp_path / 'lib' / 'demo' / 'screen.dart'
+    assert imports.add_imports(content, str(path), tmp_path, ['shared.dart']) == expected
+
+
+@pytest.mark.parametrize('stream_threshold', [None, 1], ids=['memory', 'stream'])
+def test_migrated_part_file_is_reported(tmp_path, stream_threshold):
+    path = tmp_path / 'lib' / 'demo' / 'parts' / 'notify.dart'
+    path.parent.mkdir(parents=True)
+    path.write_text(PART, encoding='utf-8')
+    [result] = migrate(tmp_path, options=RunOptions(stream_threshold=stream_threshold))
+    assert result.status == MIGRATED
+    assert result.part_of == ('../demo_screen.dart', ['shared.dart'])
+    assert result.streamed == (stream_threshold is not None)
+    content = path.read_text(encoding='utf-8')
+    assert 'NotificationService.showSuccess' in content
+    assert 'import' not in content
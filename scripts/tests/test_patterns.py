@@ -0,0 +1,63 @@
+"""
+Vérification des patterns de règles (codemod.patterns) au chargement.
+"""
+
+import re
+
+import pytest
+
+from codemod import notification_patterns
+from codemod.patterns import PatternError, compile_patterns, literal_prefix
+
+ANCHOR = notification_patterns.ANCHOR
+SOURCE = re.escape(ANCHOR)
+
+
+@pytest.mark.parametrize('source, prefix', [
+    (r'abc\.d+', 'abc.'),
+    (r'ab?c', 'a'),
+    (r'(?:ab)c', 'abc'),
+    (r'(ab)*c', ''),
+    (r'ab|ac', 'a'),
+    (r'abc|Text\(', ''),
+    (r'(?i:ab)c', ''),
+    (r'\d', ''),
+])
+def test_literal_prefix(source, prefix):
+    assert literal_prefix(source) == prefix
+
+
+def test_rule_patterns_compile():
+    assert notification_patterns.V1_PATTERNS
+    assert notification_patterns.V2_PATTERNS
+
+
+def test_anchored_pattern_is_accepted():
+    [(pattern, replacement)] = compile_patterns([(SOURCE + r'\((.*?)\);', r'\1')], anchor=ANCHOR)
+    assert pattern.match(ANCHOR + '(x);').expand(replacement) == 'x'
+
+
+@pytest.mark.parametrize('source, flags, message', [
+    (SOURCE + r'|Text\(', 0, 'ne commence pas par le littéral'),
+    (r'(?:' + SOURCE + r'|Text\()', 0, 'ne commence pas par le littéral'),
+    (r'Text\(' + SOURCE, 0, 'ne commence pas par le littéral'),
+    (SOURCE, re.IGNORECASE, 'ignore la casse'),
+    (r'(?i)' + SOURCE, 0, 'ignore la casse'),
+    (r'(?i:' + SOURCE + r')', 0, 'ne commence pas par le littéral'),
+    (SOURCE + r'(', 0, 'ne compile pas'),
+])
+def test_invalid_anchored_pattern_is_rejected(source, flags, message):
+    with pytest.raises(PatternError, match=message):
+        compile_patterns([(source, '')], flags, ANCHOR)
+
+
+def test_pattern_without_literal_prefix_is_rejected():
+    with pytest.raises(PatternError, match='ne commence pas par un littéral'):
+        compile_patterns([(r'\w+', '')])
+
+
+def test_replacement_is_checked():
+    with pytest.raises(PatternError, match='cite le groupe 2'):
+        compile_patterns([(r'a(b)', r'\2')])
+    with pytest.raises(PatternError, match='ni gabarit ni callable'):
+        compile_patterns([(r'ab', 3)])
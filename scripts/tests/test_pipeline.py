@@ -0,0 +1,93 @@
+"""
+Modes d'exécution équivalents : série, pool de processus (-j) et pipeline
+asyncio (--async) écrivent les mêmes fichiers et rendent les mêmes statuts.
+"""
+
+import os
+import shutil
+import time
+
+import pytest
+
+from codemod import pipeline
+from codemod.engine import RunOptions
+from codemod.results import MIGRATED
+
+from helpers import dart_files, migrate, rules, snapshot
+
+
+def _outcome(results, root):
+    """{chemin relatif: (statut, compteurs, diff)}, indépendant de l'ordre des résultats."""
+    return {os.path.relpath(result.path, root): (result.status, result.counts, result.diff)
+            for result in results}
+
+
+def _run_async(root, implementation='final', **kwargs):
+    results = []
+    pipeline.run(rules(implementation), dart_files(root), root, results.append, **kwargs)
+    return results
+
+
+@pytest.fixture
+def serial(project, tmp_path_factory):
+    """Copie du projet avant migration et sortie de référence, migrée en série."""
+    pristine = tmp_path_factory.mktemp('pristine')
+    shutil.copytree(project, pristine, dirs_exist_ok=True)
+    results = migrate(project, jobs=1)
+    assert any(result.status == MIGRATED for result in results)
+    return pristine, _outcome(results, project), snapshot(project)
+
+
+def _copy(pristine, tmp_path_factory):
+    root = tmp_path_factory.mktemp('copy')
+    shutil.copytree(pristine, root, dirs_exist_ok=True)
+    return root
+
+
+def test_process_pool_matches_serial(serial, tmp_path_factory):
+    pristine, outcome, tree = serial
+    root = _copy(pristine, tmp_path_factory)
+    results = migrate(root, jobs=4, chunksize=3)
+    assert _outcome(results, root) == outcome
+    assert snapshot(root) == tree
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_async_pipeline_matches_serial(serial, tmp_path_factory, jobs):
+    pristine, outcome, tree = serial
+    root = _copy(pristine, tmp_path_factory)
+    results = _run_async(root, jobs=jobs, queue_size=2, io_workers=2)
+    assert _outcome(results, root) == outcome
+    assert snapshot(root) == tree
+
+
+def test_async_dry_run_diffs_match_serial(project):
+    options = RunOptions(write=False, diff=True)
+    before = snapshot(project)
+    expected = _outcome(migrate(project, options=options), project)
+    assert _outcome(_run_async(project, options=options), project) == expected
+    assert snapshot(project) == before
+
+
+def test_async_results_follow_discovery_order(project, monkeypatch):
+    # Le premier fichier termine en dernier : son résultat sort quand même en tête.
+    paths = dart_files(project)
+    read = pipeline._read
+
+    def slow_first(path, stream_threshold):
+        if path == paths[0]:
+            time.sleep(0.2)
+        return read(path, stream_threshold)
+
+    monkeypatch.setattr(pipeline, '_read', slow_first)
+    results = _run_async(project, options=RunOptions(write=False, diff=True), io_workers=4)
+    assert [result.path for result in results] == [str(path) for path in paths]
+
+
+def test_async_failure_leaves_no_temporary_files(project):
+    def stop(result):
+        raise RuntimeError('arrêt')
+
+    with pytest.raises(RuntimeError):
+        pipeline.run(rules(), dart_files(project), project, stop)
+    assert not [path for path in (project / 'lib').rglob('*') if path.name.endswith('.codemod-tmp')]
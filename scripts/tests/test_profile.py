@@ -0,0 +1,84 @@
+"""
+Profilage (codemod.profile) : sondes des patterns et rapport JSON de --profile.
+"""
+
+import re
+import sys
+from argparse import Namespace
+
+from codemod import profile
+from codemod.engine import RunOptions
+from codemod.runner import PROFILE_FILE, build_parser, profile_path
+
+from helpers import migrate, rules
+
+
+def _measure(call):
+    file_profile = profile.FileProfile()
+    with file_profile.activate():
+        result = call()
+    return result, file_profile.patterns['p']
+
+
+def test_probe_measures_search_finditer_and_sub():
+    probe = profile.PatternProbe(re.compile(r'\d+'), 'p')
+
+    m, stats = _measure(lambda: probe.search('ab 12 cd 345'))
+    assert m.group(0) == '12'
+    assert (stats['attempts'], stats['matches'], stats['bytes']) == (1, 1, 2)
+
+    found, stats = _measure(lambda: [m.group(0) for m in probe.finditer('ab 12 cd 345')])
+    assert found == ['12', '345']
+    assert (stats['attempts'], stats['matches'], stats['bytes']) == (1, 2, 5)
+
+    text, stats = _measure(lambda: probe.sub(r'<\g<0>>', 'ab 12 cd 345'))
+    assert text == 'ab <12> cd <345>'
+    assert (stats['attempts'], stats['matches'], stats['bytes']) == (1, 2, 5)
+
+    text, stats = _measure(lambda: probe.sub(lambda m: m.group(0)[::-1], 'ab 12 cd 345', 1))
+    assert text == 'ab 21 cd 345'
+    assert stats['matches'] == 1
+
+
+def _patterns(rule):
+    """Objets des patterns exposés par rule (Rule.patterns et Rule.probes)."""
+    objects = [compiled for compiled, _ in getattr(sys.modules[rule.module], rule.patterns)]
+    for name in rule.probes:
+        module, attribute = profile._probe_target(rule, name)
+        objects.append(getattr(module, attribute))
+    return objects
+
+
+def test_instrument_restores_the_original_patterns():
+    [rule] = rules('v2')
+    originals = _patterns(rule)
+    assert not any(isinstance(pattern, profile.PatternProbe) for pattern in originals)
+    with profile.instrument([rule]):
+        probes = _patterns(rule)
+        assert all(isinstance(probe, profile.PatternProbe) for probe in probes)
+        with profile.instrument([rule]):
+            assert _patterns(rule) == probes
+        assert _patterns(rule) == probes
+    assert all(a is b for a, b in zip(_patterns(rule), originals))
+
+
+def test_v2_profile_covers_helper_patterns(project):
+    [rule] = rules('v2')
+    originals = _patterns(rule)
+    results = migrate(project, 'v2', options=RunOptions(write=False, profile=True))
+    # Après l'exécution profilée, plus aucune sonde en place.
+    assert all(a is b for a, b in zip(_patterns(rule), originals))
+    patterns = set()
+    for result in results:
+        if result.profile is not None:
+            patterns.update(result.profile['patterns'])
+    assert 'notification_service_v2:CONDITIONAL_PREFIX' in patterns
+    assert 'notification_service_v2:pattern1' in patterns
+
+
+def test_profile_report_defaults_to_project_root(tmp_path):
+    parser = build_parser()
+    assert profile_path(tmp_path, parser.parse_args(['--profile'])) == tmp_path / PROFILE_FILE
+    assert str(profile_path(tmp_path, parser.parse_args(['--profile', 'out.json']))) == 'out.json'
+    assert parser.parse_args([]).profile is None
+    assert profile_path(tmp_path, Namespace(profile='')) == tmp_path / PROFILE_FILE
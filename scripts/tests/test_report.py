@@ -0,0 +1,66 @@
+"""
+Journal des modifications (--changes-log, codemod.report) : une ligne JSON
+par modification, avec son span dans le fichier d'origine.
+"""
+
+import json
+import re
+
+from codemod import engine, runner
+
+from helpers import dart_files, rules, snapshot
+
+# Appel produit par la version finale : showX(...) ou if/else.
+_METHOD = re.compile(r'NotificationService\.show(\w+)\(context, ')
+
+
+def _offset(content, line, column):
+    """Indice dans content de la position (ligne, colonne) comptée à partir de 1."""
+    starts = [0] + [m.end() for m in re.finditer('\n', content)]
+    return starts[line - 1] + column - 1
+
+
+def test_changes_log_records(project, tmp_path_factory):
+    log = tmp_path_factory.mktemp('log') / 'changes.jsonl'
+    before = snapshot(project)
+    found = rules('final')
+    summary = runner.main(found, project, argv=['--changes-log', str(log), '--no-cache'])
+    # Simulation : rien n'est écrit.
+    assert snapshot(project) == before
+
+    records = [json.loads(line) for line in log.read_text(encoding='utf-8').splitlines()]
+    assert records
+    by_file = {}
+    for record in records:
+        by_file.setdefault(record['file'], []).append(record)
+
+    migrated = set()
+    for path in dart_files(project):
+        relative = str(path.relative_to(project))
+        content = path.read_text(encoding='utf-8')
+        expected, edits = engine.apply_rules(content, found)
+        file_records = by_file.pop(relative, [])
+        assert len(file_records) == len(edits), relative
+        if not edits:
+            continue
+        migrated.add(relative)
+        parts, last = [], 0
+        for record in file_records:
+            start = _offset(content, record['start_line'], record['start_column'])
+            end = _offset(content, record['end_line'], record['end_column']) + 1
+            # Le span (fin incluse) couvre exactement le texte d'origine.
+            assert content[start:end] == record['original']
+            assert record['original'].startswith('ScaffoldMessenger.of(context).showSnackBar(')
+            kinds = {kind.lower() for kind in _METHOD.findall(record['replacement'])}
+            label = record['rule'].split(':')
+            assert label[0] == 'notification_service_final'
+            if record['replacement'].startswith('if ('):
+                assert label[1] == 'conditional' and len(kinds) == 2
+            else:
+                assert kinds == {label[1]}
+            parts.append(content[last:start] + record['replacement'])
+            last = end
+        # Les remplacements, appliqués aux spans, redonnent la migration en mémoire.
+        assert ''.join(parts) + content[last:] == expected
+    assert not by_file
+    assert summary.migrated_count == len(migrated)
@@ -0,0 +1,151 @@
+"""
+Index des sites restants (codemod.sites) : mise à jour incrémentale de
+.codemod_index.json et filtres de query().
+"""
+
+import os
+
+from codemod import sites
+from codemod.discovery import compile_glob
+
+GAZ = """void gaz(BuildContext context) {
+  ScaffoldMessenger.of(context).showSnackBar(
+    SnackBar(content: Text('Échec'), backgroundColor: Colors.red),
+  );
+  ScaffoldMessenger.of(context).showSnackBar(
+    SnackBar(content: Text('OK'), backgroundColor: Colors.green, action: undo),
+  );
+}
+"""
+ELEC = """void elec(BuildContext context, ScaffoldMessengerState messenger) {
+  ScaffoldMessenger.of(context).showSnackBar(const SnackBar(content: Text('Info')));
+  messenger.showSnackBar(const SnackBar(content: Text('Info')));
+}
+"""
+TREE = {
+    'lib/features/gaz/gaz_screen.dart': GAZ,
+    'lib/features/elec/elec_screen.dart': ELEC,
+    'lib/features/gaz/deep/plain.dart': 'void plain() {}\n',
+}
+
+
+def _tree(root):
+    for relative, content in TREE.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    return sorted(root.joinpath(relative) for relative in TREE)
+
+
+def _refreshed(root, paths, complete=True):
+    """Index rechargé depuis le disque puis mis à jour, comme snackbar_sites.py."""
+    index = sites.SiteIndex(root / sites.INDEX_FILE).load()
+    index.refresh(paths, root, complete=complete)
+    index.save()
+    return index
+
+
+def _key(relative):
+    return os.path.normpath(relative)
+
+
+def test_find_sites():
+    assert sites.find_sites(GAZ) == [
+        sites.Site(2, 3, 'error', sites.PENDING),
+        sites.Site(5, 3, 'success', sites.ARGUMENTS, 'action'),
+    ]
+    assert [(site.type, site.reason, site.detail) for site in sites.find_sites(ELEC)] == [
+        ('info', sites.PENDING, ''),
+        ('info', sites.RECEIVER, 'messenger'),
+    ]
+    conditional = ("ScaffoldMessenger.of(context).showSnackBar(\n"
+                   "  SnackBar(content: Text(m), backgroundColor: ok ? Colors.green : Colors.red));")
+    assert [(site.type, site.reason) for site in sites.find_sites(
+        f'void a() {{ {conditional} }}\nvoid b() => {conditional}\n')] == [
+        ('conditional', sites.PENDING), ('conditional', sites.EXPRESSION)]
+
+
+def test_unchanged_files_are_not_reread(tmp_path):
+    paths = _tree(tmp_path)
+    index = _refreshed(tmp_path, paths)
+    assert (index.hashed, index.rescanned) == (3, 3)
+    assert (tmp_path / sites.INDEX_FILE).exists()
+
+    index = _refreshed(tmp_path, paths)
+    assert (index.hashed, index.rescanned) == (0, 0)
+    assert len(index.files) == 3
+
+
+def test_same_hash_is_not_rescanned(tmp_path):
+    paths = _tree(tmp_path)
+    gaz = tmp_path / 'lib/features/gaz/gaz_screen.dart'
+    _refreshed(tmp_path, paths)
+    # Nouveau mtime, même contenu : relu et haché, pas réanalysé.
+    stat = gaz.stat()
+    os.utime(gaz, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    index = _refreshed(tmp_path, paths)
+    assert (index.hashed, index.rescanned) == (1, 0)
+    assert index.files[_key('lib/features/gaz/gaz_screen.dart')]['mtime_ns'] == stat.st_mtime_ns + 10**9
+
+    # Le mtime enregistré suffit ensuite à sauter le fichier.
+    index = _refreshed(tmp_path, paths)
+    assert (index.hashed, index.rescanned) == (0, 0)
+
+
+def test_modified_file_is_rescanned(tmp_path):
+    paths = _tree(tmp_path)
+    gaz = tmp_path / 'lib/features/gaz/gaz_screen.dart'
+    _refreshed(tmp_path, paths)
+    gaz.write_text(GAZ.replace(', action: undo', ''), encoding='utf-8')
+    index = _refreshed(tmp_path, paths)
+    assert (index.hashed, index.rescanned) == (1, 1)
+    assert [site.reason for _, site in index.query(directories=['gaz'])] == [sites.PENDING] * 2
+
+
+def test_deleted_files_are_pruned(tmp_path):
+    paths = _tree(tmp_path)
+    _refreshed(tmp_path, paths)
+    gaz, plain = _key('lib/features/gaz/gaz_screen.dart'), _key('lib/features/gaz/deep/plain.dart')
+    elec = tmp_path / 'lib/features/elec/elec_screen.dart'
+    elec.unlink()
+    # Liste partielle (--changed-since) : le fichier supprimé est oublié, les autres gardés.
+    index = _refreshed(tmp_path, [elec], complete=False)
+    assert sorted(index.files) == [plain, gaz]
+    # Liste complète : ce qui n'est plus découvert est oublié.
+    index = _refreshed(tmp_path, [tmp_path / gaz])
+    assert sorted(index.files) == [gaz]
+    assert index.rescanned == 0
+
+
+def test_index_of_another_version_is_ignored(tmp_path):
+    paths = _tree(tmp_path)
+    _refreshed(tmp_path, paths)
+    index = sites.SiteIndex(tmp_path / sites.INDEX_FILE)
+    index.version = 'autre'
+    assert index.load().files == {}
+
+
+def _query(index, **kwargs):
+    return [(key.replace(os.sep, '/'), site.line, site.reason) for key, site in index.query(**kwargs)]
+
+
+def test_query_filters(tmp_path):
+    paths = _tree(tmp_path)
+    index = _refreshed(tmp_path, paths)
+    gaz, elec = 'lib/features/gaz/gaz_screen.dart', 'lib/features/elec/elec_screen.dart'
+    # Par fichier puis par position.
+    assert _query(index) == [
+        (elec, 2, sites.PENDING), (elec, 3, sites.RECEIVER),
+        (gaz, 2, sites.PENDING), (gaz, 5, sites.ARGUMENTS),
+    ]
+    assert _query(index, types={'info'}) == [(elec, 2, sites.PENDING), (elec, 3, sites.RECEIVER)]
+    assert _query(index, types={'error', 'success'}, reasons={sites.PENDING}) == [(gaz, 2, sites.PENDING)]
+    assert _query(index, reasons={sites.RECEIVER, sites.ARGUMENTS}) == [
+        (elec, 3, sites.RECEIVER), (gaz, 5, sites.ARGUMENTS)]
+    # --under : un nom de répertoire à n'importe quelle profondeur, pas un préfixe de nom.
+    assert [row[0] for row in _query(index, directories=['gaz'])] == [gaz, gaz]
+    assert _query(index, directories=['features/elec/']) == _query(index, types={'info'})
+    assert _query(index, directories=['ga']) == []
+    assert _query(index, globs=[compile_glob('**/elec_*.dart')]) == _query(index, types={'info'})
+    assert _query(index, globs=[compile_glob('lib/*.dart')]) == []
+    assert index.counts() == {sites.PENDING: 2, sites.RECEIVER: 1, sites.ARGUMENTS: 1}
@@ -0,0 +1,100 @@
+"""
+Réécriture en flux (codemod.stream) : mêmes fichiers qu'en mémoire, et repli
+ou échec propre quand un fichier ne se découpe pas en régions.
+"""
+
+import shutil
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from codemod import engine, stream
+from codemod.engine import RunOptions
+from codemod.prefilter import Prefilter
+from codemod.results import FAILED, MIGRATED
+
+from helpers import dart_files, migrate, rules, snapshot
+
+GOLDEN_DIR = Path(__file__).parent / 'golden'
+CROSSING = (GOLDEN_DIR / 'adv_crossing_sites' / 'input.dart').read_text(encoding='utf-8')
+# Code sans ancre, pour éloigner un cas du début du fichier.
+FILLER = ''.join(f'int value{index}() => {index};\n' for index in range(400))
+
+
+def _outcome(results, root):
+    return {str(Path(result.path).relative_to(root)): (result.status, result.counts, result.rule_counts)
+            for result in results}
+
+
+def test_streamed_run_matches_in_memory(project, tmp_path_factory, implementation):
+    copy = tmp_path_factory.mktemp('memory')
+    shutil.copytree(project, copy, dirs_exist_ok=True)
+    in_memory = migrate(copy, implementation, options=RunOptions(stream_threshold=None))
+    streamed = migrate(project, implementation, options=RunOptions(stream_threshold=1))
+    assert _outcome(streamed, project) == _outcome(in_memory, copy)
+    assert snapshot(project) == snapshot(copy)
+    assert any(result.streamed for result in streamed if result.status == MIGRATED)
+
+
+@pytest.mark.parametrize('window', [64, 256, 4096])
+def test_small_windows_give_the_in_memory_result(project, window):
+    # Un seul gros fichier : tout le corpus bout à bout, régions minuscules.
+    found = rules('final')
+    buffer = b''.join(path.read_bytes() for path in dart_files(project))
+    collect = partial(engine.collect_edits, rules=found)
+    edits = []
+    for start, _, text, region_edits in stream.rewrite_regions(
+            buffer, stream.find_hits(buffer, Prefilter(found).literals), collect, window=window):
+        edits.extend(stream.byte_edits(start, text, region_edits))
+    expected = engine.apply_rules(buffer.decode('utf-8'), found)[0]
+    assert b''.join(stream.spliced(buffer, edits)).decode('utf-8') == expected
+
+
+def test_region_over_memory_limit_is_not_streamable(project):
+    found = rules('final')
+    buffer = b''.join(path.read_bytes() for path in dart_files(project))
+    hits = stream.find_hits(buffer, Prefilter(found).literals)
+    collect = partial(engine.collect_edits, rules=found)
+    with pytest.raises(stream.NotStreamable):
+        list(stream.rewrite_regions(buffer, hits, collect, memory_limit=16))
+
+
+def test_whole_region_rewrite_is_not_streamable():
+    found = rules('v2')
+    buffer = (FILLER + CROSSING + FILLER).encode('utf-8')
+    hits = stream.find_hits(buffer, Prefilter(found).literals)
+    collect = partial(engine.collect_edits, rules=found)
+    with pytest.raises(stream.NotStreamable):
+        list(stream.rewrite_regions(buffer, hits, collect))
+
+
+def _write(tmp_path, content):
+    (tmp_path / 'pubspec.yaml').write_text('name: demo\n', encoding='utf-8')
+    path = tmp_path / 'lib' / 'features' / 'demo' / 'crossing.dart'
+    path.parent.mkdir(parents=True)
+    path.write_text(content, encoding='utf-8')
+    return path
+
+
+def test_not_streamable_file_falls_back_to_memory(tmp_path, tmp_path_factory):
+    content = FILLER + CROSSING + FILLER
+    path = _write(tmp_path, content)
+    [result] = migrate(tmp_path, 'v2', options=RunOptions(stream_threshold=1))
+    assert result.status == MIGRATED
+    assert not result.streamed
+
+    copy = tmp_path_factory.mktemp('memory')
+    expected = _write(copy, content)
+    migrate(copy, 'v2', options=RunOptions(stream_threshold=None))
+    assert path.read_bytes() == expected.read_bytes()
+
+
+def test_not_streamable_file_too_large_for_memory_is_left_alone(tmp_path):
+    content = FILLER + CROSSING + FILLER
+    path = _write(tmp_path, content)
+    options = RunOptions(stream_threshold=1, memory_limit=len(content))
+    [result] = migrate(tmp_path, 'v2', options=options)
+    assert result.status == FAILED
+    assert 'trop volumineux' in result.message
+    assert path.read_text(encoding='utf-8') == content
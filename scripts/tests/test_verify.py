@@ -0,0 +1,84 @@
+"""
+Vérification après écriture (codemod.verify) : rattachement des diagnostics
+aux modifications et choix des fichiers restaurés par --rollback.
+"""
+
+from pathlib import Path
+
+from codemod import runner, verify
+from codemod.results import MIGRATED, FileResult
+
+from helpers import rules
+
+ARROW = (Path(__file__).parent / 'golden' / 'adv_arrow_conditional' / 'input.dart').read_text(
+    encoding='utf-8')
+
+SNACKBAR = """import 'package:flutter/material.dart';
+
+void notify(BuildContext context) {
+  ScaffoldMessenger.of(context).showSnackBar(
+    SnackBar(content: Text('Enregistré'), backgroundColor: Colors.green),
+  );
+}
+"""
+# Erreur déjà présente, après la modification : rattachée à la règle.
+BROKEN_TAIL = "\nfinal values = [1; 2];\n"
+# Erreur déjà présente, avant toute modification.
+BROKEN_HEAD = "final values = [1; 2];\n"
+
+
+def test_attribute_to_enclosing_or_preceding_edit():
+    spans = [(3, 5, 'a'), (10, 10, 'b')]
+    assert verify.attribute(1, spans) == (None, False)
+    assert verify.attribute(3, spans) == ('a', True)
+    assert verify.attribute(5, spans) == ('a', True)
+    assert verify.attribute(7, spans) == ('a', False)
+    assert verify.attribute(10, spans) == ('b', True)
+    assert verify.attribute(12, spans) == ('b', False)
+    assert verify.attribute(4, []) == (None, False)
+
+
+def test_diagnostics_of_the_original_are_preexisting(tmp_path):
+    path = tmp_path / 'demo.dart'
+    original = tmp_path / 'demo.orig'
+    path.write_text("void a() {}\nvoid b() {\n  f((1; 2));\n}\nfinal x = [1; 2];\n",
+                    encoding='utf-8')
+    original.write_text("void b() {\n  f();\n}\nfinal x = [1; 2];\n", encoding='utf-8')
+    result = FileResult(str(path), MIGRATED, spans=[(3, 3, 'rule')])
+
+    verification = verify.verify([result], tmp_path, verify.LOCAL, {str(path): str(original)})
+    assert [(d.line, d.rule, d.preexisting) for d in verification.diagnostics] == [
+        (3, 'rule', False), (5, 'rule', True)]
+    assert verification.regressed == [str(path)]
+
+    original.write_text("void b() {\n  f((1; 2));\n}\nfinal x = [1; 2];\n", encoding='utf-8')
+    verification = verify.verify([result], tmp_path, verify.LOCAL, {str(path): str(original)})
+    assert verification.failing == [str(path)]
+    assert verification.regressed == []
+
+
+def test_rollback_restores_only_files_broken_by_a_rule(tmp_path):
+    (tmp_path / 'pubspec.yaml').write_text('name: demo\n', encoding='utf-8')
+    features = tmp_path / 'lib' / 'features' / 'demo'
+    features.mkdir(parents=True)
+    sources = {
+        'arrow.dart': ARROW,
+        'tail.dart': SNACKBAR + BROKEN_TAIL,
+        'head.dart': BROKEN_HEAD + SNACKBAR,
+        'clean.dart': SNACKBAR,
+    }
+    for name, content in sources.items():
+        (features / name).write_text(content, encoding='utf-8')
+
+    summary = runner.main(rules('v2'), tmp_path,
+                          argv=['--verify', 'local', '--rollback', '--no-cache'])
+
+    after = {name: (features / name).read_text(encoding='utf-8') for name in sources}
+    assert after['arrow.dart'] == ARROW
+    for name in ('tail.dart', 'head.dart', 'clean.dart'):
+        assert 'NotificationService.showSuccess' in after[name]
+    assert summary.restored_count == 1
+    assert summary.migrated_count == 3
+    assert sorted(Path(path).name for path in summary.verification.failing) == [
+        'arrow.dart', 'head.dart', 'tail.dart']
+    assert not [path for path in features.iterdir() if path.name.startswith('.')]
@@ -0,0 +1,135 @@
+"""
+Mode surveillance (codemod.watch) : regroupement des rafales d'événements
+et mise à jour de l'instantané, écritures de la migration comprises.
+"""
+
+import time
+
+import pytest
+
+from codemod import watch
+from codemod.runner import run
+
+from helpers import rules
+
+
+class ScriptedWatcher:
+    """Rend les lots d'événements prévus, puis arrête la surveillance (KeyboardInterrupt).
+
+    Un lot peut être une fonction, appelée juste avant d'être rendu (pour
+    modifier un fichier entre deux passages).
+    """
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.timeouts = []
+        self.closed = False
+
+    def poll(self, timeout=None):
+        self.timeouts.append(timeout)
+        if not self.batches:
+            raise KeyboardInterrupt
+        batch = self.batches.pop(0)
+        return set(batch() if callable(batch) else batch)
+
+    def close(self):
+        self.closed = True
+
+
+def _watch(root, watcher, on_change, **kwargs):
+    with pytest.raises(KeyboardInterrupt):
+        watch.watch(root, on_change, watcher=watcher, **kwargs)
+    assert watcher.closed
+
+
+def _edit(path, text):
+    def change():
+        path.write_text(text, encoding='utf-8')
+        return [str(path)]
+    return change
+
+
+def test_burst_is_processed_once(tmp_path):
+    a, b = tmp_path / 'a.dart', tmp_path / 'b.dart'
+    a.write_text('a', encoding='utf-8')
+    b.write_text('b', encoding='utf-8')
+    calls = []
+    watcher = ScriptedWatcher([_edit(a, 'aa'), _edit(b, 'bb'), [str(a)], []])
+    _watch(tmp_path, watcher, calls.append, debounce=0.01)
+    assert calls == [[str(a), str(b)]]
+    # Après le premier événement, chaque attente est bornée par debounce.
+    assert watcher.timeouts[0] is None
+    assert all(timeout <= 0.01 for timeout in watcher.timeouts[1:4])
+
+
+def test_unchanged_and_deleted_files_are_ignored(tmp_path):
+    a, b = tmp_path / 'a.dart', tmp_path / 'b.dart'
+    a.write_text('a', encoding='utf-8')
+    b.write_text('b', encoding='utf-8')
+
+    def delete():
+        b.unlink()
+        return [str(b)]
+
+    calls = []
+    _watch(tmp_path, ScriptedWatcher([[str(a)], [], delete, []]), calls.append, debounce=0.01)
+    assert calls == []
+
+
+def test_max_delay_bounds_a_continuous_burst(tmp_path):
+    a = tmp_path / 'a.dart'
+    a.write_text('a', encoding='utf-8')
+    calls = []
+
+    class Busy(ScriptedWatcher):
+        def poll(self, timeout=None):
+            if calls or time.monotonic() - start > 1.0:
+                raise KeyboardInterrupt
+            a.write_text(f'{time.monotonic()}', encoding='utf-8')
+            time.sleep(0.005)
+            return {str(a)}
+
+    start = time.monotonic()
+    with pytest.raises(KeyboardInterrupt):
+        watch.watch(tmp_path, calls.append, watcher=Busy([]), debounce=1.0, max_delay=0.05)
+    assert calls == [[str(a)]]
+    assert time.monotonic() - start < 1.0
+
+
+def test_migration_writes_do_not_trigger_a_new_pass(tmp_path):
+    (tmp_path / 'pubspec.yaml').write_text('name: demo\n', encoding='utf-8')
+    path = tmp_path / 'lib' / 'features' / 'demo' / 'demo_screen.dart'
+    path.parent.mkdir(parents=True)
+    path.write_text('void main() {}\n', encoding='utf-8')
+    snackbar = ("void notify(BuildContext context) {\n"
+                "  ScaffoldMessenger.of(context).showSnackBar(\n"
+                "    const SnackBar(content: Text('Enregistré'), backgroundColor: Colors.green),\n"
+                "  );\n}\n")
+    calls = []
+
+    def on_change(paths):
+        calls.append(paths)
+        list(run(rules(), paths, tmp_path))
+
+    watcher = ScriptedWatcher([
+        _edit(path, snackbar), [],
+        # Événement de l'écriture faite par la migration : ignoré.
+        [str(path)], [],
+        _edit(path, snackbar.replace('Enregistré', 'Envoyé')), [],
+    ])
+    _watch(tmp_path / 'lib', watcher, on_change, debounce=0.01)
+    assert calls == [[str(path)], [str(path)]]
+    assert "NotificationService.showSuccess(context, 'Envoyé');" in path.read_text(encoding='utf-8')
+
+
+def test_polling_watcher_reports_new_and_modified_files(tmp_path):
+    a = tmp_path / 'a.dart'
+    a.write_text('a', encoding='utf-8')
+    (tmp_path / 'notes.txt').write_text('x', encoding='utf-8')
+    watcher = watch.PollingWatcher(tmp_path, interval=0.01)
+    assert watcher.poll(timeout=0.02) == set()
+    a.write_text('aa', encoding='utf-8')
+    (tmp_path / 'sub').mkdir()
+    (tmp_path / 'sub' / 'b.dart').write_text('b', encoding='utf-8')
+    (tmp_path / 'notes.txt').write_text('xx', encoding='utf-8')
+    assert watcher.poll(timeout=1.0) == {str(a), str(tmp_path / 'sub' / 'b.dart')}
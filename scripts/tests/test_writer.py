@@ -0,0 +1,132 @@
+"""
+Écriture atomique et groupée (codemod.writer) : lots, transaction,
+copies d'origine et restauration, nettoyage après interruption, liens
+symboliques.
+"""
+
+import os
+import stat
+
+import pytest
+
+from codemod.writer import (ORIGINAL_SUFFIX, TMP_SUFFIX, BatchWriter, new_run_id, remove_stale,
+                            stage)
+
+from codemod.runner import run
+
+from helpers import dart_files, rules, snapshot
+
+
+def _leftovers(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith((TMP_SUFFIX, ORIGINAL_SUFFIX)))
+
+
+def _file(tmp_path, name, content):
+    path = tmp_path / name
+    path.write_text(content, encoding='utf-8')
+    return path
+
+
+def test_batches_are_committed_every_batch_size(tmp_path):
+    paths = [_file(tmp_path, f'f{index}.dart', 'avant') for index in range(5)]
+    writer = BatchWriter(batch_size=2)
+    for path in paths:
+        writer.add(stage(path, 'après'), str(path))
+    assert writer.committed == 4
+    assert [path.read_text(encoding='utf-8') for path in paths] == ['après'] * 4 + ['avant']
+    writer.flush()
+    assert paths[4].read_text(encoding='utf-8') == 'après'
+    assert _leftovers(tmp_path) == []
+
+
+def test_staged_file_keeps_permissions(tmp_path):
+    path = _file(tmp_path, 'script.dart', 'avant')
+    os.chmod(path, 0o640)
+    with BatchWriter() as writer:
+        writer.add(stage(path, 'après'), str(path))
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_transaction_abort_leaves_tree_unchanged(tmp_path):
+    paths = [_file(tmp_path, f'f{index}.dart', 'avant') for index in range(3)]
+    with pytest.raises(RuntimeError):
+        with BatchWriter(batch_size=1, transaction=True) as writer:
+            for path in paths:
+                writer.add(stage(path, 'après'), str(path))
+            assert writer.committed == 0
+            raise RuntimeError('interruption')
+    assert writer.aborted == 3
+    assert [path.read_text(encoding='utf-8') for path in paths] == ['avant'] * 3
+    assert _leftovers(tmp_path) == []
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_interrupted_transaction_leaves_tree_unchanged(project, jobs):
+    before = snapshot(project)
+    results = run(rules(), dart_files(project), project, jobs=jobs, chunksize=4,
+                  writer=BatchWriter(transaction=True))
+    with pytest.raises(KeyboardInterrupt):
+        for index, _ in enumerate(results):
+            if index == 30:
+                raise KeyboardInterrupt
+    results.close()
+    assert snapshot(project) == before
+    for directory, _, _ in os.walk(project / 'lib'):
+        assert _leftovers(directory) == []
+
+
+def test_keep_originals_restore_and_discard(tmp_path):
+    kept = _file(tmp_path, 'kept.dart', 'avant A')
+    broken = _file(tmp_path, 'broken.dart', 'avant B')
+    writer = BatchWriter(keep_originals=True)
+    writer.add(stage(kept, 'après A'), str(kept))
+    writer.add(stage(broken, 'après B'), str(broken))
+    writer.flush()
+    assert set(writer.originals) == {str(kept), str(broken)}
+
+    assert writer.restore([str(broken)]) == 1
+    assert broken.read_text(encoding='utf-8') == 'avant B'
+    assert kept.read_text(encoding='utf-8') == 'après A'
+    writer.discard_originals()
+    assert writer.originals == {}
+    assert _leftovers(tmp_path) == []
+
+
+def test_remove_stale_spares_concurrent_runs(tmp_path):
+    path = _file(tmp_path, 'a.dart', 'avant')
+    mine, other = new_run_id(), new_run_id()
+    own = stage(path, 'ce run', mine)
+    concurrent = stage(path, 'autre run', other)
+    orphan = stage(path, 'ancien run', new_run_id())
+    assert remove_stale([str(tmp_path)], mine, max_age=3600) == 1
+    assert not os.path.exists(own)
+    assert os.path.exists(concurrent) and os.path.exists(orphan)
+    # max_age négatif : les fichiers des autres exécutions sont tous considérés comme orphelins.
+    assert remove_stale([str(tmp_path)], mine, max_age=-1) == 2
+    assert _leftovers(tmp_path) == []
+
+
+def test_remove_stale_spares_concurrent_originals(tmp_path):
+    path = _file(tmp_path, 'a.dart', 'avant')
+    writer = BatchWriter(keep_originals=True)
+    writer.add(stage(path, 'après', new_run_id()), str(path))
+    writer.flush()
+    # Une autre exécution interrompue ne supprime pas la copie d'origine de celle-ci.
+    remove_stale([str(tmp_path)], new_run_id())
+    assert writer.restore([str(path)]) == 1
+    assert path.read_text(encoding='utf-8') == 'avant'
+
+
+def test_symlinked_target_stays_a_link(tmp_path):
+    real = _file(tmp_path, 'real.dart', 'avant')
+    (tmp_path / 'links').mkdir()
+    link = tmp_path / 'links' / 'link.dart'
+    link.symlink_to(real)
+    writer = BatchWriter(keep_originals=True)
+    writer.add(stage(link, 'après'), str(link))
+    writer.flush()
+    assert link.is_symlink()
+    assert real.read_text(encoding='utf-8') == 'après'
+    assert _leftovers(tmp_path / 'links') == []
+    writer.restore([str(link)])
+    assert link.is_symlink() and real.read_text(encoding='utf-8') == 'avant'